@@ -0,0 +1,9 @@
+"""Micro-benchmarks.
+
+Run from ``BE/``::
+
+    python -m benchmarks.<name>
+
+Each script prints its results and exits non-zero only when it has an
+explicit budget to enforce.
+"""
@@ -0,0 +1,89 @@
+"""Per-request cost of getting an ``AuthService``: manual wiring vs. container.
+
+Usage::
+
+    python -m benchmarks.container [--number 200000]
+
+``manual`` is the former ``modules.auth.router._get_service``: build the
+repository, its cache decorator and the service on every request.
+``container`` awaits the FastAPI dependency from
+``container.depends(AuthService)``, which returns the singleton.  A scoped
+and a transient provider with the same dependency chain are shown for
+comparison.  Requests are prepared outside the timed loop, since FastAPI
+builds one per request either way.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from unittest.mock import MagicMock
+
+from fastapi import Request
+
+from config import settings
+from core.container import Container
+from core.database import RoutingPool
+from modules.auth.batching import BatchingAuthRepository, registration_batcher
+from modules.auth.cache import CachedAuthRepository, user_cache
+from modules.auth.repository import AuthRepository
+from modules.auth.service import AuthService
+
+POOL = MagicMock(spec=RoutingPool)
+
+
+def manual() -> AuthService:
+    repo = AuthRepository(POOL, outbox=settings.event_outbox)
+    if settings.registration_batching:
+        repo = BatchingAuthRepository(repo, registration_batcher)
+    repo = CachedAuthRepository(repo, user_cache)
+    return AuthService(repo)
+
+
+def _container(lifetime: str) -> Container:
+    c = Container()
+    c.singleton(RoutingPool, lambda: POOL)
+    c.register(
+        AuthRepository,
+        lambda pool: CachedAuthRepository(AuthRepository(pool), user_cache),
+        lifetime=lifetime,
+        deps=[RoutingPool],
+    )
+    c.register(AuthService, AuthService, lifetime=lifetime, deps=[AuthRepository])
+    return c
+
+
+async def _time_dependency(c: Container, number: int, chunk: int = 1_000) -> float:
+    dependency = c.depends(AuthService)
+    elapsed = 0.0
+    for _ in range(number // chunk):
+        # Finished requests are dropped between chunks, as they would be
+        # in a server, so scoped instances do not pile up.
+        requests = [Request({"type": "http"}) for _ in range(chunk)]
+        started = time.perf_counter()
+        for request in requests:
+            await dependency(request)
+        elapsed += time.perf_counter() - started
+    return elapsed / (number // chunk * chunk)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", "-n", type=int, default=200_000)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    for _ in range(args.number):
+        manual()
+    baseline = (time.perf_counter() - started) / args.number
+
+    print(f"{'wiring':<22} {'ns/request':>10} {'speedup':>8}")
+    print(f"{'manual (before)':<22} {baseline * 1e9:>10.0f} {1:>7.2f}x")
+    for lifetime in ("singleton", "scoped", "transient"):
+        per = asyncio.run(_time_dependency(_container(lifetime), args.number))
+        print(f"{f'container ({lifetime})':<22} {per * 1e9:>10.0f} {baseline / per:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
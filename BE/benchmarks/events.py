@@ -0,0 +1,61 @@
+"""Event bus publish cost per event.
+
+Usage::
+
+    python -m benchmarks.events [--number 100000] [--patterns 50]
+
+Publishes *number* events with one subscriber that is exact, a wildcard
+(``user.*``) or a batch handler, with *patterns* unrelated wildcard
+subscriptions registered alongside.  ``publish`` is timed on its own
+(routing + enqueue) and end to end (until :meth:`EventBus.drain` returns).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from core.events import EventBus
+
+
+async def _noop(_payload) -> None:
+    pass
+
+
+async def _run(mode: str, number: int, patterns: int) -> tuple[float, float]:
+    bus = EventBus(workers=4, queue_size=number)
+    for i in range(patterns):
+        bus.subscribe(f"other{i}.*", _noop)
+    if mode == "exact":
+        bus.subscribe("user.registered", _noop)
+    elif mode == "wildcard":
+        bus.subscribe("user.*", _noop)
+    else:
+        bus.subscribe("user.*", _noop, batch=True, max_size=500, max_latency=0.01)
+    bus.start()
+    payload = {"user_id": 1, "email": "a@b.com"}
+
+    started = time.perf_counter()
+    for _ in range(number):
+        await bus.publish("user.registered", payload)
+    published = time.perf_counter()
+    await bus.drain()
+    finished = time.perf_counter()
+    return (published - started) / number, (finished - started) / number
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", "-n", type=int, default=100_000)
+    parser.add_argument("--patterns", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'subscriber':<10} {'publish':>12} {'end to end':>14}")
+    for mode in ("exact", "wildcard", "batch"):
+        publish, total = asyncio.run(_run(mode, args.number, args.patterns))
+        print(f"{mode:<10} {publish * 1e9:>9.0f} ns {total * 1e9:>11.0f} ns")
+
+
+if __name__ == "__main__":
+    main()
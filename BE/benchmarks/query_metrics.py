@@ -0,0 +1,65 @@
+"""Per-query recording overhead of the instrumented Connection.
+
+Usage::
+
+    python -m benchmarks.query_metrics [--number 200000]
+
+Runs ``Connection.fetchrow`` against a prepared statement whose execution
+is a no-op, with and without recording into ``query_metrics``, so the
+difference is the instrumentation cost per query.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from core import database
+from core.database import Connection, QueryMetrics, Statement
+
+
+class _FakePrepared:
+    async def fetchrow(self, *args, timeout=None):
+        return {"id": 1}
+
+
+class _BareConnection(Connection):
+    def __del__(self) -> None:
+        pass
+
+
+class _Unrecorded(QueryMetrics):
+    def record(self, *args) -> None:
+        pass
+
+
+async def _loop(conn: Connection, stmt: Statement, number: int) -> float:
+    started = time.perf_counter()
+    for i in range(number):
+        await conn.fetchrow(stmt, i)
+    return (time.perf_counter() - started) / number
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", "-n", type=int, default=200_000)
+    args = parser.parse_args()
+
+    conn = _BareConnection.__new__(_BareConnection)
+    stmt = Statement("bench.get", "SELECT id FROM t WHERE id = $1")
+    conn._prepared = {stmt.name: _FakePrepared()}
+
+    recording = database.query_metrics
+    database.query_metrics = _Unrecorded(0)
+    bare = asyncio.run(_loop(conn, stmt, args.number))
+    database.query_metrics = recording
+    timed = asyncio.run(_loop(conn, stmt, args.number))
+
+    print(f"fetchrow, recording off: {bare * 1e9:8.0f} ns/query")
+    print(f"fetchrow, recording on:  {timed * 1e9:8.0f} ns/query")
+    print(f"instrumentation cost:    {(timed - bare) * 1e9:8.0f} ns/query")
+
+
+if __name__ == "__main__":
+    main()
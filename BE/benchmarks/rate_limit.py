@@ -0,0 +1,52 @@
+"""Rate limiter overhead per request and memory under many distinct keys.
+
+Usage::
+
+    python -m benchmarks.rate_limit [--number 200000] [--keys 1000000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+import tracemalloc
+
+from core.rate_limit import RateLimiter
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", "-n", type=int, default=200_000)
+    parser.add_argument("--keys", type=int, default=1_000_000, help="distinct keys to stream")
+    parser.add_argument("--max-keys", type=int, default=200_000)
+    args = parser.parse_args()
+
+    # ── Hot path: a small set of repeating keys ───────────────────────
+    limiter = RateLimiter(10.0, 5, max_keys=args.max_keys, delay_base=0.1, delay_max=2.0)
+    keys = [f"user{i}@example.com" for i in range(1000)]
+    sample = [random.choice(keys) for _ in range(args.number)]
+    started = time.perf_counter()
+    for key in sample:
+        limiter.hit(key)
+    per_hit = (time.perf_counter() - started) / args.number * 1e9
+    print(f"hit() on 1000 hot keys:       {per_hit:8.0f} ns/request")
+
+    # ── Memory: stream many distinct keys through a capped limiter ────
+    limiter = RateLimiter(10.0, 5, max_keys=args.max_keys)
+    tracemalloc.start()
+    started = time.perf_counter()
+    for i in range(args.keys):
+        limiter.hit(f"203.0.{i >> 8 & 255}.{i & 255}-{i}")
+    elapsed = time.perf_counter() - started
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"hit() on {args.keys} distinct keys: {elapsed / args.keys * 1e9:8.0f} ns/request (traced)")
+    print(
+        f"  retained keys {len(limiter)} (cap {args.max_keys}), "
+        f"evicted {limiter.evicted}, memory {current / 2**20:.1f} MiB (peak {peak / 2**20:.1f} MiB)"
+    )
+
+
+if __name__ == "__main__":
+    main()
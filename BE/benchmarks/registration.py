@@ -0,0 +1,109 @@
+"""Registration insert throughput: one INSERT per user vs. micro-batched.
+
+Usage::
+
+    python -m benchmarks.registration [--users 5000] [--concurrency 200]
+    python -m benchmarks.registration --live   # against the configured database
+
+Without ``--live`` the database is simulated: a pool of ``--pool-size``
+connections where each round trip costs ``--rtt-ms`` plus ``--row-us`` per
+row, which is what dominates a single-row insert.  ``--live`` inserts
+throw-away ``bench-*@example.invalid`` users and deletes them afterwards.
+Password hashing is left out — it is the same in both modes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+import uuid
+
+from core.batching import MicroBatcher
+from modules.auth.batching import BatchingAuthRepository, insert_batch
+from modules.auth.repository import AuthRepository
+
+
+class SimulatedRepository:
+    """Stands in for :class:`AuthRepository` with a fixed-size pool."""
+
+    def __init__(self, pool_size: int, rtt: float, per_row: float) -> None:
+        self._connections = asyncio.Semaphore(pool_size)
+        self._rtt = rtt
+        self._per_row = per_row
+        self._next_id = 0
+
+    async def _round_trip(self, rows: int) -> None:
+        async with self._connections:
+            await asyncio.sleep(self._rtt + rows * self._per_row)
+
+    async def create_user(self, email: str, password_hash: str) -> int:
+        await self._round_trip(1)
+        self._next_id += 1
+        return self._next_id
+
+    async def create_users(self, users: list[tuple[str, str]]) -> dict[str, int]:
+        await self._round_trip(len(users))
+        ids = {}
+        for email, _ in users:
+            self._next_id += 1
+            ids[email] = self._next_id
+        return ids
+
+
+async def _drive(repo, users: int, concurrency: int, prefix: str) -> float:
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        async with gate:
+            await repo.create_user(f"{prefix}{i}@example.invalid", "x")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(users)))
+    return time.perf_counter() - started
+
+
+async def _run(args) -> None:
+    if args.live:
+        from core.database import close_pool, create_pool
+
+        pool = await create_pool()
+        direct = AuthRepository(pool)
+    else:
+        direct = SimulatedRepository(args.pool_size, args.rtt_ms / 1000, args.row_us / 1e6)
+
+    batcher = MicroBatcher(
+        lambda users: insert_batch(direct, users),
+        max_size=args.batch_size,
+        window=args.window_ms / 1000,
+    )
+    batched = BatchingAuthRepository(direct, batcher)
+    run = uuid.uuid4().hex[:8]
+
+    try:
+        for label, repo in (("single-row INSERT", direct), ("micro-batched", batched)):
+            elapsed = await _drive(repo, args.users, args.concurrency, f"bench-{run}-{label[0]}-")
+            print(f"{label:18s} {args.users / elapsed:10.0f} users/s  ({elapsed:.2f}s)")
+        stats = batcher.stats()
+        print(f"  batches {stats['batches']}, mean size {stats['mean_size']}, largest {stats['largest']}")
+    finally:
+        if args.live:
+            await pool.execute("DELETE FROM users WHERE email LIKE $1", f"bench-{run}-%")
+            await close_pool()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=5_000)
+    parser.add_argument("--concurrency", type=int, default=200, help="requests in flight")
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--window-ms", type=float, default=2)
+    parser.add_argument("--pool-size", type=int, default=10, help="simulated connections")
+    parser.add_argument("--rtt-ms", type=float, default=1.0, help="simulated round trip")
+    parser.add_argument("--row-us", type=float, default=20, help="simulated per-row cost")
+    parser.add_argument("--live", action="store_true", help="use the configured database")
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Requests per second per core for the token endpoint, before and after.
+
+Usage::
+
+    python -m benchmarks.responses [--number 20000] [--repeat 5]
+
+Drives a FastAPI app in-process over ASGI (no server, no network) with a
+``/login``-shaped route — JSON body in, token pair out — so the numbers
+are the framework's per-request cost on one core:
+
+- ``before`` — stdlib ``JSONResponse``, returns a ``TokenResponse`` model
+  that FastAPI validates and encodes against ``response_model``;
+- ``model`` — the same route with ``FastJSONResponse`` as default class;
+- ``direct`` — ``json_response`` with a plain dict, skipping the
+  ``response_model`` round trip (what the auth router does now).
+
+The fast variants are repeated for every available ``JSON_LIBRARY``.
+Each figure is the best of ``--repeat`` runs.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+
+from fastapi import FastAPI
+
+from config import settings
+from core import responses
+from core.responses import FastJSONResponse, json_response, select_dumps
+from core.security import TokenMinter
+from modules.auth.schemas import AuthRequest, TokenResponse
+
+BODY = json.dumps({"email": "bench@example.com", "password": "password123"}).encode()
+SCOPE = {
+    "type": "http",
+    "asgi": {"version": "3.0"},
+    "http_version": "1.1",
+    "method": "POST",
+    "scheme": "http",
+    "path": "/login",
+    "raw_path": b"/login",
+    "root_path": "",
+    "query_string": b"",
+    "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(BODY)).encode())],
+    "client": ("127.0.0.1", 1234),
+    "server": ("127.0.0.1", 80),
+}
+
+
+def _app(mode: str, tokens: tuple[str, str]) -> FastAPI:
+    if mode == "before":
+        app = FastAPI()
+    else:
+        app = FastAPI(default_response_class=FastJSONResponse)
+    access, refresh = tokens
+
+    if mode == "direct":
+        @app.post("/login", response_model=TokenResponse)
+        async def login_direct(body: AuthRequest):
+            return json_response(
+                {"access_token": access, "refresh_token": refresh, "token_type": "bearer"}
+            )
+    else:
+        @app.post("/login", response_model=TokenResponse)
+        async def login_model(body: AuthRequest):
+            return TokenResponse(access_token=access, refresh_token=refresh)
+
+    return app
+
+
+async def _requests_per_second(app: FastAPI, number: int) -> float:
+    async def receive() -> dict:
+        return {"type": "http.request", "body": BODY, "more_body": False}
+
+    async def send(message: dict) -> None:
+        pass
+
+    for _ in range(100):  # warm up
+        await app(dict(SCOPE), receive, send)
+    started = time.perf_counter()
+    for _ in range(number):
+        await app(dict(SCOPE), receive, send)
+    return number / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", "-n", type=int, default=20_000)
+    parser.add_argument("--repeat", "-r", type=int, default=5)
+    args = parser.parse_args()
+
+    def best(app: FastAPI) -> float:
+        return max(asyncio.run(_requests_per_second(app, args.number)) for _ in range(args.repeat))
+
+    tokens = TokenMinter(settings.jwt_secret, settings.jwt_algorithm).mint_pair(
+        {"sub": "12345", "email": "bench@example.com"}
+    )
+    libraries = ["stdlib"] + (["orjson"] if responses.orjson is not None else [])
+
+    baseline = best(_app("before", tokens))
+    print(f"{'variant':<18} {'req/s/core':>11} {'speedup':>8}")
+    print(f"{'before':<18} {baseline:>11.0f} {1:>7.2f}x")
+    for library in libraries:
+        responses.dumps = select_dumps(library)
+        for mode in ("model", "direct"):
+            rps = best(_app(mode, tokens))
+            print(f"{f'{mode} ({library})':<18} {rps:>11.0f} {rps / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Cold start: process launch to first served request, eager vs. lazy routers.
+
+Usage::
+
+    python -m benchmarks.startup [--runs 5] [--max-ms 1500]
+
+Each run is a fresh interpreter that imports ``main`` and pushes requests
+straight through the ASGI app (no server, no database): ``/api/health``,
+a domain route, and ``/openapi.json``.  Medians are reported; with
+``--max-ms`` the exit status is 1 when launch-to-first-domain-response
+exceeds the budget in either mode, so CI catches cold-start regressions.
+Run ``python -m core.openapi`` and set ``OPENAPI_CACHE_PATH=openapi.json``
+to measure the cached schema path.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+_CHILD = r"""
+import asyncio, json, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+
+async def get(path):
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "query_string": b"", "root_path": "", "headers": [(b"host", b"localhost")],
+        "client": ("127.0.0.1", 1), "server": ("localhost", 80),
+    }
+    messages = []
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+    async def send(message):
+        messages.append(message)
+    t = time.perf_counter()
+    await main.app(scope, receive, send)
+    assert messages[0]["status"] == 200, (path, messages[0]["status"])
+    return time.perf_counter() - t
+
+async def run():
+    return {
+        "health": await get("/api/health"),
+        "domain": await get("/api/.well-known/jwks.json"),
+        "openapi": await get("/openapi.json"),
+    }
+
+timings = asyncio.run(run())
+timings["import"] = imported - started
+print(json.dumps(timings))
+"""
+
+
+def _run_once(lazy: bool) -> dict[str, float]:
+    env = {**os.environ, "LAZY_ROUTERS": "true" if lazy else "false"}
+    launched = time.perf_counter()
+    out = subprocess.run(
+        [sys.executable, "-c", _CHILD], env=env, capture_output=True, text=True, check=True
+    )
+    timings = json.loads(out.stdout.strip().splitlines()[-1])
+    # Interpreter launch + import + health + first domain request
+    timings["ready"] = time.perf_counter() - launched - timings["openapi"]
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", "-n", type=int, default=5)
+    parser.add_argument("--max-ms", type=float, help="fail if median time to first domain response exceeds this")
+    args = parser.parse_args()
+
+    over_budget = False
+    print(f"{'mode':6s} {'ready':>9s} {'import':>9s} {'health':>9s} {'domain':>9s} {'openapi':>9s}   (median ms of {args.runs})")
+    for lazy in (False, True):
+        runs = [_run_once(lazy) for _ in range(args.runs)]
+        median = {k: statistics.median(r[k] for r in runs) * 1000 for k in runs[0]}
+        mode = "lazy" if lazy else "eager"
+        print(
+            f"{mode:6s} {median['ready']:9.1f} {median['import']:9.1f} {median['health']:9.1f} "
+            f"{median['domain']:9.1f} {median['openapi']:9.1f}"
+        )
+        if args.max_ms is not None and median["ready"] > args.max_ms:
+            over_budget = True
+            print(f"  over budget: {median['ready']:.0f} ms > {args.max_ms:.0f} ms", file=sys.stderr)
+    sys.exit(1 if over_budget else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
 """Application settings — loaded from environment variables / .env file."""
 
+from typing import Literal
+
 from pydantic_settings import BaseSettings
 
 
@@ -15,6 +17,23 @@ class Settings(BaseSettings):
     db_password: str = "login_pass"
     db_pool_min: int = 2
     db_pool_max: int = 10
+    db_pool_max_idle_seconds: float = 300  # idle connections above the limit close after this
+    # Adaptive sizing: hand out between db_pool_min and db_pool_max connections,
+    # growing when acquires wait longer than the target.
+    db_pool_adaptive: bool = False
+    db_pool_target_wait_ms: float = 5
+    db_pool_adapt_interval_seconds: float = 5
+    db_application_name: str = "login-api"
+    db_statement_timeout_ms: int = 0  # 0 = server default
+    db_slow_query_ms: float = 200  # log queries slower than this (0 disables)
+    # Extra per-session GUCs sent at connect time; JIT only adds latency to OLTP.
+    db_session_settings: dict[str, str] = {"jit": "off"}
+    # Read replicas ("host" or "host:port"; same database and credentials).
+    db_replica_hosts: list[str] = []
+    db_replica_selection: Literal["round_robin", "least_busy"] = "round_robin"
+    db_replica_max_lag_seconds: float = 1.0  # lagging replicas fall back to primary
+    db_replica_check_interval_seconds: float = 1.0
+    db_read_your_writes_seconds: float = 5.0  # reads of a just-written key stay on primary
 
     # ── CORS ──────────────────────────────────────────────────────────
     cors_origins: list[str] = ["*"]
@@ -22,12 +41,108 @@ class Settings(BaseSettings):
     # ── Server ────────────────────────────────────────────────────────
     app_name: str = "Login API"
     debug: bool = False
+    lazy_routers: bool = False  # import domain routers on first request
+    # Serve the schema written by `python -m core.openapi` (set in the Docker
+    # image); empty = build it from the routes on first use
+    openapi_cache_path: str = ""
+    json_library: Literal["auto", "orjson", "stdlib"] = "auto"  # response encoder
+    server_timing: bool = False  # per-request timing log line (+ header for trusted callers)
+    # Who gets the Server-Timing header: clients in these networks, or
+    # requests sending X-Server-Timing-Token with this value
+    server_timing_networks: list[str] = []
+    server_timing_token: str = ""
+    # Request deadlines (seconds, 0 = none); queries and pool waits share the budget.
+    request_timeout_seconds: float = 10
+    request_timeouts: dict[str, float] = {"/api/login": 5, "/api/users": 0}
+
+    # ── Admission control (load shedding) ─────────────────────────────
+    admission_control: bool = False
+    admission_limit: int = 64  # requests in the app at once
+    admission_route_limits: dict[str, int] = {"/api/register": 32, "/api/users": 4}
+    admission_queue_size: int = 128  # waiters per gate before shedding
+    admission_queue_timeout_ms: float = 500
+    # Lower is served first; health and refresh outrank login and register
+    admission_priorities: dict[str, int] = {
+        "/api/health": 0, "/api/metrics": 0, "/api/refresh": 1, "/api/register": 3,
+    }
+    admission_default_priority: int = 2
+    admission_retry_after_seconds: int = 1
+    # Follow observed latency with the global limit
+    admission_adaptive: bool = False
+    admission_target_latency_ms: float = 250
+    admission_min_limit: int = 4
+    admission_adapt_seconds: float = 1
 
     # ── JWT ──────────────────────────────────────────────────────────
     jwt_secret: str = "your-super-secret-jwt-key-change-in-production"
     jwt_algorithm: str = "HS256"
+    # Extra keys by kid, as JSON: [{"kid", "alg", "secret" | "private_key[_file]"
+    # | "public_key[_file]"}].  jwt_secret is always present as kid "default".
+    jwt_keys: list[dict[str, str]] = []
+    jwt_active_kid: str | None = None  # kid used for signing (default: "default")
     access_token_expire_minutes: int = 60  # 1 hour
     refresh_token_expire_days: int = 7
+    token_cache_size: int = 10_000  # verified access tokens; 0 disables
+
+    # ── Admin ─────────────────────────────────────────────────────────
+    admin_emails: list[str] = []  # may call admin-only routes such as GET /api/users
+
+    # ── User cache (login reads) ──────────────────────────────────────
+    user_cache_size: int = 10_000  # 0 disables
+    user_cache_ttl_seconds: float = 30
+    user_cache_negative_ttl_seconds: float = 5  # unknown emails
+
+    # ── Refresh-token revocation ──────────────────────────────────────
+    revocation_filter_capacity: int = 1_000_000  # Bloom filter sizing
+    revocation_filter_error_rate: float = 0.001
+    revocation_recent_size: int = 10_000  # exact set of recently revoked jtis
+
+    # ── Login throttling ──────────────────────────────────────────────
+    login_email_per_minute: float = 10
+    login_email_burst: int = 5
+    login_ip_per_minute: float = 120
+    login_ip_burst: int = 30
+    login_throttle_max_keys: int = 200_000  # per limiter; stalest keys evicted
+    login_throttle_delay_base_ms: int = 100  # progressive delay past half the burst
+    login_throttle_delay_max_ms: int = 2_000
+
+    # ── Password hashing ──────────────────────────────────────────────
+    # Tune cost with `python -m core.passwords calibrate --target-ms N`.
+    password_scheme: Literal["scrypt", "pbkdf2-sha256", "legacy-sha256"] = "scrypt"
+    scrypt_n: int = 2**14
+    scrypt_r: int = 8
+    scrypt_p: int = 1
+    pbkdf2_iterations: int = 600_000
+
+    # ── Password hashing pool ─────────────────────────────────────────
+    hash_pool_kind: Literal["thread", "process"] = "thread"
+    hash_pool_workers: int = 4
+    hash_pool_queue_size: int = 64  # waiting calls beyond this get a 503
+
+    # ── Registration batching ─────────────────────────────────────────
+    registration_batching: bool = False  # coalesce concurrent signups into one INSERT
+    registration_batch_window_ms: float = 2
+    registration_batch_max_size: int = 100
+
+    # ── Event bus ─────────────────────────────────────────────────────
+    event_bus_workers: int = 4
+    event_bus_queue_size: int = 10_000
+    event_bus_overflow: Literal["block", "drop_oldest", "reject"] = "block"
+    event_bus_drain_seconds: float = 5
+    # Relay these topics to the other worker processes (uvicorn --workers N)
+    event_bridge: bool = False
+    event_bridge_topics: list[str] = ["user.registered", "user.password_changed"]
+    event_bridge_channel: str = "event_bridge"
+    event_bridge_flush_ms: float = 10
+
+    # ── Event outbox ──────────────────────────────────────────────────
+    event_outbox: bool = False  # write USER_REGISTERED to event_outbox with the user
+    event_outbox_batch_size: int = 500
+    event_outbox_poll_seconds: float = 5  # safety net if a NOTIFY is missed
+    # Failed events: retried after retry * 2^attempts s (capped), then dead-lettered
+    event_outbox_max_attempts: int = 10
+    event_outbox_retry_seconds: float = 1
+    event_outbox_retry_max_seconds: float = 300
 
     model_config = {"env_file": ".env", "env_file_encoding": "utf-8"}
 
@@ -0,0 +1,41 @@
+"""DI container wiring — which implementation backs each dependency.
+
+Singletons are built by ``main.lifespan`` (``container.startup()``) and
+torn down at shutdown in reverse order, so the pool is created first and
+closed last.  Routers take their services with
+``Depends(container.depends(Service))``.  Register a new module's
+providers here.
+"""
+
+from __future__ import annotations
+
+from config import settings
+from core.container import Container
+from core.database import RoutingPool, close_pool, create_pool
+from modules.auth.batching import BatchingAuthRepository, registration_batcher
+from modules.auth.cache import CachedAuthRepository, user_cache
+from modules.auth.repository import AuthRepository
+from modules.auth.revocation import revocation_store
+from modules.auth.service import AuthService
+
+container = Container()
+
+# ── Core ──────────────────────────────────────────────────────────────
+
+container.singleton(RoutingPool, create_pool, shutdown=lambda _pool: close_pool())
+
+
+# ── Auth ──────────────────────────────────────────────────────────────
+
+def auth_repository(pool: RoutingPool) -> AuthRepository:
+    """The repository the service sees: batching and cache decorators applied."""
+    repo = AuthRepository(pool, outbox=settings.event_outbox)
+    if settings.registration_batching:
+        repo = BatchingAuthRepository(repo, registration_batcher)
+    return CachedAuthRepository(repo, user_cache)
+
+
+container.singleton(AuthRepository, auth_repository, deps=[RoutingPool])
+container.singleton(
+    AuthService, lambda repo: AuthService(repo, revocation_store), deps=[AuthRepository]
+)
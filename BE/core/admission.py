@@ -0,0 +1,260 @@
+"""Admission control — concurrency limits, priority queues and load shedding.
+
+:class:`core.middleware.admission.AdmissionMiddleware` asks the
+:class:`AdmissionController` for a slot before a request reaches the app.
+A request takes a slot of its route's gate (``ADMISSION_ROUTE_LIMITS``,
+optional) and then one of the global gate (``ADMISSION_LIMIT``).  When a
+gate is full the request waits in a bounded queue ordered by priority
+(``ADMISSION_PRIORITIES``, lower runs first), then arrival.  It is shed
+with a ``503`` and ``Retry-After`` (:class:`Overloaded`) when:
+
+- the queue is full and holds nothing of lower priority — otherwise the
+  newest lowest-priority waiter is shed to make room;
+- it has waited ``ADMISSION_QUEUE_TIMEOUT_MS``.
+
+So when Postgres slows down, requests queue here for a bounded time
+instead of piling up on the pool, and ``/api/health`` and
+``/api/refresh`` keep getting served ahead of ``/api/register``.
+
+With ``ADMISSION_ADAPTIVE`` the global limit follows observed latency,
+once per ``ADMISSION_ADAPT_SECONDS`` window: it is cut by a quarter when
+more than a tenth of requests took longer than
+``ADMISSION_TARGET_LATENCY_MS``, and grows by one while the limit was
+reached with no slow requests (down to ``ADMISSION_MIN_LIMIT``, up to
+``ADMISSION_LIMIT``).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from typing import Any
+
+from core.exceptions import ServiceUnavailableError
+
+logger = logging.getLogger(__name__)
+
+# Share of slow requests in a window above which the limit is cut
+_SLOW_SHARE = 0.1
+
+
+class Overloaded(ServiceUnavailableError):
+    detail = "Server is overloaded, please retry shortly"
+
+    def __init__(self, retry_after: int, detail: str | None = None):
+        super().__init__(detail)
+        self.headers = {"Retry-After": str(retry_after)}
+
+
+class PriorityGate:
+    """Counting gate with a bounded wait queue served by priority, then FIFO."""
+
+    def __init__(self, limit: int, max_queue: int, retry_after: int = 1) -> None:
+        self.limit = limit
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self.in_use = 0
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []  # heap
+        self._seq = itertools.count()
+        # Counters
+        self.admitted = 0
+        self.rejected = 0  # queue full on arrival
+        self.shed = 0  # evicted from the queue by a higher priority
+        self.timeouts = 0  # waited the whole queue timeout
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self, priority: int, timeout: float | None) -> None:
+        if self.in_use < self.limit and not self._waiters:
+            self.in_use += 1
+            self.admitted += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            worst = max(self._waiters, default=None)
+            if worst is None or worst[0] <= priority:
+                self.rejected += 1
+                raise Overloaded(self.retry_after)
+            self._remove(worst)
+            self.shed += 1
+            worst[2].set_exception(Overloaded(self.retry_after))
+
+        entry = (priority, next(self._seq), asyncio.get_running_loop().create_future())
+        heapq.heappush(self._waiters, entry)
+        future = entry[2]
+        try:
+            async with asyncio.timeout(timeout):
+                await future
+        except TimeoutError:
+            if future.done() and not future.cancelled() and future.exception() is None:
+                # Granted in the same tick as the timeout fired: the slot
+                # is ours, so use it rather than leak it.
+                self.admitted += 1
+                return
+            self._remove(entry)
+            self.timeouts += 1
+            raise Overloaded(self.retry_after) from None
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled() and future.exception() is None:
+                self.release()  # granted just as we were cancelled
+            else:
+                self._remove(entry)
+            raise
+        self.admitted += 1
+
+    def release(self) -> None:
+        self.in_use -= 1
+        self._wake()
+
+    def set_limit(self, limit: int) -> None:
+        self.limit = limit
+        self._wake()
+
+    def _remove(self, entry: tuple[int, int, asyncio.Future]) -> None:
+        try:
+            self._waiters.remove(entry)
+        except ValueError:
+            return
+        heapq.heapify(self._waiters)
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_use < self.limit:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                self.in_use += 1
+                future.set_result(None)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "in_use": self.in_use,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "shed": self.shed,
+            "timeouts": self.timeouts,
+        }
+
+
+class AdmissionController:
+    """The global gate, per-route gates and the adaptive limit."""
+
+    def __init__(
+        self,
+        limit: int,
+        *,
+        queue_size: int = 128,
+        queue_timeout: float = 0.5,
+        priorities: dict[str, int] | None = None,
+        default_priority: int = 2,
+        route_limits: dict[str, int] | None = None,
+        retry_after: int = 1,
+        adaptive: bool = False,
+        target_latency: float = 0.25,
+        min_limit: int = 4,
+        adapt_interval: float = 1.0,
+    ) -> None:
+        self.gate = PriorityGate(limit, queue_size, retry_after)
+        self.routes = {
+            path: PriorityGate(route_limit, queue_size, retry_after)
+            for path, route_limit in (route_limits or {}).items()
+        }
+        self.queue_timeout = queue_timeout or None
+        self.priorities = priorities or {}
+        self.default_priority = default_priority
+        self.adaptive = adaptive
+        self.target_latency = target_latency
+        self.min_limit = min(min_limit, limit)
+        self.max_limit = limit
+        self.adapt_interval = adapt_interval
+        self.resizes = 0
+        self._window_end = time.monotonic() + adapt_interval
+        self._window_requests = 0
+        self._window_slow = 0
+        self._window_peak = 0
+
+    async def admit(self, path: str) -> None:
+        """Wait for a slot for *path*; raise :class:`Overloaded` if shed."""
+        priority = self.priorities.get(path, self.default_priority)
+        timeout = self.queue_timeout
+        route_gate = self.routes.get(path)
+        if route_gate is not None:
+            started = time.monotonic()
+            await route_gate.acquire(priority, timeout)
+            if timeout is not None:
+                timeout = max(0.0, timeout - (time.monotonic() - started))
+        try:
+            await self.gate.acquire(priority, timeout)
+        except BaseException:
+            if route_gate is not None:
+                route_gate.release()
+            raise
+        if self.gate.in_use > self._window_peak:
+            self._window_peak = self.gate.in_use
+
+    def release(self, path: str, elapsed: float) -> None:
+        """Give back the slots taken by :meth:`admit`; *elapsed* is the request's time."""
+        self.gate.release()
+        route_gate = self.routes.get(path)
+        if route_gate is not None:
+            route_gate.release()
+        if not self.adaptive:
+            return
+        self._window_requests += 1
+        if elapsed > self.target_latency:
+            self._window_slow += 1
+        if time.monotonic() >= self._window_end:
+            self.adapt()
+
+    def adapt(self) -> None:
+        """Resize the global limit from the last window, then start a new window."""
+        requests, slow, peak = self._window_requests, self._window_slow, self._window_peak
+        self._window_requests = self._window_slow = 0
+        self._window_peak = self.gate.in_use
+        self._window_end = time.monotonic() + self.adapt_interval
+        limit = self.gate.limit
+        if requests and slow / requests > _SLOW_SHARE and limit > self.min_limit:
+            new_limit = max(self.min_limit, limit - max(1, limit // 4))
+        elif slow == 0 and peak >= limit and limit < self.max_limit:
+            new_limit = limit + 1
+        else:
+            return
+        self.gate.set_limit(new_limit)
+        self.resizes += 1
+        logger.info(
+            "Admission limit %d -> %d (%d/%d slow requests, peak in use %d)",
+            limit, new_limit, slow, requests, peak,
+        )
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            **self.gate.stats(),
+            "resizes": self.resizes,
+            "routes": {path: gate.stats() for path, gate in self.routes.items()},
+        }
+
+
+def _from_settings() -> AdmissionController:
+    from config import settings
+
+    return AdmissionController(
+        settings.admission_limit,
+        queue_size=settings.admission_queue_size,
+        queue_timeout=settings.admission_queue_timeout_ms / 1000,
+        priorities=settings.admission_priorities,
+        default_priority=settings.admission_default_priority,
+        route_limits=settings.admission_route_limits,
+        retry_after=settings.admission_retry_after_seconds,
+        adaptive=settings.admission_adaptive,
+        target_latency=settings.admission_target_latency_ms / 1000,
+        min_limit=settings.admission_min_limit,
+        adapt_interval=settings.admission_adapt_seconds,
+    )
+
+
+# Singleton — used by AdmissionMiddleware when ADMISSION_CONTROL is on
+admission = _from_settings()
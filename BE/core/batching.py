@@ -0,0 +1,114 @@
+"""Micro-batching of concurrent calls into one bulk operation.
+
+Callers ``await batcher.submit(item)``; items are collected until either
+``max_size`` are pending or ``window`` seconds have passed since the first
+one, then handed to the ``flush`` coroutine in a single call.  ``flush``
+returns one result per item, in order — an exception instance in that list
+is raised to that caller only.  If ``flush`` itself raises, every caller in
+the batch gets the error.
+
+Usage::
+
+    from core.batching import MicroBatcher
+
+    async def insert_many(rows: list[tuple]) -> list[int | Exception]: ...
+
+    batcher = MicroBatcher(insert_many, max_size=100, window=0.002)
+    user_id = await batcher.submit((email, password_hash))
+
+A caller that is cancelled after its item was flushed does not undo the
+write — the same as cancelling a single-row query mid-flight.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, Generic, Sequence, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class MicroBatcher(Generic[T, R]):
+    """Coalesce concurrent ``submit`` calls into batched ``flush`` calls."""
+
+    def __init__(
+        self,
+        flush: Callable[[list[T]], Awaitable[Sequence[R | BaseException]]],
+        *,
+        max_size: int = 100,
+        window: float = 0.002,
+    ) -> None:
+        self._flush = flush
+        self.max_size = max(1, max_size)
+        self.window = max(0.0, window)
+        self._pending: list[tuple[T, asyncio.Future]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._inflight: set[asyncio.Task] = set()
+        # Counters
+        self.batches = 0
+        self.items = 0
+        self.largest = 0
+
+    async def submit(self, item: T) -> R:
+        """Queue *item* for the next batch and wait for its result."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_size:
+            self._dispatch()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._dispatch)
+        return await future
+
+    def _dispatch(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        task = asyncio.ensure_future(self._run(batch))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _run(self, batch: list[tuple[T, asyncio.Future]]) -> None:
+        self.batches += 1
+        self.items += len(batch)
+        self.largest = max(self.largest, len(batch))
+        try:
+            results = await self._flush([item for item, _ in batch])
+            if len(results) != len(batch):
+                raise RuntimeError(
+                    f"flush returned {len(results)} results for {len(batch)} items"
+                )
+        except BaseException as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            if not isinstance(exc, Exception):
+                raise
+            return
+        for (_, future), result in zip(batch, results):
+            if future.done():  # caller was cancelled
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    async def drain(self) -> None:
+        """Flush whatever is pending and wait for in-flight batches."""
+        self._dispatch()
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "largest": self.largest,
+            "mean_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "pending": len(self._pending),
+            "inflight": len(self._inflight),
+        }
@@ -0,0 +1,213 @@
+"""Lightweight dependency-injection container.
+
+Providers are registered under a key (usually the class they produce) with
+a factory, the keys of the factory's positional arguments, and a lifetime:
+
+- ``singleton`` — one instance per app.  Built by :meth:`Container.startup`
+  (async factories are awaited there) or on first use; an optional
+  ``shutdown`` hook runs in :meth:`Container.shutdown`, in reverse order;
+- ``scoped`` — one instance per request, shared by everything resolved
+  while handling it;
+- ``transient`` — a new instance on every resolve.
+
+::
+
+    container = Container()
+    container.singleton(RoutingPool, create_pool, shutdown=close_pool)
+    container.scoped(UnitOfWork, UnitOfWork, deps=[RoutingPool])
+
+    @router.get("/things")
+    async def things(uow: Annotated[UnitOfWork, Depends(container.depends(UnitOfWork))]):
+        ...
+
+Each provider is compiled once into a resolver closure, so resolving a
+singleton per request is a dict lookup and a call.  :meth:`depends` hands
+FastAPI an ``async def`` (sync dependencies would run on the threadpool).
+"""
+
+from __future__ import annotations
+
+import inspect
+from contextlib import contextmanager
+from typing import Any, Callable, Hashable, Iterator, Literal, Sequence
+
+from fastapi import Request
+
+Lifetime = Literal["singleton", "scoped", "transient"]
+Resolver = Callable[[dict], Any]
+
+# Key of the per-request instance dict in the ASGI scope
+SCOPE_KEY = "container.scoped"
+
+
+_MISSING = object()
+
+
+def _builder(factory: Callable[..., Any], deps: list[Resolver]) -> Resolver:
+    """``scope -> factory(*resolved deps)``, unrolled for the common arities."""
+    if not deps:
+        return lambda _scope: factory()
+    if len(deps) == 1:
+        (dep,) = deps
+        return lambda scope: factory(dep(scope))
+    if len(deps) == 2:
+        first, second = deps
+        return lambda scope: factory(first(scope), second(scope))
+    return lambda scope: factory(*[dep(scope) for dep in deps])
+
+
+class _Provider:
+    __slots__ = ("factory", "lifetime", "deps", "shutdown")
+
+    def __init__(
+        self,
+        factory: Callable[..., Any],
+        lifetime: Lifetime,
+        deps: Sequence[Hashable],
+        shutdown: Callable[[Any], Any] | None,
+    ) -> None:
+        self.factory = factory
+        self.lifetime = lifetime
+        self.deps = tuple(deps)
+        self.shutdown = shutdown
+
+
+class Container:
+    """Registry of providers, their resolvers and the singleton instances."""
+
+    def __init__(self) -> None:
+        self._providers: dict[Hashable, _Provider] = {}
+        self._resolvers: dict[Hashable, Resolver] = {}
+        self._singletons: dict[Hashable, Any] = {}
+        self._dependencies: dict[Hashable, Callable[..., Any]] = {}
+
+    # ── Registration ──────────────────────────────────────────────────
+
+    def register(
+        self,
+        key: Hashable,
+        factory: Callable[..., Any],
+        *,
+        lifetime: Lifetime = "transient",
+        deps: Sequence[Hashable] = (),
+        shutdown: Callable[[Any], Any] | None = None,
+    ) -> None:
+        if lifetime not in ("singleton", "scoped", "transient"):
+            raise ValueError(f"Unknown lifetime: {lifetime!r}")
+        if lifetime != "singleton" and inspect.iscoroutinefunction(factory):
+            raise TypeError(f"Only singletons may have async factories: {key!r}")
+        self._providers[key] = _Provider(factory, lifetime, deps, shutdown)
+        self._resolvers.clear()
+
+    def singleton(self, key: Hashable, factory: Callable[..., Any], **options: Any) -> None:
+        self.register(key, factory, lifetime="singleton", **options)
+
+    def scoped(self, key: Hashable, factory: Callable[..., Any], **options: Any) -> None:
+        self.register(key, factory, lifetime="scoped", **options)
+
+    def transient(self, key: Hashable, factory: Callable[..., Any], **options: Any) -> None:
+        self.register(key, factory, lifetime="transient", **options)
+
+    @contextmanager
+    def override(self, key: Hashable, instance: Any) -> Iterator[None]:
+        """Resolve *key* to *instance* inside the block (tests)."""
+        previous = self._providers.get(key)
+        cached = self._singletons.pop(key, None)
+        self.register(key, lambda: instance, lifetime="singleton")
+        try:
+            yield
+        finally:
+            self._singletons.pop(key, None)
+            if previous is None:
+                del self._providers[key]
+            else:
+                self._providers[key] = previous
+            if cached is not None:
+                self._singletons[key] = cached
+            self._resolvers.clear()
+
+    # ── Resolution ────────────────────────────────────────────────────
+
+    def _resolver(self, key: Hashable) -> Resolver:
+        resolver = self._resolvers.get(key)
+        if resolver is None:
+            resolver = self._resolvers[key] = self._compile(key)
+        return resolver
+
+    def _compile(self, key: Hashable) -> Resolver:
+        try:
+            provider = self._providers[key]
+        except KeyError:
+            raise LookupError(f"No provider registered for {key!r}") from None
+        build = _builder(provider.factory, [self._resolver(dep) for dep in provider.deps])
+
+        if provider.lifetime == "singleton":
+            singletons = self._singletons
+            is_async = inspect.iscoroutinefunction(provider.factory)
+
+            def resolve_singleton(scope: dict) -> Any:
+                instance = singletons.get(key, _MISSING)
+                if instance is _MISSING:
+                    if is_async:
+                        raise RuntimeError(
+                            f"{key!r} has an async factory — call Container.startup() first"
+                        )
+                    instance = singletons[key] = build(scope)
+                return instance
+
+            return resolve_singleton
+
+        if provider.lifetime == "scoped":
+            def resolve_scoped(scope: dict) -> Any:
+                instance = scope.get(key, _MISSING)
+                if instance is _MISSING:
+                    instance = scope[key] = build(scope)
+                return instance
+
+            return resolve_scoped
+
+        return build
+
+    def resolve(self, key: Hashable, scope: dict | None = None) -> Any:
+        """Instance for *key*; *scope* holds this request's scoped instances."""
+        return self._resolver(key)({} if scope is None else scope)
+
+    def depends(self, key: Hashable) -> Callable[..., Any]:
+        """FastAPI dependency resolving *key* — pass to ``Depends``."""
+        dependency = self._dependencies.get(key)
+        if dependency is not None:
+            return dependency
+
+        async def dependency(request: Request) -> Any:
+            scope = request.scope.get(SCOPE_KEY)
+            if scope is None:
+                scope = request.scope[SCOPE_KEY] = {}
+            return self._resolver(key)(scope)
+
+        dependency.__name__ = f"provide_{getattr(key, '__name__', key)}"
+        self._dependencies[key] = dependency
+        return dependency
+
+    # ── Lifecycle ─────────────────────────────────────────────────────
+
+    async def startup(self) -> None:
+        """Build every singleton, in registration order."""
+        for key, provider in self._providers.items():
+            if provider.lifetime != "singleton" or key in self._singletons:
+                continue
+            args = [self.resolve(dep) for dep in provider.deps]
+            instance = provider.factory(*args)
+            if inspect.isawaitable(instance):
+                instance = await instance
+            self._singletons[key] = instance
+
+    async def shutdown(self) -> None:
+        """Run singleton ``shutdown`` hooks in reverse order and forget the instances."""
+        for key, provider in reversed(self._providers.items()):
+            if key not in self._singletons:
+                continue
+            instance = self._singletons.pop(key)
+            if provider.shutdown is not None:
+                result = provider.shutdown(instance)
+                if inspect.isawaitable(result):
+                    await result
@@ -1,40 +1,902 @@
-"""Async PostgreSQL connection pool lifecycle."""
+"""Async PostgreSQL connection pool lifecycle.
+
+Repositories declare their SQL once, at import time, in the statement
+registry::
+
+    from core.database import statements
+
+    GET_USER = statements.register("auth.get_user", "SELECT … WHERE id = $1")
+
+    row = await pool.fetchrow(GET_USER, user_id)
+
+A :class:`Statement` is still a ``str``, so it works anywhere SQL text
+does.  Every pooled connection prepares all registered statements when it
+is opened (the pool ``init`` hook), so the first request on a new
+connection — after a deploy or after the pool grows — skips the
+parse/plan round trip.  Statements registered later are prepared on first
+use and then reused.
+
+Session parameters (``application_name``, ``statement_timeout``, …) are
+sent as ``server_settings`` in the startup packet: no extra round trip,
+and they survive the ``RESET ALL`` asyncpg runs when a connection is
+returned to the pool.
+
+Read replicas (``DB_REPLICA_HOSTS``) sit behind the same interface.
+:func:`get_pool` returns a :class:`RoutingPool`: statements registered
+with ``readonly=True`` go to a replica, everything else — and every
+``acquire()`` — goes to the primary::
+
+    GET_USER = statements.register("auth.get_user", "SELECT …", readonly=True)
+
+A replica is skipped while its replay lag exceeds
+``DB_REPLICA_MAX_LAG_SECONDS`` (or it cannot be reached), and reads keyed
+on something this process just wrote (``pool.track_write(key)``; the key
+is the statement's first parameter) stay on the primary for
+``DB_READ_YOUR_WRITES_SECONDS``.
+
+Every pool is an :class:`InstrumentedPool`: acquire wait time, in-use /
+idle counts and connection churn are recorded and surfaced through
+``get_pool().stats()`` (and ``/api/health``).  With ``DB_POOL_ADAPTIVE``
+the number of connections handed out is raised or lowered between
+``DB_POOL_MIN`` and ``DB_POOL_MAX`` from the observed wait times.
+
+Each query's latency, row count and failures are recorded per statement
+(:data:`query_metrics`); queries slower than ``DB_SLOW_QUERY_MS`` are
+logged with parameter values redacted.  :func:`prometheus` renders these
+and the pool metrics for ``/api/metrics``.
+
+Acquire and query timeouts are capped to the request deadline
+(:mod:`core.deadline`); running out of it raises ``DeadlineExceeded`` (504).
+"""
 
 from __future__ import annotations
 
+import asyncio
+import collections
+import contextlib
+import itertools
+import logging
+import re
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Hashable, Iterator, Sequence, TypeVar
+
 import asyncpg
+from asyncpg.prepared_stmt import PreparedStatement
 
 from config import settings
+from core.cache import LRUCache
+from core import timing
+from core.deadline import DeadlineExceeded, bounded
+from core.metrics import (
+    Histogram,
+    prometheus_header,
+    prometheus_histogram,
+    prometheus_sample,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+# ---------------------------------------------------------------------------
+# Statement registry
+# ---------------------------------------------------------------------------
+
+class Statement(str):
+    """SQL text carrying the name it was registered under.
+
+    ``readonly`` statements may be served by a read replica.
+    """
+
+    name: str
+    readonly: bool
+
+    def __new__(cls, name: str, sql: str, readonly: bool = False) -> Statement:
+        stmt = super().__new__(cls, sql)
+        stmt.name = name
+        stmt.readonly = readonly
+        return stmt
+
+
+class StatementRegistry:
+    """All statements that pooled connections keep prepared."""
+
+    def __init__(self) -> None:
+        self._statements: dict[str, Statement] = {}
+
+    def register(self, name: str, sql: str, *, readonly: bool = False) -> Statement:
+        """Declare *sql* under a unique *name* and return it as a :class:`Statement`.
+
+        Pass ``readonly=True`` for queries that may run on a replica.
+        """
+        existing = self._statements.get(name)
+        if existing is not None and (existing != sql or existing.readonly != readonly):
+            raise ValueError(f"Statement {name!r} is already registered with different SQL")
+        stmt = Statement(name, sql, readonly)
+        self._statements[name] = stmt
+        return stmt
+
+    def __iter__(self) -> Iterator[Statement]:
+        return iter(list(self._statements.values()))
+
+    def __len__(self) -> int:
+        return len(self._statements)
+
+
+# Singleton — repositories register into this at import time
+statements = StatementRegistry()
+
+
+# ---------------------------------------------------------------------------
+# Query metrics
+# ---------------------------------------------------------------------------
+
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_SPACE = re.compile(r"\s+")
+
+
+def normalize_sql(sql: str, max_length: int = 120) -> str:
+    """Collapse ad-hoc SQL into a label: literals become ``?``, whitespace one space."""
+    text = _SPACE.sub(" ", _LITERAL.sub("?", sql)).strip()
+    return text if len(text) <= max_length else text[: max_length - 1] + "…"
+
+
+def redact(args: tuple) -> str:
+    """Describe query parameters by type only — values may be credentials."""
+    return ", ".join(f"${i}={type(a).__name__}" for i, a in enumerate(args, 1))
+
+
+class _StatementStats:
+    __slots__ = ("latency", "rows", "errors")
+
+    def __init__(self) -> None:
+        self.latency = Histogram()
+        self.rows = 0
+        self.errors = 0
+
+
+class QueryMetrics:
+    """Latency, rows and errors per statement.
+
+    Registered statements are labelled by name; other SQL by its normalised
+    text, up to ``max_statements`` distinct labels (the rest share
+    ``"other"``) so ad-hoc queries cannot grow memory without bound.
+    """
+
+    def __init__(self, slow_threshold: float, max_statements: int = 500) -> None:
+        self.slow_threshold = slow_threshold
+        self.max_statements = max_statements
+        self._stats: dict[str, _StatementStats] = {}
+        self._labels: dict[str, str] = {}  # raw SQL → label
+
+    def label(self, query: str) -> str:
+        if isinstance(query, Statement):
+            return query.name
+        label = self._labels.get(query)
+        if label is None:
+            if len(self._labels) >= self.max_statements:
+                return "other"  # not cached, or every new query string would be
+            label = self._labels[query] = normalize_sql(query)
+        return label
+
+    def record(self, query: str, args: tuple, elapsed: float, rows: int, failed: bool) -> None:
+        label = self.label(query)
+        stats = self._stats.get(label)
+        if stats is None:
+            stats = self._stats[label] = _StatementStats()
+        stats.latency.observe(elapsed)
+        stats.rows += rows
+        if failed:
+            stats.errors += 1
+        if elapsed >= self.slow_threshold > 0:
+            logger.warning(
+                "Slow query %s: %.1f ms, %d rows%s (%s)",
+                label, elapsed * 1000, rows, ", failed" if failed else "", redact(args),
+            )
+
+    def reset(self) -> None:
+        self._stats.clear()
+        self._labels.clear()
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        return {
+            label: {**s.latency.snapshot(), "rows": s.rows, "errors": s.errors}
+            for label, s in self._stats.items()
+        }
+
+    def prometheus(self) -> Iterator[str]:
+        yield from prometheus_header(
+            "db_query_duration_seconds", "histogram", "Query latency by statement"
+        )
+        for label, s in self._stats.items():
+            yield from prometheus_histogram("db_query_duration_seconds", {"statement": label}, s.latency)
+        yield from prometheus_header("db_query_rows_total", "counter", "Rows returned or affected")
+        for label, s in self._stats.items():
+            yield prometheus_sample("db_query_rows_total", {"statement": label}, s.rows)
+        yield from prometheus_header("db_query_errors_total", "counter", "Failed queries")
+        for label, s in self._stats.items():
+            yield prometheus_sample("db_query_errors_total", {"statement": label}, s.errors)
+
+
+# Singleton — every Connection records into this
+query_metrics = QueryMetrics(settings.db_slow_query_ms / 1000)
+
+
+def _count(result: Any) -> int:
+    return 0 if result is None else 1
+
+
+def _status_rows(status: str) -> int:
+    # "INSERT 0 3", "UPDATE 2", "DELETE 0", "CREATE TABLE" …
+    last = status.rpartition(" ")[2]
+    return int(last) if last.isdigit() else 0
+
+
+# ---------------------------------------------------------------------------
+# Connection
+# ---------------------------------------------------------------------------
+
+class Connection(asyncpg.Connection):
+    """asyncpg connection that serves registered statements from prepared ones.
+
+    Every ``fetch*`` / ``execute`` is timed into :data:`query_metrics`.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._prepared: dict[str, PreparedStatement] = {}
+
+    async def prepare_registered(self, readonly_only: bool = False) -> None:
+        """Prepare every registered statement on this connection.
+
+        Hot standbys refuse the locks that planning a write takes, so replica
+        connections pass ``readonly_only=True``.
+        """
+        for stmt in statements:
+            if readonly_only and not stmt.readonly:
+                continue
+            if stmt.name not in self._prepared:
+                self._prepared[stmt.name] = await self.prepare(stmt)
+
+    async def _statement(self, query: Statement) -> PreparedStatement:
+        ps = self._prepared.get(query.name)
+        if ps is None:
+            ps = self._prepared[query.name] = await self.prepare(query)
+        return ps
+
+    async def _run(self, query: Statement, call: Callable[[PreparedStatement], Awaitable[T]]) -> T:
+        try:
+            return await call(await self._statement(query))
+        except asyncpg.InvalidCachedStatementError:
+            # Schema changed under us (e.g. a migration) — re-prepare once.
+            self._prepared.pop(query.name, None)
+            return await call(await self._statement(query))
+
+    async def _timed(
+        self, query: str, args: tuple, call: Awaitable[T], rows: Callable[[T], int]
+    ) -> T:
+        started = time.perf_counter()
+        try:
+            result = await call
+        except Exception:
+            elapsed = time.perf_counter() - started
+            query_metrics.record(query, args, elapsed, 0, True)
+            timing.record("db", elapsed)
+            raise
+        elapsed = time.perf_counter() - started
+        query_metrics.record(query, args, elapsed, rows(result), False)
+        timing.record("db", elapsed)
+        return result
+
+    async def fetch(self, query, *args, timeout=None, record_class=None):
+        if isinstance(query, Statement) and record_class is None:
+            call = self._run(query, lambda ps: ps.fetch(*args, timeout=timeout))
+        else:
+            call = super().fetch(query, *args, timeout=timeout, record_class=record_class)
+        return await self._timed(query, args, call, len)
+
+    async def fetchrow(self, query, *args, timeout=None, record_class=None):
+        if isinstance(query, Statement) and record_class is None:
+            call = self._run(query, lambda ps: ps.fetchrow(*args, timeout=timeout))
+        else:
+            call = super().fetchrow(query, *args, timeout=timeout, record_class=record_class)
+        return await self._timed(query, args, call, _count)
+
+    async def fetchval(self, query, *args, column=0, timeout=None):
+        if isinstance(query, Statement):
+            call = self._run(
+                query, lambda ps: ps.fetchval(*args, column=column, timeout=timeout)
+            )
+        else:
+            call = super().fetchval(query, *args, column=column, timeout=timeout)
+        return await self._timed(query, args, call, _count)
+
+    async def execute(self, query, *args, timeout=None):
+        if isinstance(query, Statement) and args:
+            async def prepared(ps: PreparedStatement) -> str:
+                await ps.fetch(*args, timeout=timeout)
+                return ps.get_statusmsg()
+            call = self._run(query, prepared)
+        else:
+            call = super().execute(query, *args, timeout=timeout)
+        return await self._timed(query, args, call, _status_rows)
+
+
+# ---------------------------------------------------------------------------
+# Instrumented pool
+# ---------------------------------------------------------------------------
+
+# Acquire waits are usually well under a millisecond — finer low buckets.
+ACQUIRE_BUCKETS: tuple[float, ...] = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0,
+)
+
+# Adaptive sizing: grow when more than this share of acquires in a window
+# waited longer than the target.
+_SLOW_SHARE = 0.05
+
+
+def _timeout_error(requested: float | None, applied: float | None) -> Exception:
+    """The deadline's 504 if it is what cut the wait short, else a plain timeout."""
+    if applied is not None and applied != requested:
+        return DeadlineExceeded()
+    return asyncio.TimeoutError()
+
+
+async def _query(call: Callable[..., Awaitable[T]], *args: Any, timeout: float | None, **kwargs: Any) -> T:
+    """Run *call* with its timeout capped to the request deadline.
+
+    asyncpg cancels the statement on the server when the timeout fires —
+    or when the awaiting task is cancelled, e.g. because the client left.
+    """
+    limit = bounded(timeout)
+    try:
+        return await call(*args, timeout=limit, **kwargs)
+    except asyncio.TimeoutError:
+        raise _timeout_error(timeout, limit) from None
+
+
+class _Gate:
+    """FIFO counting gate whose limit can change while callers wait."""
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.in_use = 0
+        self._waiters: collections.deque[asyncio.Future] = collections.deque()
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> None:
+        if self.in_use < self.limit and not self._waiters:
+            self.in_use += 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()  # granted just as we were cancelled
+            else:
+                self._waiters.remove(future)
+            raise
+
+    def release(self) -> None:
+        self.in_use -= 1
+        self._wake()
+
+    def set_limit(self, limit: int) -> None:
+        self.limit = limit
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_use < self.limit:
+            future = self._waiters.popleft()
+            if not future.done():
+                self.in_use += 1
+                future.set_result(None)
+
+
+class InstrumentedPool:
+    """An :class:`asyncpg.Pool` with acquire metrics and an adjustable limit.
+
+    asyncpg cannot resize a pool in place, so the pool is opened with
+    ``max_size`` connections and a gate in front of ``acquire`` decides how
+    many may be in use.  Connections above the limit go idle and are closed
+    after ``max_inactive_connection_lifetime``.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        min_size: int,
+        max_size: int,
+        *,
+        readonly_only: bool = False,
+        adaptive: bool = False,
+        target_wait: float = 0.005,
+    ) -> None:
+        self.name = name
+        self.min_size = max(1, min_size)
+        self.max_size = max(self.min_size, max_size)
+        self.readonly_only = readonly_only
+        self.adaptive = adaptive
+        self.target_wait = target_wait
+        self.pool: asyncpg.Pool | None = None
+        # Adaptive pools start small and grow on demand.
+        self._gate = _Gate(self.min_size if adaptive else self.max_size)
+        self.acquire_wait = Histogram(ACQUIRE_BUCKETS)
+        self.acquires = 0
+        self.timeouts = 0
+        self.opened = 0
+        self.closed = 0
+        self.resizes = 0
+        # Current adaptation window
+        self._window_acquires = 0
+        self._window_slow = 0
+        self._window_peak = 0
+
+    async def open(self, **connect_kwargs: Any) -> InstrumentedPool:
+        self.pool = await asyncpg.create_pool(
+            min_size=min(connect_kwargs.pop("min_size", self.min_size), self.max_size),
+            max_size=self.max_size,
+            connection_class=Connection,
+            init=self._on_connect,
+            **connect_kwargs,
+        )
+        return self
+
+    async def _on_connect(self, conn: Connection) -> None:
+        """Pool ``init`` hook — runs once per new physical connection."""
+        self.opened += 1
+        conn.add_termination_listener(self._on_close)
+        await conn.prepare_registered(readonly_only=self.readonly_only)
+
+    def _on_close(self, _conn: Connection) -> None:
+        self.closed += 1
+
+    # ── Acquire / release ─────────────────────────────────────────────
+
+    @contextlib.asynccontextmanager
+    async def acquire(self, *, timeout: float | None = None) -> AsyncIterator[Connection]:
+        """Acquire a connection, waiting at most *timeout* or the request deadline."""
+        started = time.perf_counter()
+        limit = bounded(timeout)
+        try:
+            async with asyncio.timeout(limit):
+                await self._gate.acquire()
+        except TimeoutError:
+            self.timeouts += 1
+            raise _timeout_error(timeout, limit) from None
+        try:
+            left = None if limit is None else max(0.0, limit - (time.perf_counter() - started))
+            try:
+                conn = await self.pool.acquire(timeout=left)
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                raise _timeout_error(timeout, limit) from None
+            self._record_wait(time.perf_counter() - started)
+            try:
+                yield conn
+            finally:
+                await self.pool.release(conn)
+        finally:
+            self._gate.release()
+
+    def _record_wait(self, waited: float) -> None:
+        self.acquire_wait.observe(waited)
+        timing.record("pool", waited)
+        self.acquires += 1
+        self._window_acquires += 1
+        if waited > self.target_wait:
+            self._window_slow += 1
+        if self._gate.in_use > self._window_peak:
+            self._window_peak = self._gate.in_use
+
+    async def fetch(self, query, *args, timeout=None, **kwargs):
+        async with self.acquire() as conn:
+            return await _query(conn.fetch, query, *args, timeout=timeout, **kwargs)
+
+    async def fetchrow(self, query, *args, timeout=None, **kwargs):
+        async with self.acquire() as conn:
+            return await _query(conn.fetchrow, query, *args, timeout=timeout, **kwargs)
+
+    async def fetchval(self, query, *args, timeout=None, **kwargs):
+        async with self.acquire() as conn:
+            return await _query(conn.fetchval, query, *args, timeout=timeout, **kwargs)
+
+    async def execute(self, query, *args, timeout=None):
+        async with self.acquire() as conn:
+            return await _query(conn.execute, query, *args, timeout=timeout)
+
+    # ── Sizing ────────────────────────────────────────────────────────
+
+    @property
+    def limit(self) -> int:
+        return self._gate.limit
+
+    @property
+    def in_use(self) -> int:
+        return self._gate.in_use
+
+    @property
+    def waiting(self) -> int:
+        return self._gate.waiting
+
+    def adapt(self) -> None:
+        """Resize the limit from the last window's waits, then start a new window."""
+        acquires, slow, peak = self._window_acquires, self._window_slow, self._window_peak
+        self._window_acquires = self._window_slow = 0
+        self._window_peak = self._gate.in_use
+        limit = self._gate.limit
+        if acquires and slow / acquires > _SLOW_SHARE and limit < self.max_size:
+            new_limit = min(self.max_size, limit + max(1, limit // 4))
+        elif slow == 0 and peak <= limit // 2 and limit > self.min_size:
+            new_limit = limit - 1
+        else:
+            return
+        self._gate.set_limit(new_limit)
+        self.resizes += 1
+        logger.info(
+            "Pool %s limit %d -> %d (%d/%d slow acquires, peak in use %d)",
+            self.name, limit, new_limit, slow, acquires, peak,
+        )
+
+    # ── Introspection ─────────────────────────────────────────────────
+
+    def get_size(self) -> int:
+        return self.pool.get_size() if self.pool else 0
+
+    def get_idle_size(self) -> int:
+        return self.pool.get_idle_size() if self.pool else 0
+
+    async def close(self) -> None:
+        if self.pool is not None:
+            await self.pool.close()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "size": self.get_size(),
+            "idle": self.get_idle_size(),
+            "in_use": self._gate.in_use,
+            "waiting": self._gate.waiting,
+            "limit": self._gate.limit,
+            "min_size": self.min_size,
+            "max_size": self.max_size,
+            "acquires": self.acquires,
+            "timeouts": self.timeouts,
+            "connections_opened": self.opened,
+            "connections_closed": self.closed,
+            "resizes": self.resizes,
+            "acquire_wait_seconds": self.acquire_wait.snapshot(),
+        }
+
+
+# ---------------------------------------------------------------------------
+# Primary / replica routing
+# ---------------------------------------------------------------------------
+
+# Seconds of replay lag; 0 when caught up with everything received (an idle
+# primary leaves pg_last_xact_replay_timestamp() behind without any lag).
+# NULL (unhealthy) when the standby is not streaming from the primary: a
+# standby whose WAL receiver is gone replays what it has and would then
+# report 0 forever.  The view has a row only while a receiver runs, and
+# roles without pg_read_all_stats see its status as NULL.
+REPLICA_LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN NOT EXISTS (
+            SELECT 1 FROM pg_stat_wal_receiver WHERE COALESCE(status, 'streaming') = 'streaming'
+        ) THEN NULL
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END::float8
+"""
+
+
+def _busy(p: InstrumentedPool) -> int:
+    return p.get_size() - p.get_idle_size()
+
+
+class RoutingPool:
+    """A primary pool plus read replicas, routed per statement.
+
+    Exposes the subset of :class:`asyncpg.Pool` the repositories use, so
+    they need no changes beyond marking statements ``readonly``.
+    """
+
+    def __init__(
+        self,
+        primary: InstrumentedPool,
+        replicas: Sequence[InstrumentedPool] = (),
+        *,
+        selection: str = "round_robin",
+        max_lag: float = 1.0,
+        read_your_writes: float = 5.0,
+        max_tracked_writes: int = 100_000,
+    ) -> None:
+        if selection not in ("round_robin", "least_busy"):
+            raise ValueError(f"Unknown replica selection: {selection!r}")
+        self.primary = primary
+        self.replicas = list(replicas)
+        self.selection = selection
+        self.max_lag = max_lag
+        self.read_your_writes = read_your_writes
+        self.lag: list[float | None] = [0.0] * len(self.replicas)
+        self._healthy = list(self.replicas)
+        self._next = itertools.count()
+        self._recent_writes: LRUCache[Hashable, bool] = LRUCache(max_tracked_writes)
+        self._tasks: list[asyncio.Task] = []
+        # Counters
+        self.replica_reads = 0
+        self.primary_reads = 0
+        self.pinned_reads = 0
+
+    # ── Routing ───────────────────────────────────────────────────────
+
+    def reader(self, key: Hashable | None = None) -> InstrumentedPool:
+        """Pool to read from: a healthy replica, else the primary."""
+        if key is not None and self._recent_writes.get(key):
+            self.pinned_reads += 1
+            return self.primary
+        healthy = self._healthy
+        if not healthy:
+            self.primary_reads += 1
+            return self.primary
+        self.replica_reads += 1
+        if self.selection == "least_busy":
+            return min(healthy, key=_busy)
+        return healthy[next(self._next) % len(healthy)]
+
+    def writer(self) -> InstrumentedPool:
+        return self.primary
+
+    def track_write(self, *keys: Hashable) -> None:
+        """Keep reads keyed on *keys* on the primary for the read-your-writes window."""
+        if not self.replicas or self.read_your_writes <= 0:
+            return
+        for key in keys:
+            self._recent_writes.set_ttl(key, True, self.read_your_writes)
+
+    def _route(self, query: Any, args: tuple) -> InstrumentedPool:
+        if self.replicas and isinstance(query, Statement) and query.readonly:
+            return self.reader(args[0] if args else None)
+        return self.primary
+
+    # ── asyncpg.Pool interface ────────────────────────────────────────
+
+    async def fetch(self, query, *args, **kwargs):
+        return await self._route(query, args).fetch(query, *args, **kwargs)
+
+    async def fetchrow(self, query, *args, **kwargs):
+        return await self._route(query, args).fetchrow(query, *args, **kwargs)
+
+    async def fetchval(self, query, *args, **kwargs):
+        return await self._route(query, args).fetchval(query, *args, **kwargs)
+
+    async def execute(self, query, *args, **kwargs):
+        return await self._route(query, args).execute(query, *args, **kwargs)
+
+    def acquire(self, *, timeout: float | None = None):
+        """Acquire a primary connection (transactions, COPY, ad-hoc SQL)."""
+        return self.primary.acquire(timeout=timeout)
+
+    def get_size(self) -> int:
+        return self.primary.get_size()
+
+    # ── Replica health ────────────────────────────────────────────────
+
+    async def check_replicas(self, timeout: float = 1.0) -> None:
+        """Measure each replica's lag and update the set reads may use."""
+
+        async def measure(replica: InstrumentedPool) -> float | None:
+            try:
+                return await replica.fetchval(REPLICA_LAG_SQL, timeout=timeout)
+            except (OSError, asyncio.TimeoutError, asyncpg.PostgresError,
+                    asyncpg.InterfaceError) as exc:
+                logger.debug("Replica lag check failed: %s", exc)
+                return None
+
+        self.lag = list(await asyncio.gather(*(measure(r) for r in self.replicas)))
+        healthy = [
+            replica for replica, lag in zip(self.replicas, self.lag)
+            if lag is not None and lag <= self.max_lag
+        ]
+        if len(healthy) != len(self._healthy):
+            logger.warning(
+                "Read replicas in rotation: %d of %d (lag: %s)",
+                len(healthy), len(self.replicas), self.lag,
+            )
+        self._healthy = healthy
+
+    def _every(self, interval: float, fn: Callable[[], Awaitable[None]]) -> None:
+        async def loop() -> None:
+            while True:
+                await asyncio.sleep(interval)
+                await fn()
+
+        self._tasks.append(asyncio.create_task(loop()))
+
+    def start_monitor(self, interval: float) -> None:
+        """Re-check replica lag every *interval* seconds in the background."""
+        if self.replicas:
+            self._every(interval, lambda: self.check_replicas(timeout=interval))
+
+    def start_controller(self, interval: float) -> None:
+        """Adapt the limit of every adaptive pool every *interval* seconds."""
+        pools = [p for p in (self.primary, *self.replicas) if p.adaptive]
+        if not pools:
+            return
+
+        async def adapt() -> None:
+            for p in pools:
+                p.adapt()
+
+        self._every(interval, adapt)
+
+    async def close(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        self._tasks.clear()
+        await asyncio.gather(*(p.close() for p in (self.primary, *self.replicas)))
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "replicas": len(self.replicas),
+            "healthy_replicas": len(self._healthy),
+            "replica_lag_seconds": self.lag,
+            "replica_reads": self.replica_reads,
+            "primary_reads": self.primary_reads,
+            "pinned_reads": self.pinned_reads,
+            "pools": {p.name: p.stats() for p in (self.primary, *self.replicas)},
+        }
+
+
+# ---------------------------------------------------------------------------
+# Pool lifecycle
+# ---------------------------------------------------------------------------
 
 # Module-level pool reference — set during app lifespan.
-pool: asyncpg.Pool | None = None
+pool: RoutingPool | None = None
 
 
-async def create_pool() -> asyncpg.Pool:
-    """Create and return an asyncpg connection pool."""
+def _server_settings() -> dict[str, str]:
+    server_settings = {"application_name": settings.db_application_name}
+    if settings.db_statement_timeout_ms:
+        server_settings["statement_timeout"] = str(settings.db_statement_timeout_ms)
+    server_settings.update(settings.db_session_settings)
+    return server_settings
+
+
+def _parse_host(spec: str) -> tuple[str, int]:
+    host, _, port = spec.rpartition(":")
+    if not host:
+        return spec, settings.db_port
+    return host, int(port)
+
+
+def _new_pool(name: str, *, readonly_only: bool = False) -> InstrumentedPool:
+    return InstrumentedPool(
+        name,
+        settings.db_pool_min,
+        settings.db_pool_max,
+        readonly_only=readonly_only,
+        adaptive=settings.db_pool_adaptive,
+        target_wait=settings.db_pool_target_wait_ms / 1000,
+    )
+
+
+def _connect_kwargs(host: str, port: int) -> dict[str, Any]:
+    return {
+        "host": host,
+        "port": port,
+        "database": settings.db_name,
+        "user": settings.db_user,
+        "password": settings.db_password,
+        "max_inactive_connection_lifetime": settings.db_pool_max_idle_seconds,
+        "server_settings": _server_settings(),
+    }
+
+
+async def _open_replica(spec: str) -> InstrumentedPool:
+    host, port = _parse_host(spec)
+    try:
+        return await _new_pool(f"replica:{spec}", readonly_only=True).open(
+            **_connect_kwargs(host, port)
+        )
+    except (OSError, asyncpg.PostgresError) as exc:
+        # Start without it; the lag monitor keeps it out of rotation and
+        # connects lazily once it is back.
+        logger.warning("Read replica %s unavailable at startup: %s", spec, exc)
+        return await _new_pool(f"replica:{spec}", readonly_only=True).open(
+            min_size=0, **_connect_kwargs(host, port)
+        )
+
+
+async def create_pool() -> RoutingPool:
+    """Create the primary pool and any replica pools.
+
+    asyncpg opens ``db_pool_min`` connections (preparing the registered
+    statements on each) before this returns, so the app is warm when the
+    lifespan yields.
+    """
     global pool
-    pool = await asyncpg.create_pool(
-        host=settings.db_host,
-        port=settings.db_port,
-        database=settings.db_name,
-        user=settings.db_user,
-        password=settings.db_password,
-        min_size=settings.db_pool_min,
-        max_size=settings.db_pool_max,
+    primary = await _new_pool("primary").open(
+        **_connect_kwargs(settings.db_host, settings.db_port)
+    )
+    replicas = [await _open_replica(spec) for spec in settings.db_replica_hosts]
+    pool = RoutingPool(
+        primary,
+        replicas,
+        selection=settings.db_replica_selection,
+        max_lag=settings.db_replica_max_lag_seconds,
+        read_your_writes=settings.db_read_your_writes_seconds,
+    )
+    if replicas:
+        await pool.check_replicas()
+        pool.start_monitor(settings.db_replica_check_interval_seconds)
+    pool.start_controller(settings.db_pool_adapt_interval_seconds)
+    logger.info(
+        "Database pool ready: %d connections, %d statements prepared on each, "
+        "%d/%d read replicas healthy",
+        pool.get_size(), len(statements), pool.stats()["healthy_replicas"], len(replicas),
     )
     return pool
 
 
 async def close_pool() -> None:
-    """Gracefully close the connection pool."""
+    """Gracefully close the connection pools."""
     global pool
     if pool:
         await pool.close()
         pool = None
 
 
-def get_pool() -> asyncpg.Pool:
+def get_pool() -> RoutingPool:
     """Return the current pool.  Raises if not initialised."""
     if pool is None:
         raise RuntimeError("Database pool is not initialised — call create_pool() first")
     return pool
+
+
+async def connect() -> asyncpg.Connection:
+    """Open a dedicated connection to the primary, outside the pools.
+
+    For long-lived sessions such as ``LISTEN`` that would otherwise pin a
+    pooled connection.  The caller closes it.
+    """
+    kwargs = _connect_kwargs(settings.db_host, settings.db_port)
+    del kwargs["max_inactive_connection_lifetime"]  # pool-only option
+    return await asyncpg.connect(**kwargs)
+
+
+def prometheus() -> Iterator[str]:
+    """Query and pool metrics in Prometheus text format (one line per item)."""
+    yield from query_metrics.prometheus()
+    if pool is None:
+        return
+    pools = [pool.primary, *pool.replicas]
+    yield from prometheus_header("db_pool_connections", "gauge", "Pool connections by state")
+    for p in pools:
+        yield prometheus_sample("db_pool_connections", {"pool": p.name, "state": "in_use"}, p.in_use)
+        yield prometheus_sample("db_pool_connections", {"pool": p.name, "state": "idle"}, p.get_idle_size())
+        yield prometheus_sample("db_pool_connections", {"pool": p.name, "state": "waiting"}, p.waiting)
+    yield from prometheus_header("db_pool_limit", "gauge", "Connections the pool may hand out")
+    for p in pools:
+        yield prometheus_sample("db_pool_limit", {"pool": p.name}, p.limit)
+    yield from prometheus_header("db_pool_acquire_wait_seconds", "histogram", "Time to acquire a connection")
+    for p in pools:
+        yield from prometheus_histogram("db_pool_acquire_wait_seconds", {"pool": p.name}, p.acquire_wait)
+    yield from prometheus_header("db_pool_acquire_timeouts_total", "counter", "Acquires that timed out")
+    for p in pools:
+        yield prometheus_sample("db_pool_acquire_timeouts_total", {"pool": p.name}, p.timeouts)
+    yield from prometheus_header("db_pool_connections_opened_total", "counter", "Physical connections opened")
+    for p in pools:
+        yield prometheus_sample("db_pool_connections_opened_total", {"pool": p.name}, p.opened)
+    yield from prometheus_header("db_pool_connections_closed_total", "counter", "Physical connections closed")
+    for p in pools:
+        yield prometheus_sample("db_pool_connections_closed_total", {"pool": p.name}, p.closed)
@@ -0,0 +1,77 @@
+"""Per-request deadlines.
+
+:class:`core.middleware.deadline.DeadlineMiddleware` starts a deadline for
+every request; anything below it can ask how much of the budget is left::
+
+    from core.deadline import remaining
+
+    timeout = remaining()          # seconds, None if no deadline is set
+    await conn.fetch(sql, timeout=timeout)
+
+``core.database`` already does this for pool acquires and queries, so a
+slow Postgres costs a request at most its budget and then a ``504``
+(:class:`DeadlineExceeded`) instead of a hung request and a held
+connection.  The deadline lives in a ``ContextVar`` and so follows the
+request through ``await`` and tasks created from it.
+"""
+
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from core.exceptions import GatewayTimeoutError
+
+_deadline: ContextVar[float | None] = ContextVar("deadline", default=None)
+
+
+class DeadlineExceeded(GatewayTimeoutError):
+    detail = "Request deadline exceeded"
+
+
+def deadline() -> float | None:
+    """The current deadline as a ``time.monotonic()`` value, if any."""
+    return _deadline.get()
+
+
+def remaining() -> float | None:
+    """Seconds left before the deadline, ``None`` without one.
+
+    Raises :class:`DeadlineExceeded` once it has passed.
+    """
+    at = _deadline.get()
+    if at is None:
+        return None
+    left = at - time.monotonic()
+    if left <= 0:
+        raise DeadlineExceeded()
+    return left
+
+
+def bounded(timeout: float | None) -> float | None:
+    """*timeout* capped to the remaining budget."""
+    left = remaining()
+    if left is None:
+        return timeout
+    return left if timeout is None else min(timeout, left)
+
+
+@contextmanager
+def deadline_scope(seconds: float | None) -> Iterator[None]:
+    """Run the block with a deadline *seconds* from now.
+
+    Nested scopes can only shorten the deadline.  ``None`` or ``0`` keeps
+    the current one.
+    """
+    if not seconds:
+        yield
+        return
+    at = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(at if current is None else min(at, current))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
@@ -1,28 +1,46 @@
 """JWT authentication dependency for protected routes."""
 
+import hashlib
 from typing import Annotated
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
+from config import settings
+from core.cache import LRUCache
 from core.security import verify_token
 
 security = HTTPBearer()
 
+# Verified access tokens → ``(user_id, email)``.  Keyed by a digest of the
+# token so raw credentials are never held; entries die at the token's ``exp``.
+token_cache: LRUCache[bytes, tuple[int, str]] = LRUCache(settings.token_cache_size)
+
+
+def _token_key(token: str) -> bytes:
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
 
 async def get_current_user(
     credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)]
 ) -> dict:
     """Dependency to verify JWT token and extract user info.
-    
+
+    Tokens seen before are served from :data:`token_cache` without
+    re-checking the signature.
     Raises HTTPException 401 if token is invalid or expired.
     """
+    key = _token_key(credentials.credentials)
+    cached = token_cache.get(key)
+    if cached is not None:
+        return {"id": cached[0], "email": cached[1]}
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    
+
     try:
         payload = verify_token(credentials.credentials)
         if payload.get("type") != "access":
@@ -31,6 +49,24 @@ async def get_current_user(
         email: str = payload.get("email")
         if user_id is None or email is None:
             raise credentials_exception
-        return {"id": user_id, "email": email}
     except Exception:
         raise credentials_exception
+
+    if "exp" in payload:
+        token_cache.set(key, (user_id, email), float(payload["exp"]))
+    return {"id": user_id, "email": email}
+
+
+async def require_admin(
+    user: Annotated[dict, Depends(get_current_user)]
+) -> dict:
+    """Dependency for admin-only routes: the caller's email must be in ``ADMIN_EMAILS``.
+
+    Raises HTTPException 403 otherwise.
+    """
+    if user["email"].lower() not in {e.lower() for e in settings.admin_emails}:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required",
+        )
+    return user
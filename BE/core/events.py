@@ -9,48 +9,616 @@ Usage::
     async def handle_user_registered(payload: dict):
         ...
 
+    # Every user.* event, delivered in lists of (topic, payload)
+    @event_bus.on("user.*", batch=True, max_size=500, max_latency=0.1)
+    async def write_audit_log(events: list[tuple[str, dict]]):
+        ...
+
     # Publish (from a service)
     await event_bus.publish("user.registered", {"user_id": 42, "email": "a@b.com"})
+
+Handlers do not run in the publisher's task.  ``publish`` puts one job
+per handler on a bounded queue served by a fixed set of worker tasks, so a
+burst of events cannot spawn unbounded tasks, and handler failures are
+logged and counted instead of lost.  When the queue is full the overflow
+policy decides:
+
+- ``block`` — ``publish`` waits for room (backpressure on the publisher);
+- ``drop_oldest`` — the oldest queued job is discarded and counted;
+- ``reject`` — ``publish`` raises :class:`EventBusFull` (503).
+
+Patterns match whole dot-separated segments; ``*`` matches exactly one
+(``user.*`` matches ``user.registered``, not ``user.a.b``).  Patterns are
+compiled at subscribe time into a topic → subscriptions table, so
+``publish`` is one dict lookup however many patterns there are.
+
+Batch subscriptions get their own bounded queue (same overflow policy) and
+one flusher task that calls the handler with up to ``max_size`` events,
+no later than ``max_latency`` seconds after the first one arrived.
+
+With several worker processes, a :class:`PostgresBridge` relays selected
+topics to the others over ``LISTEN/NOTIFY`` (``EVENT_BRIDGE=true``) so,
+for example, every worker's user cache sees an invalidation.
+
+Workers start with the first publish (or :meth:`EventBus.start`);
+:meth:`EventBus.drain` delivers what is queued and stops them — the app
+lifespan calls it before closing the database pool.
 """
 
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
-from typing import Any, Callable, Coroutine
+import os
+import re
+import time
+import uuid
+from collections import deque
+from typing import Any, Awaitable, Callable, Coroutine, Iterable, Literal
+
+import asyncpg
+
+from core.exceptions import ServiceUnavailableError
+from core.metrics import Histogram
 
 logger = logging.getLogger(__name__)
 
 EventHandler = Callable[..., Coroutine[Any, Any, None]]
+OverflowPolicy = Literal["block", "drop_oldest", "reject"]
 
 
-class EventBus:
-    """Simple in-process pub/sub.  Handlers run as fire-and-forget tasks."""
+class EventBusFull(ServiceUnavailableError):
+    detail = "Event queue is full"
+
+
+def _handler_name(handler: EventHandler) -> str:
+    return f"{handler.__module__}.{getattr(handler, '__qualname__', repr(handler))}"
+
+
+def compile_pattern(pattern: str) -> re.Pattern[str]:
+    """Regex for a topic pattern — ``*`` stands for one dot-separated segment."""
+    return re.compile(r"\.".join(
+        "[^.]+" if segment == "*" else re.escape(segment) for segment in pattern.split(".")
+    ))
+
+
+class _Subscription:
+    __slots__ = ("pattern", "regex", "handler", "batch", "max_size", "max_latency")
+
+    def __init__(
+        self, pattern: str, handler: EventHandler, batch: bool, max_size: int, max_latency: float
+    ) -> None:
+        self.pattern = pattern
+        self.regex = compile_pattern(pattern)
+        self.handler = handler
+        self.batch = batch
+        self.max_size = max(1, max_size)
+        self.max_latency = max_latency
+
+
+class _HandlerStats:
+    __slots__ = ("calls", "failures", "latency")
 
     def __init__(self) -> None:
-        self._handlers: dict[str, list[EventHandler]] = {}
+        self.calls = 0
+        self.failures = 0
+        self.latency = Histogram()
+
+
+class EventBus:
+    """In-process pub/sub over bounded queues and a fixed worker set."""
+
+    def __init__(
+        self,
+        workers: int = 4,
+        queue_size: int = 10_000,
+        overflow: OverflowPolicy = "block",
+    ) -> None:
+        if overflow not in ("block", "drop_oldest", "reject"):
+            raise ValueError(f"Unknown overflow policy: {overflow!r}")
+        self._subscriptions: list[_Subscription] = []
+        self._routes: dict[str, tuple[_Subscription, ...]] = {}
+        self.workers = max(1, workers)
+        self.queue_size = max(1, queue_size)
+        self.overflow = overflow
+        self._queue: asyncio.Queue | None = None
+        self._batches: dict[_Subscription, asyncio.Queue] = {}
+        self._tasks: list[asyncio.Task] = []
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self.bridge: PostgresBridge | None = None
+        # Counters
+        self._stats: dict[str, _HandlerStats] = {}
+        self.published = 0
+        self.dropped = 0
+        self.rejected = 0
+        self.max_queued = 0
 
     # ── Subscribe ─────────────────────────────────────────────────────
 
-    def subscribe(self, event_name: str, handler: EventHandler) -> None:
-        self._handlers.setdefault(event_name, []).append(handler)
+    def subscribe(
+        self,
+        pattern: str,
+        handler: EventHandler,
+        *,
+        batch: bool = False,
+        max_size: int = 100,
+        max_latency: float = 0.05,
+    ) -> None:
+        """Call *handler* for every event whose topic matches *pattern*.
+
+        With ``batch=True`` the handler receives ``list[(topic, payload)]``
+        instead of one payload per call.
+        """
+        subscription = _Subscription(pattern, handler, batch, max_size, max_latency)
+        self._subscriptions.append(subscription)
+        topics = {*self._routes} if "*" in pattern else {*self._routes, pattern}
+        self._routes = {topic: self._match(topic) for topic in topics}
+        if batch and self._queue is not None:
+            self._start_batch(subscription)
 
-    def on(self, event_name: str):
+    def on(self, pattern: str, **options: Any):
         """Decorator form of :meth:`subscribe`."""
         def decorator(fn: EventHandler) -> EventHandler:
-            self.subscribe(event_name, fn)
+            self.subscribe(pattern, fn, **options)
             return fn
         return decorator
 
+    def _match(self, topic: str) -> tuple[_Subscription, ...]:
+        return tuple(s for s in self._subscriptions if s.regex.fullmatch(topic))
+
+    def _route(self, topic: str) -> tuple[_Subscription, ...]:
+        subscriptions = self._routes.get(topic)
+        if subscriptions is None:
+            # First publish of a topic no pattern names literally
+            subscriptions = self._routes[topic] = self._match(topic)
+        return subscriptions
+
     # ── Publish ───────────────────────────────────────────────────────
 
-    async def publish(self, event_name: str, payload: dict | None = None) -> None:
-        for handler in self._handlers.get(event_name, []):
+    async def publish(
+        self, event_name: str, payload: dict | None = None, *, relay: bool = True
+    ) -> None:
+        """Queue *payload* for every matching handler.
+
+        With a bridge attached, matching topics are also relayed to the
+        other worker processes unless ``relay=False``.
+        """
+        payload = payload or {}
+        if relay and self.bridge is not None:
+            self.bridge.send(event_name, payload)
+        subscriptions = self._route(event_name)
+        if not subscriptions:
+            return
+        queue = self.start()
+        for s in subscriptions:
+            if s.batch:
+                await self._put(self._batches[s], (event_name, payload))
+            else:
+                await self._put(queue, (event_name, s.handler, payload))
+
+    async def _put(self, queue: asyncio.Queue, job: tuple) -> None:
+        if queue.full():
+            if self.overflow == "reject":
+                self.rejected += 1
+                raise EventBusFull()
+            if self.overflow == "drop_oldest":
+                dropped = queue.get_nowait()
+                queue.task_done()
+                self.dropped += 1
+                logger.warning("Event queue full; dropped %s", dropped[0])
+                queue.put_nowait(job)
+            else:
+                await queue.put(job)
+        else:
+            queue.put_nowait(job)
+        self.published += 1
+        if queue.qsize() > self.max_queued:
+            self.max_queued = queue.qsize()
+
+    # ── Workers ───────────────────────────────────────────────────────
+
+    def start(self) -> asyncio.Queue:
+        """Start the workers on the running loop (idempotent) and return the queue."""
+        loop = asyncio.get_running_loop()
+        if self._queue is None or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue(self.queue_size)
+            self._batches = {}
+            self._tasks = [
+                loop.create_task(self._work(self._queue), name=f"event-bus-{i}")
+                for i in range(self.workers)
+            ]
+            for subscription in self._subscriptions:
+                if subscription.batch:
+                    self._start_batch(subscription)
+        return self._queue
+
+    def _start_batch(self, subscription: _Subscription) -> None:
+        queue = self._batches[subscription] = asyncio.Queue(self.queue_size)
+        self._tasks.append(self._loop.create_task(
+            self._flush_batches(subscription, queue),
+            name=f"event-bus-batch:{subscription.pattern}",
+        ))
+
+    async def _work(self, queue: asyncio.Queue) -> None:
+        while True:
+            event_name, handler, payload = await queue.get()
+            try:
+                await self._run(event_name, handler, payload)
+            finally:
+                queue.task_done()
+
+    async def _flush_batches(self, subscription: _Subscription, queue: asyncio.Queue) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            events = [await queue.get()]
+            flush_at = loop.time() + subscription.max_latency
+            while len(events) < subscription.max_size:
+                if not queue.empty():
+                    events.append(queue.get_nowait())
+                    continue
+                remaining = flush_at - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    events.append(await asyncio.wait_for(queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await self._run(subscription.pattern, subscription.handler, events)
+            finally:
+                for _ in events:
+                    queue.task_done()
+
+    async def _run(self, event_name: str, handler: EventHandler, payload: Any) -> bool:
+        """Run one handler; log and count a failure.  True if it succeeded."""
+        name = _handler_name(handler)
+        stats = self._stats.get(name)
+        if stats is None:
+            stats = self._stats[name] = _HandlerStats()
+        started = time.perf_counter()
+        try:
+            await handler(payload)
+        except Exception:
+            stats.failures += 1
+            logger.exception("Event handler %s failed for %s", name, event_name)
+            return False
+        finally:
+            stats.calls += 1
+            stats.latency.observe(time.perf_counter() - started)
+        return True
+
+    async def deliver(self, events: Iterable[tuple[str, dict]]) -> list[tuple[str, dict]]:
+        """Run the handlers for ``(topic, payload)`` *events* now and wait for them.
+
+        Bypasses the queues — for callers that must know the handlers ran
+        before acknowledging the events (see ``core.outbox``).  Batch
+        subscriptions get the matching events in lists of at most
+        ``max_size``.  Failures are logged and counted as for queued
+        events, not raised; the events a handler failed on are returned
+        (the very tuples passed in, each once).  Bridged topics are relayed
+        as by :meth:`publish`.
+        """
+        calls = []
+        targets: list[list[tuple[str, dict]]] = []
+        batches: dict[_Subscription, list[tuple[str, dict]]] = {}
+        for event in events:
+            topic, payload = event
+            if self.bridge is not None:
+                self.bridge.send(topic, payload)
+            for s in self._route(topic):
+                if s.batch:
+                    batches.setdefault(s, []).append(event)
+                else:
+                    calls.append(self._run(topic, s.handler, payload))
+                    targets.append([event])
+        for s, matched in batches.items():
+            for i in range(0, len(matched), s.max_size):
+                chunk = matched[i:i + s.max_size]
+                calls.append(self._run(s.pattern, s.handler, chunk))
+                targets.append(chunk)
+        results = await asyncio.gather(*calls)
+        failed: dict[int, tuple[str, dict]] = {}
+        for ok, target in zip(results, targets):
+            if not ok:
+                for event in target:
+                    failed[id(event)] = event
+        return list(failed.values())
+
+    async def drain(self, timeout: float | None = None) -> None:
+        """Deliver queued events (for up to *timeout* seconds), then stop the workers."""
+        queue, tasks = self._queue, self._tasks
+        if queue is None:
+            return
+        queues = [queue, *self._batches.values()]
+        try:
+            await asyncio.wait_for(asyncio.gather(*(q.join() for q in queues)), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Event bus drain timed out; %d events not delivered", sum(q.qsize() for q in queues)
+            )
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._queue, self._batches, self._tasks, self._loop = None, {}, [], None
+
+    # ── Introspection ─────────────────────────────────────────────────
+
+    def stats(self) -> dict[str, Any]:
+        queues = [self._queue, *self._batches.values()] if self._queue is not None else []
+        stats = {
+            "workers": self.workers if self._queue is not None else 0,
+            "batch_subscriptions": sum(s.batch for s in self._subscriptions),
+            "queue_size": self.queue_size,
+            "queued": sum(q.qsize() for q in queues),
+            "max_queued": self.max_queued,
+            "overflow": self.overflow,
+            "published": self.published,
+            "dropped": self.dropped,
+            "rejected": self.rejected,
+            "handlers": {
+                name: {"calls": s.calls, "failures": s.failures, **s.latency.snapshot()}
+                for name, s in self._stats.items()
+            },
+        }
+        if self.bridge is not None:
+            stats["bridge"] = self.bridge.stats()
+        return stats
+
+
+# ---------------------------------------------------------------------------
+# Cross-process bridge
+# ---------------------------------------------------------------------------
+
+# Postgres rejects NOTIFY payloads of 8000 bytes or more
+NOTIFY_MAX_BYTES = 7_900
+
+# Backoff between attempts to reopen a lost bridge connection (seconds)
+_RECONNECT_MIN = 0.5
+_RECONNECT_MAX = 30.0
+
+
+class PostgresBridge:
+    """Relay selected topics between worker processes via ``LISTEN/NOTIFY``.
+
+    ``send`` only appends to a buffer, so local publish never waits on the
+    network.  A flusher task collects the buffer every ``flush_interval``
+    seconds.  It drops exact duplicates (repeated cache invalidations for
+    the same key), packs the rest into as few notifications as fit in
+    Postgres's payload limit, and sends them in one round trip on a
+    dedicated connection.  Each message carries the sender's origin id and
+    send time, so a worker ignores its own messages and receivers can
+    record delivery lag.  Received events go through
+    ``bus.publish(..., relay=False)``.
+
+    Delivery is best effort: messages sent while the connection is down
+    are lost, as are local events once ``max_pending`` are buffered.  A
+    lost connection (seen by asyncpg's termination listener or a failed
+    send) is reopened in the background with exponential backoff, so a
+    worker that only listens keeps receiving.  Malformed notifications on
+    the channel are counted as dropped.
+    """
+
+    def __init__(
+        self,
+        bus: EventBus,
+        topics: Iterable[str],
+        *,
+        channel: str = "event_bridge",
+        flush_interval: float = 0.01,
+        max_pending: int = 10_000,
+    ) -> None:
+        self._bus = bus
+        self._patterns = [compile_pattern(topic) for topic in topics]
+        self._relayed: dict[str, bool] = {}
+        self.channel = channel
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.origin = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._connect: Callable[[], Awaitable[Any]] | None = None
+        self._conn: Any = None
+        self._outgoing: deque[tuple[str, dict]] = deque()
+        self._pending = asyncio.Event()
+        self._inbox: asyncio.Queue | None = None
+        self._tasks: list[asyncio.Task] = []
+        self._reconnecting: asyncio.Task | None = None
+        # Counters
+        self.sent = 0
+        self.coalesced = 0
+        self.notifications = 0
+        self.received = 0
+        self.echoes = 0
+        self.dropped = 0
+        self.reconnects = 0
+        self.lag = Histogram()
+
+    def relays(self, topic: str) -> bool:
+        relayed = self._relayed.get(topic)
+        if relayed is None:
+            relayed = self._relayed[topic] = any(p.fullmatch(topic) for p in self._patterns)
+        return relayed
+
+    # ── Lifecycle ─────────────────────────────────────────────────────
+
+    async def start(self, connect: Callable[[], Awaitable[Any]]) -> None:
+        """Open the dedicated connection with *connect* and attach to the bus."""
+        self._connect = connect
+        await self._reconnect()
+        self._inbox = asyncio.Queue(self._bus.queue_size)
+        self._tasks = [
+            asyncio.create_task(self._flush_loop(), name="event-bridge-flush"),
+            asyncio.create_task(self._receive_loop(self._inbox), name="event-bridge-receive"),
+        ]
+        self._bus.bridge = self
+
+    async def stop(self) -> None:
+        """Send what is buffered, then detach and close the connection."""
+        self._bus.bridge = None
+        tasks = [*self._tasks, *([self._reconnecting] if self._reconnecting else [])]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks, self._reconnecting = [], None
+        await self.flush()
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            await conn.close()
+
+    async def _reconnect(self) -> None:
+        conn = await self._connect()
+        try:
+            await conn.add_listener(self.channel, self._notified)
+        except BaseException:
+            conn.terminate()
+            raise
+        conn.add_termination_listener(self._connection_lost)
+        self._conn = conn
+
+    def _connection_lost(self, conn: Any) -> None:
+        """Forget *conn* if it is the current connection and start reconnecting."""
+        if conn is not self._conn:
+            return  # closed by stop() or already replaced
+        self._conn = None
+        if self._connect is not None and (self._reconnecting is None or self._reconnecting.done()):
+            logger.warning("Event bridge connection lost; reconnecting")
+            self._reconnecting = asyncio.ensure_future(self._reconnect_loop())
+
+    async def _reconnect_loop(self) -> None:
+        delay = _RECONNECT_MIN
+        while self._conn is None:
+            try:
+                await self._reconnect()
+            except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError) as exc:
+                logger.warning("Event bridge reconnect failed; retrying in %.1f s: %s", delay, exc)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, _RECONNECT_MAX)
+        self.reconnects += 1
+        logger.info("Event bridge reconnected")
+
+    # ── Outgoing ──────────────────────────────────────────────────────
+
+    def send(self, topic: str, payload: dict) -> None:
+        """Buffer *topic* for the other workers if it is bridged; never blocks."""
+        if not self.relays(topic):
+            return
+        if len(self._outgoing) >= self.max_pending:
+            self._outgoing.popleft()
+            self.dropped += 1
+        self._outgoing.append((topic, payload))
+        self._pending.set()
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await self._pending.wait()
+            await asyncio.sleep(self.flush_interval)  # let the burst collect
+            self._pending.clear()
+            await self.flush()
+
+    def _pack(self) -> list[str]:
+        events, self._outgoing = self._outgoing, deque()
+        encoded = list(dict.fromkeys(json.dumps(event, separators=(",", ":")) for event in events))
+        self.coalesced += len(events) - len(encoded)
+        head = f'{{"o":"{self.origin}","t":{time.time():.6f},"e":['
+        budget = NOTIFY_MAX_BYTES - len(head) - 2
+        messages: list[str] = []
+        chunk: list[str] = []
+        size = 0
+        for event in encoded:
+            length = len(event.encode()) + 1
+            if length > budget:
+                self.dropped += 1
+                logger.warning("Event too large to bridge: %s", event[:80])
+                continue
+            if size + length > budget:
+                messages.append(head + ",".join(chunk) + "]}")
+                chunk, size = [], 0
+            chunk.append(event)
+            size += length
+        if chunk:
+            messages.append(head + ",".join(chunk) + "]}")
+        self.sent += len(encoded)
+        return messages
+
+    async def flush(self) -> None:
+        """Send everything buffered in one round trip."""
+        if not self._outgoing:
+            return
+        messages = self._pack()
+        conn = self._conn
+        if conn is None:
+            self.dropped += len(messages)
+            logger.warning("Event bridge not connected; %d messages lost", len(messages))
+            return
+        try:
+            await conn.execute(
+                "SELECT pg_notify($1, m) FROM unnest($2::text[]) AS m", self.channel, messages
+            )
+            self.notifications += len(messages)
+        except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError) as exc:
+            self.dropped += len(messages)
+            logger.warning("Event bridge send failed; %d messages lost: %s", len(messages), exc)
+            self._connection_lost(conn)
+            conn.terminate()
+
+    # ── Incoming ──────────────────────────────────────────────────────
+
+    def _notified(self, _conn: Any, _pid: int, _channel: str, message: str) -> None:
+        # Runs inside asyncpg's callback: anything on the channel must not raise.
+        try:
+            data = json.loads(message)
+            origin, sent_at, events = data["o"], float(data["t"]), list(data["e"])
+        except (ValueError, TypeError, KeyError):
+            self.dropped += 1
+            logger.warning("Malformed event bridge message dropped: %.80s", message)
+            return
+        if origin == self.origin:
+            self.echoes += 1
+            return
+        self.lag.observe(max(0.0, time.time() - sent_at))
+        for event in events:
+            if not (isinstance(event, list) and len(event) == 2 and isinstance(event[0], str)):
+                self.dropped += 1
+                continue
+            try:
+                self._inbox.put_nowait((event[0], event[1]))
+                self.received += 1
+            except asyncio.QueueFull:
+                self.dropped += 1
+
+    async def _receive_loop(self, inbox: asyncio.Queue) -> None:
+        while True:
+            topic, payload = await inbox.get()
             try:
-                asyncio.create_task(handler(payload or {}))
-            except Exception:
-                logger.exception("Event handler %s failed for %s", handler, event_name)
+                await self._bus.publish(topic, payload, relay=False)
+            except EventBusFull:
+                self.dropped += 1
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "origin": self.origin,
+            "sent": self.sent,
+            "coalesced": self.coalesced,
+            "notifications": self.notifications,
+            "received": self.received,
+            "echoes": self.echoes,
+            "dropped": self.dropped,
+            "reconnects": self.reconnects,
+            "connected": self._conn is not None,
+            "pending": len(self._outgoing),
+            "lag": self.lag.snapshot(),
+        }
+
+
+def _from_settings() -> EventBus:
+    from config import settings
+
+    return EventBus(
+        workers=settings.event_bus_workers,
+        queue_size=settings.event_bus_queue_size,
+        overflow=settings.event_bus_overflow,
+    )
 
 
 # Singleton — import this everywhere
-event_bus = EventBus()
+event_bus = _from_settings()
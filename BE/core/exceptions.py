@@ -5,12 +5,15 @@ The global error handler in ``core.middleware.error_handler`` catches
 ``DomainException`` and returns a consistent JSON envelope.
 """
 
+import math
+
 
 class DomainException(Exception):
     """Base for all domain-level errors."""
 
     status_code: int = 400
     detail: str = "Domain error"
+    headers: dict[str, str] | None = None
 
     def __init__(self, detail: str | None = None, status_code: int | None = None):
         if detail is not None:
@@ -38,3 +41,22 @@ class UnauthorizedError(DomainException):
 class ValidationError(DomainException):
     status_code = 422
     detail = "Validation error"
+
+
+class ServiceUnavailableError(DomainException):
+    status_code = 503
+    detail = "Service temporarily unavailable"
+
+
+class GatewayTimeoutError(DomainException):
+    status_code = 504
+    detail = "Upstream timed out"
+
+
+class TooManyRequestsError(DomainException):
+    status_code = 429
+    detail = "Too many requests"
+
+    def __init__(self, retry_after: float, detail: str | None = None):
+        super().__init__(detail)
+        self.headers = {"Retry-After": str(max(1, math.ceil(retry_after)))}
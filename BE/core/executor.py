@@ -0,0 +1,160 @@
+"""Bounded worker pool for CPU-bound work that must not run on the event loop.
+
+Wraps a :class:`ThreadPoolExecutor` or :class:`ProcessPoolExecutor` with an
+admission limit: at most ``workers + queue_size`` calls may be pending at
+once.  Anything beyond that is rejected immediately with
+:class:`ExecutorSaturated` instead of queueing without bound.  A call
+counts as pending until the job itself finishes, not until its caller
+stops waiting: a request cancelled by its deadline or a disconnect leaves
+a running job behind, and that job still holds its place.
+
+Usage::
+
+    from core.executor import BoundedExecutor
+
+    pool = BoundedExecutor("hash", kind="thread", workers=4, queue_size=64)
+    digest = await pool.run(expensive_fn, arg1, arg2)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Literal, TypeVar
+
+from core.exceptions import ServiceUnavailableError
+from core.metrics import Histogram
+
+T = TypeVar("T")
+
+ExecutorKind = Literal["thread", "process"]
+
+
+class ExecutorSaturated(ServiceUnavailableError):
+    detail = "Server is busy, please retry shortly"
+
+
+def _timed_call(fn: Callable[..., T], args: tuple) -> tuple[T, float]:
+    """Run *fn* in the worker and report how long it took there.
+
+    Module-level so it pickles for process pools.
+    """
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+
+def _call_soon(loop: asyncio.AbstractEventLoop, callback: Callable[[], None]) -> None:
+    """Schedule *callback* on *loop* from any thread; no-op once it is closed."""
+    try:
+        loop.call_soon_threadsafe(callback)
+    except RuntimeError:
+        pass
+
+
+class BoundedExecutor:
+    """Worker pool with a bounded queue, rejection and latency counters."""
+
+    def __init__(
+        self,
+        name: str,
+        kind: ExecutorKind = "thread",
+        workers: int = 4,
+        queue_size: int = 64,
+    ) -> None:
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown executor kind: {kind!r}")
+        self.name = name
+        self.kind = kind
+        self.workers = max(1, workers)
+        self.queue_size = max(0, queue_size)
+        self._executor: Executor | None = None
+
+        # ── Counters ──────────────────────────────────────────────────
+        self._pending = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.wait_seconds = Histogram()
+        self.run_seconds = Histogram()
+
+    # ── Lifecycle ─────────────────────────────────────────────────────
+
+    def start(self) -> None:
+        """Create the underlying executor (idempotent)."""
+        if self._executor is not None:
+            return
+        if self.kind == "process":
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        else:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix=self.name
+            )
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the workers.  Pending calls that have not started are cancelled."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+    # ── Submission ────────────────────────────────────────────────────
+
+    @property
+    def capacity(self) -> int:
+        return self.workers + self.queue_size
+
+    @property
+    def queue_depth(self) -> int:
+        """Calls waiting for a free worker (excludes those running)."""
+        return max(0, self._pending - self.workers)
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run ``fn(*args)`` on the pool and await its result.
+
+        Raises :class:`ExecutorSaturated` if the queue is full.
+        """
+        if self._pending >= self.capacity:
+            self.rejected += 1
+            raise ExecutorSaturated()
+
+        self.start()
+        loop = asyncio.get_running_loop()
+        job = self._executor.submit(_timed_call, fn, args)
+        self._pending += 1
+        self.submitted += 1
+        submitted_at = time.perf_counter()
+        # Released when the job is done (or cancelled before it started),
+        # even if the awaiting task has been cancelled long before.
+        job.add_done_callback(lambda _job: _call_soon(loop, self._job_done))
+        try:
+            result, ran_for = await asyncio.wrap_future(job)
+        except BaseException:
+            self.failed += 1
+            raise
+
+        self.completed += 1
+        self.run_seconds.observe(ran_for)
+        self.wait_seconds.observe(max(0.0, time.perf_counter() - submitted_at - ran_for))
+        return result
+
+    def _job_done(self) -> None:
+        self._pending -= 1
+
+    # ── Introspection ─────────────────────────────────────────────────
+
+    def stats(self) -> dict:
+        return {
+            "kind": self.kind,
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "pending": self._pending,
+            "queue_depth": self.queue_depth,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "wait_seconds": self.wait_seconds.snapshot(),
+            "run_seconds": self.run_seconds.snapshot(),
+        }
@@ -0,0 +1,132 @@
+"""JWT signing key ring — several keys addressed by ``kid``.
+
+Every key is parsed exactly once into a ready-to-use key object: HMAC
+secrets become bytes, PEM keys become ``cryptography`` key objects, and
+each key gets a cached :class:`jwt.PyJWK` verifier so decoding never
+re-parses key material.
+
+Tokens are signed with the *active* key and carry its ``kid`` in the
+header.  Verification picks the key by ``kid``; tokens without one (issued
+before the ring existed) fall back to the default key built from
+``settings.jwt_secret``.  Retiring a key is just removing it from the ring.
+
+Asymmetric keys (``EdDSA``, ``ES256``, …) need the optional
+``cryptography`` package.  Their public halves are published by
+:meth:`KeyRing.jwks` so other services can verify tokens locally.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable
+
+import jwt
+from jwt.utils import base64url_encode
+
+DEFAULT_KID = "default"
+
+
+@dataclass(frozen=True)
+class JwtKey:
+    """A parsed key.  ``signing_key`` is ``None`` for verify-only keys."""
+
+    kid: str
+    algorithm: str
+    signing_key: Any | None
+    verifier: jwt.PyJWK
+    public_jwk: dict[str, Any] | None = None
+
+
+def _algorithm(name: str) -> jwt.algorithms.Algorithm:
+    try:
+        return jwt.get_algorithm_by_name(name)
+    except NotImplementedError as exc:
+        raise RuntimeError(
+            f"JWT algorithm {name!r} is unavailable — asymmetric keys require "
+            "the optional 'cryptography' package"
+        ) from exc
+
+
+def _pem(spec: dict[str, str], name: str) -> str | None:
+    if spec.get(name):
+        return spec[name]
+    if spec.get(f"{name}_file"):
+        return Path(spec[f"{name}_file"]).read_text()
+    return None
+
+
+def load_key(spec: dict[str, str]) -> JwtKey:
+    """Parse a key spec.
+
+    ``{"kid", "alg", "secret"}`` for HMAC, or ``{"kid", "alg", "private_key"
+    | "private_key_file", "public_key" | "public_key_file"}`` for asymmetric
+    algorithms (PEM).  A public key alone gives a verify-only key.
+    """
+    kid = spec["kid"]
+    algorithm = spec.get("alg", "HS256")
+
+    if algorithm.startswith("HS"):
+        secret = spec["secret"].encode()
+        verifier = jwt.PyJWK({"kty": "oct", "k": base64url_encode(secret).decode()}, algorithm)
+        return JwtKey(kid, algorithm, secret, verifier)
+
+    alg = _algorithm(algorithm)
+    private_pem = _pem(spec, "private_key")
+    public_pem = _pem(spec, "public_key")
+    if private_pem is None and public_pem is None:
+        raise ValueError(f"JWT key {kid!r} has neither a private nor a public key")
+
+    private = alg.prepare_key(private_pem) if private_pem else None
+    public = private.public_key() if private is not None else alg.prepare_key(public_pem)
+    jwk = alg.to_jwk(public, as_dict=True)
+    jwk.update({"kid": kid, "alg": algorithm, "use": "sig"})
+    return JwtKey(kid, algorithm, private, jwt.PyJWK(jwk, algorithm), jwk)
+
+
+class KeyRing:
+    """Signing / verification keys indexed by ``kid``."""
+
+    def __init__(self, keys: Iterable[JwtKey], active_kid: str) -> None:
+        self._keys = {key.kid: key for key in keys}
+        if active_kid not in self._keys:
+            raise ValueError(f"Active JWT kid {active_kid!r} is not in the key ring")
+        if self._keys[active_kid].signing_key is None:
+            raise ValueError(f"Active JWT kid {active_kid!r} has no private key")
+        self.active = self._keys[active_kid]
+
+    @classmethod
+    def from_settings(cls, settings) -> KeyRing:
+        """The default key from ``jwt_secret`` plus every ``jwt_keys`` entry."""
+        keys = [load_key({
+            "kid": DEFAULT_KID,
+            "alg": settings.jwt_algorithm,
+            "secret": settings.jwt_secret,
+        })]
+        keys.extend(load_key(spec) for spec in settings.jwt_keys)
+        return cls(keys, settings.jwt_active_kid or DEFAULT_KID)
+
+    def __contains__(self, kid: str) -> bool:
+        return kid in self._keys
+
+    def get(self, kid: str | None) -> JwtKey:
+        """Return the key for *kid* (``None`` → default key).
+
+        Raises :class:`jwt.InvalidKeyError` for unknown or retired kids.
+        """
+        key = self._keys.get(kid or DEFAULT_KID)
+        if key is None:
+            raise jwt.InvalidKeyError(f"Unknown signing key: {kid!r}")
+        return key
+
+    def decode(self, token: str) -> dict[str, Any]:
+        """Verify *token* with the key named in its header and return the claims.
+
+        Raises ``jwt.PyJWTError`` if verification fails.
+        """
+        key = self.get(jwt.get_unverified_header(token).get("kid"))
+        return jwt.decode(token, key.verifier, algorithms=[key.algorithm])
+
+    def jwks(self) -> dict[str, list[dict[str, Any]]]:
+        """Public JWK set — asymmetric keys only, never HMAC secrets."""
+        return {"keys": [k.public_jwk for k in self._keys.values() if k.public_jwk]}
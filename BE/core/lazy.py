@@ -0,0 +1,85 @@
+"""Routers imported on first use instead of at app creation.
+
+``include_lazy_router(app, "/api/orders", "modules.orders.router:router")``
+adds a placeholder route.  The first request under the prefix imports the
+module, inserts its routes right after the placeholder (so they match on
+that same request) and the placeholder goes inert.  Until then the
+module, its schemas and its service layer cost nothing at startup.
+
+Routes registered before the placeholder keep precedence, so put
+infrastructure routes such as ``/api/health`` first.
+"""
+
+from __future__ import annotations
+
+import importlib
+import logging
+import time
+
+from fastapi import APIRouter, FastAPI
+from starlette.routing import BaseRoute, Match
+from starlette.types import Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+
+def import_router(target: str) -> APIRouter:
+    """Import ``module:attribute`` (attribute defaults to ``router``)."""
+    module, _, attr = target.partition(":")
+    return getattr(importlib.import_module(module), attr or "router")
+
+
+class LazyRouter(BaseRoute):
+    """Placeholder route that imports and mounts a router on first match."""
+
+    def __init__(self, app: FastAPI, prefix: str, target: str) -> None:
+        self.app = app
+        self.prefix = prefix
+        self.target = target
+        self.loaded = False
+
+    def load(self) -> None:
+        """Import the router and splice its routes in after this placeholder."""
+        if self.loaded:
+            return
+        started = time.perf_counter()
+        routes = self.app.router.routes
+        before = len(routes)
+        self.app.include_router(import_router(self.target))
+        added = routes[before:]
+        del routes[before:]
+        position = routes.index(self) + 1
+        routes[position:position] = added
+        self.loaded = True
+        logger.info(
+            "Loaded %s (%d routes) in %.1f ms",
+            self.target, len(added), (time.perf_counter() - started) * 1000,
+        )
+
+    def matches(self, scope: Scope) -> tuple[Match, Scope]:
+        if (
+            not self.loaded
+            and scope["type"] in ("http", "websocket")
+            and scope["path"].startswith(self.prefix)
+        ):
+            # The router iterates this list by index, so the spliced-in routes
+            # are matched next, for this very request.
+            self.load()
+        return Match.NONE, {}
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+        raise RuntimeError("LazyRouter never matches")  # pragma: no cover
+
+
+def include_lazy_router(app: FastAPI, prefix: str, target: str) -> LazyRouter:
+    """Register ``module:attribute`` to be imported on the first request under *prefix*."""
+    placeholder = LazyRouter(app, prefix, target)
+    app.router.routes.append(placeholder)
+    return placeholder
+
+
+def load_lazy_routers(app: FastAPI) -> None:
+    """Import every pending lazy router (e.g. before generating OpenAPI)."""
+    for route in list(app.router.routes):
+        if isinstance(route, LazyRouter):
+            route.load()
@@ -0,0 +1,92 @@
+"""Lightweight in-process metrics primitives.
+
+No external dependencies — counters and histograms are plain objects that
+components own and expose through a ``snapshot()`` dict.
+"""
+
+from __future__ import annotations
+
+import bisect
+from typing import Iterable, Mapping, Sequence
+
+# Default latency buckets in seconds (upper bounds, inclusive).
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+class Histogram:
+    """Fixed-bucket histogram of observed values (typically seconds)."""
+
+    __slots__ = ("buckets", "counts", "count", "sum", "max")
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        # One extra slot for observations above the last bucket (+Inf).
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """Approximate the *q* quantile as the upper bound of its bucket."""
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(self.buckets, self.counts):
+            seen += n
+            if seen >= rank:
+                return bound
+        return self.max
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "max": self.max,
+            "p50": self.quantile(0.50),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
+
+
+# ---------------------------------------------------------------------------
+# Prometheus text exposition
+# ---------------------------------------------------------------------------
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: Mapping[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels.items()) + "}"
+
+
+def prometheus_header(name: str, kind: str, help_text: str) -> list[str]:
+    return [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+
+
+def prometheus_sample(name: str, labels: Mapping[str, str], value: float) -> str:
+    return f"{name}{_labels(labels)} {value}"
+
+
+def prometheus_histogram(name: str, labels: Mapping[str, str], hist: Histogram) -> Iterable[str]:
+    """Sample lines for one labelled :class:`Histogram` (cumulative buckets)."""
+    cumulative = 0
+    for bound, n in zip(hist.buckets, hist.counts):
+        cumulative += n
+        yield prometheus_sample(f"{name}_bucket", {**labels, "le": repr(bound)}, cumulative)
+    yield prometheus_sample(f"{name}_bucket", {**labels, "le": "+Inf"}, hist.count)
+    yield prometheus_sample(f"{name}_sum", labels, hist.sum)
+    yield prometheus_sample(f"{name}_count", labels, hist.count)
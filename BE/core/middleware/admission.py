@@ -0,0 +1,51 @@
+"""Admission control and load shedding.
+
+Pure ASGI middleware.  Each HTTP request waits for a slot from
+:class:`core.admission.AdmissionController` before it reaches the app and
+gives it back once the response is complete.  A request that is shed gets
+``503 {"error": "Server is overloaded, please retry shortly"}`` with a
+``Retry-After`` header straight away, without touching the app or the
+database pool.  The queue wait is recorded as the ``queue`` phase of
+``Server-Timing``.  Only installed when ``ADMISSION_CONTROL`` is on.
+"""
+
+from __future__ import annotations
+
+import time
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from core.admission import AdmissionController, Overloaded
+from core.responses import FastJSONResponse
+from core.timing import record
+
+
+class AdmissionMiddleware:
+    def __init__(self, app: ASGIApp, controller: AdmissionController) -> None:
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        started = time.perf_counter()
+        try:
+            await self.controller.admit(path)
+        except Overloaded as exc:
+            response = FastJSONResponse(
+                status_code=exc.status_code,
+                content={"error": exc.detail},
+                headers=exc.headers,
+            )
+            await response(scope, receive, send)
+            return
+
+        admitted = time.perf_counter()
+        record("queue", admitted - started)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(path, time.perf_counter() - admitted)
@@ -0,0 +1,115 @@
+"""Request deadlines and cancellation on client disconnect.
+
+Pure ASGI middleware.  For each HTTP request it:
+
+- starts a deadline (:mod:`core.deadline`) — ``REQUEST_TIMEOUTS[path]``
+  if configured, else ``REQUEST_TIMEOUT_SECONDS``; ``0`` means none;
+- answers ``504 {"error": "Request deadline exceeded"}`` if the handler is
+  still running when it passes and nothing has been sent yet;
+- cancels the handler when the client disconnects before the response is
+  complete, which also cancels any in-flight query on the server.
+
+To notice a disconnect while the handler is busy it reads the client side
+itself, but keeps the server's flow control: at most one request body
+chunk is held for the app, and the next one is only read once the app has
+taken it.  Once the last chunk has been handed over, the only thing left
+to receive is the disconnect.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.deadline import DeadlineExceeded, deadline_scope
+from core.responses import FastJSONResponse
+
+logger = logging.getLogger(__name__)
+
+
+class DeadlineMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        default: float,
+        routes: dict[str, float] | None = None,
+    ) -> None:
+        self.app = app
+        self.default = default
+        self.routes = routes or {}
+        # Counters
+        self.timeouts = 0
+        self.disconnects = 0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        seconds = self.routes.get(scope["path"], self.default)
+        inbox: asyncio.Queue[Message] = asyncio.Queue(maxsize=1)  # body chunks
+        gone = asyncio.Event()
+        started = complete = client_gone = body_read = False
+
+        async def receive_buffered() -> Message:
+            nonlocal body_read
+            if body_read or (gone.is_set() and inbox.empty()):
+                await gone.wait()
+                return {"type": "http.disconnect"}
+            message = await inbox.get()
+            if not message.get("more_body"):
+                body_read = True
+            return message
+
+        async def send_tracked(message: Message) -> None:
+            nonlocal started, complete
+            if message["type"] == "http.response.start":
+                started = True
+            elif message["type"] == "http.response.body" and not message.get("more_body"):
+                complete = True
+            await send(message)
+
+        async def handle() -> None:
+            with deadline_scope(seconds):
+                try:
+                    async with asyncio.timeout(seconds or None):
+                        await self.app(scope, receive_buffered, send_tracked)
+                except TimeoutError:
+                    if started:
+                        raise
+                    self.timeouts += 1
+                    response = FastJSONResponse(
+                        status_code=DeadlineExceeded.status_code,
+                        content={"error": DeadlineExceeded.detail},
+                    )
+                    await response(scope, receive_buffered, send)
+
+        handler = asyncio.ensure_future(handle())
+
+        async def pump() -> None:
+            # Read the client side ourselves so a disconnect is seen even
+            # while the handler is busy and not reading.
+            nonlocal client_gone
+            while True:
+                message = await receive()
+                if message["type"] == "http.disconnect":
+                    gone.set()
+                    if not complete:
+                        client_gone = True
+                        handler.cancel()
+                    return
+                await inbox.put(message)  # waits until the app takes the last chunk
+
+        pumper = asyncio.ensure_future(pump())
+        try:
+            await asyncio.wait({handler})
+        finally:
+            pumper.cancel()
+            handler.cancel()
+        if handler.cancelled() and client_gone:
+            self.disconnects += 1
+            logger.debug("Client left during %s %s; handler cancelled", scope["method"], scope["path"])
+            return
+        handler.result()
@@ -6,9 +6,9 @@ consistent JSON envelope: ``{"error": "..."}``
 
 from fastapi import FastAPI, HTTPException
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
 
 from core.exceptions import DomainException
+from core.responses import FastJSONResponse
 
 
 def register_error_handlers(app: FastAPI) -> None:
@@ -16,21 +16,22 @@ def register_error_handlers(app: FastAPI) -> None:
 
     @app.exception_handler(DomainException)
     async def _domain_exc(_request, exc: DomainException):
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=exc.status_code,
             content={"error": exc.detail},
+            headers=exc.headers,
         )
 
     @app.exception_handler(HTTPException)
     async def _http_exc(_request, exc: HTTPException):
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=exc.status_code,
             content={"error": exc.detail},
         )
 
     @app.exception_handler(RequestValidationError)
     async def _validation_exc(_request, exc: RequestValidationError):
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=422,
             content={"error": str(exc)},
         )
@@ -0,0 +1,86 @@
+"""OpenAPI schema generated at build time and served from a file.
+
+FastAPI builds the schema on the first ``/openapi.json`` or ``/docs``
+request by walking every route and pydantic model — slow, and on a fresh
+pod it lands on a user.  Generate it once when the image is built::
+
+    python -m core.openapi                # writes settings.openapi_cache_path
+    python -m core.openapi --check        # exit 1 if the file is stale
+
+and :func:`use_cached_openapi` serves that file instead.  The cache is
+opt-in (``OPENAPI_CACHE_PATH``, set in the Docker image, where the file is
+built from the same code it ships with): a file left over from an earlier
+local run would otherwise hide later route and schema changes.  Without the
+setting, or without the file, the schema is built on demand, as before.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from pathlib import Path
+from typing import Any
+
+from fastapi import FastAPI
+from fastapi.openapi.utils import get_openapi
+
+from core.lazy import load_lazy_routers
+
+logger = logging.getLogger(__name__)
+
+
+def build_openapi(app: FastAPI) -> dict[str, Any]:
+    """Generate the schema for *app*, importing any lazy routers first."""
+    load_lazy_routers(app)
+    return get_openapi(
+        title=app.title,
+        version=app.version,
+        openapi_version=app.openapi_version,
+        description=app.description,
+        routes=app.routes,
+    )
+
+
+def use_cached_openapi(app: FastAPI, path: str | Path) -> None:
+    """Serve the schema from *path* when present, else build it on first use."""
+    path = Path(path)
+
+    def openapi() -> dict[str, Any]:
+        if app.openapi_schema is None:
+            try:
+                app.openapi_schema = json.loads(path.read_bytes())
+            except FileNotFoundError:
+                logger.info("No cached OpenAPI schema at %s; generating", path)
+                app.openapi_schema = build_openapi(app)
+        return app.openapi_schema
+
+    app.openapi = openapi
+
+
+def main() -> None:
+    """CLI entry point."""
+    import argparse
+    import sys
+
+    from config import settings
+    from main import create_app
+
+    parser = argparse.ArgumentParser(description="Pre-generate the OpenAPI schema")
+    parser.add_argument("--output", "-o", default=settings.openapi_cache_path or "openapi.json")
+    parser.add_argument("--check", action="store_true", help="Fail if the file is missing or stale")
+    args = parser.parse_args()
+
+    text = json.dumps(build_openapi(create_app()), separators=(",", ":"), sort_keys=True)
+    output = Path(args.output)
+    if args.check:
+        if not output.exists() or output.read_text() != text:
+            print(f"{output} is stale — run: python -m core.openapi", file=sys.stderr)
+            sys.exit(1)
+        print(f"{output} is up to date")
+        return
+    output.write_text(text)
+    print(f"Wrote {output} ({len(text)} bytes)")
+
+
+if __name__ == "__main__":
+    main()
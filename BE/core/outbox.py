@@ -0,0 +1,207 @@
+"""Transactional outbox — domain events that survive a crash.
+
+A domain write inserts its event into ``event_outbox`` in the same
+statement (or transaction) as the change itself, so the two commit or roll
+back together.  A statement-level trigger then sends ``NOTIFY
+event_outbox``.
+
+:class:`OutboxDispatcher` ``LISTEN``\\ s on a dedicated connection.  On each
+notification (and every ``poll_interval`` seconds as a safety net) it
+claims up to ``batch_size`` due rows in one statement::
+
+    SELECT id, topic, payload, attempts FROM event_outbox
+    WHERE next_attempt_at <= now()
+    ORDER BY id LIMIT $1 FOR UPDATE SKIP LOCKED
+
+It runs the :mod:`core.events` handlers for the whole batch, deletes the
+rows whose handlers all succeeded and only then commits.  A row a handler
+failed on is retried after ``retry_base * 2 ** attempts`` seconds (at
+most ``retry_max``); after ``max_attempts`` it moves to
+``event_outbox_dead`` for a human to look at.  Failing rows therefore
+never hold up newer events.  A crash before the commit releases the whole
+batch to be claimed again, so delivery is at least once — handlers must
+be idempotent, and a retried event may reach handlers that already
+succeeded on it.
+``SKIP LOCKED`` lets every worker process run a dispatcher without two of
+them claiming the same row.  Events in a batch are delivered concurrently
+(batch subscribers get them as one list), so handlers must not rely on
+their order.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from typing import Any
+
+import asyncpg
+
+from core.database import RoutingPool, connect, statements
+from core.events import EventBus, event_bus
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "event_outbox"
+
+CLAIM_EVENTS = statements.register(
+    "outbox.claim_events",
+    "SELECT id, topic, payload, attempts FROM event_outbox WHERE next_attempt_at <= now() "
+    "ORDER BY id LIMIT $1 FOR UPDATE SKIP LOCKED",
+)
+
+DELETE_EVENTS = statements.register(
+    "outbox.delete_events",
+    "DELETE FROM event_outbox WHERE id = ANY($1::bigint[])",
+)
+
+RETRY_EVENTS = statements.register(
+    "outbox.retry_events",
+    "UPDATE event_outbox SET attempts = attempts + 1, "
+    "next_attempt_at = now() + LEAST($2::float8 * 2 ^ attempts, $3::float8) * interval '1 second' "
+    "WHERE id = ANY($1::bigint[])",
+)
+
+BURY_EVENTS = statements.register(
+    "outbox.bury_events",
+    "WITH dead AS ("
+    "DELETE FROM event_outbox WHERE id = ANY($1::bigint[]) "
+    "RETURNING id, topic, payload, attempts, created_at"
+    ") INSERT INTO event_outbox_dead (id, topic, payload, attempts, created_at) "
+    "SELECT id, topic, payload, attempts + 1, created_at FROM dead",
+)
+
+
+def _decode(payload: Any) -> dict:
+    # asyncpg returns ``jsonb`` as text unless a codec is registered
+    return json.loads(payload) if isinstance(payload, str) else payload
+
+
+class OutboxDispatcher:
+    """Deliver ``event_outbox`` rows to an :class:`EventBus` in batches."""
+
+    def __init__(
+        self,
+        bus: EventBus,
+        *,
+        batch_size: int = 500,
+        poll_interval: float = 5.0,
+        max_attempts: int = 10,
+        retry_base: float = 1.0,
+        retry_max: float = 300.0,
+    ) -> None:
+        self._bus = bus
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self._pool: RoutingPool | None = None
+        self._listener: asyncpg.Connection | None = None
+        self._task: asyncio.Task | None = None
+        self._wake = asyncio.Event()
+        # Counters
+        self.batches = 0
+        self.delivered = 0
+        self.failed = 0  # deliveries left in the table for a retry
+        self.dead = 0  # moved to event_outbox_dead after max_attempts
+        self.notifications = 0
+
+    # ── Lifecycle ─────────────────────────────────────────────────────
+
+    async def start(self, pool: RoutingPool) -> None:
+        """Listen for new events and dispatch until :meth:`stop`."""
+        self._pool = pool
+        self._listener = await connect()
+        await self._listener.add_listener(CHANNEL, self._notified)
+        self._task = asyncio.create_task(self._loop(), name="outbox-dispatcher")
+
+    async def stop(self) -> None:
+        """Stop dispatching.  Unclaimed events stay in the table."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._listener is not None:
+            await self._listener.close()
+            self._listener = None
+
+    def _notified(self, *_args: Any) -> None:
+        self.notifications += 1
+        self._wake.set()
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                claimed = await self.dispatch()
+            except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError):
+                logger.exception("Outbox dispatch failed; retrying in %.0f s", self.poll_interval)
+                claimed = 0
+            if claimed < self.batch_size:
+                # Nothing more is due — sleep until the next NOTIFY (or
+                # poll, which also picks up retries as they come due).
+                try:
+                    await asyncio.wait_for(self._wake.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.clear()
+
+    # ── Dispatch ──────────────────────────────────────────────────────
+
+    async def dispatch(self) -> int:
+        """Claim and deliver one batch; return the number of events claimed."""
+        async with self._pool.acquire() as conn, conn.transaction():
+            rows = await conn.fetch(CLAIM_EVENTS, self.batch_size)
+            events = [(row["topic"], _decode(row["payload"])) for row in rows]
+            failed = {id(event) for event in await self._bus.deliver(events)}
+            done, retry, bury = [], [], []
+            for row, event in zip(rows, events):
+                if id(event) not in failed:
+                    done.append(row["id"])
+                elif row["attempts"] + 1 >= self.max_attempts:
+                    bury.append(row["id"])
+                else:
+                    retry.append(row["id"])
+            if done:
+                await conn.execute(DELETE_EVENTS, done)
+            if retry:
+                await conn.execute(RETRY_EVENTS, retry, self.retry_base, self.retry_max)
+            if bury:
+                await conn.execute(BURY_EVENTS, bury)
+                logger.error(
+                    "Outbox events %s failed %d times; moved to event_outbox_dead",
+                    bury, self.max_attempts,
+                )
+        if rows:
+            self.batches += 1
+            self.delivered += len(done)
+            self.failed += len(retry)
+            self.dead += len(bury)
+        return len(rows)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "running": self._task is not None,
+            "batches": self.batches,
+            "delivered": self.delivered,
+            "failed": self.failed,
+            "dead": self.dead,
+            "notifications": self.notifications,
+        }
+
+
+def _from_settings() -> OutboxDispatcher:
+    from config import settings
+
+    return OutboxDispatcher(
+        event_bus,
+        batch_size=settings.event_outbox_batch_size,
+        poll_interval=settings.event_outbox_poll_seconds,
+        max_attempts=settings.event_outbox_max_attempts,
+        retry_base=settings.event_outbox_retry_seconds,
+        retry_max=settings.event_outbox_retry_max_seconds,
+    )
+
+
+# Singleton — started by the app lifespan when EVENT_OUTBOX is on
+outbox_dispatcher = _from_settings()
@@ -0,0 +1,208 @@
+"""Versioned password hashing schemes.
+
+Stored formats::
+
+    $scrypt$n=16384,r=8,p=1$<salt>$<hex digest>
+    $pbkdf2-sha256$i=600000$<salt>$<hex digest>
+    <salt>$<sha256hex(salt + password)>          # legacy, seed script format
+
+New hashes use ``settings.password_scheme`` with the configured cost
+parameters.  Any hash written with a different scheme or cost reports
+:func:`needs_rehash` so it can be upgraded after a successful login.
+
+Calibration — pick cost parameters for a target per-hash time::
+
+    python -m core.passwords calibrate --target-ms 100
+    python -m core.passwords calibrate --scheme pbkdf2-sha256 --target-ms 250
+"""
+
+from __future__ import annotations
+
+import hashlib
+import hmac
+import secrets
+import time
+from typing import Literal
+
+from config import settings
+
+PasswordScheme = Literal["scrypt", "pbkdf2-sha256", "legacy-sha256"]
+
+SCRYPT = "scrypt"
+PBKDF2_SHA256 = "pbkdf2-sha256"
+LEGACY_SHA256 = "legacy-sha256"
+
+
+def _new_salt() -> str:
+    return secrets.token_hex(16)  # 32-char hex string
+
+
+def _scrypt_maxmem(n: int, r: int, p: int) -> int:
+    # OpenSSL needs ~128 * r * (n + p) bytes; leave headroom above the 32 MiB default.
+    return 128 * r * (n + p) + 1024 * 1024
+
+
+# ── Schemes ───────────────────────────────────────────────────────────
+
+def _scrypt(password: str, salt: str, n: int, r: int, p: int) -> str:
+    digest = hashlib.scrypt(
+        password.encode(), salt=salt.encode(), n=n, r=r, p=p,
+        maxmem=_scrypt_maxmem(n, r, p), dklen=32,
+    ).hex()
+    return f"${SCRYPT}$n={n},r={r},p={p}${salt}${digest}"
+
+
+def _pbkdf2(password: str, salt: str, iterations: int) -> str:
+    digest = hashlib.pbkdf2_hmac(
+        "sha256", password.encode(), salt.encode(), iterations
+    ).hex()
+    return f"${PBKDF2_SHA256}$i={iterations}${salt}${digest}"
+
+
+def _legacy(password: str, salt: str) -> str:
+    digest = hashlib.sha256((salt + password).encode()).hexdigest()
+    return f"{salt}${digest}"
+
+
+def _parse_params(raw: str) -> dict[str, int]:
+    return {k: int(v) for k, v in (item.split("=", 1) for item in raw.split(","))}
+
+
+def identify(stored_hash: str) -> str:
+    """Return the scheme name of *stored_hash*."""
+    if stored_hash.startswith(f"${SCRYPT}$"):
+        return SCRYPT
+    if stored_hash.startswith(f"${PBKDF2_SHA256}$"):
+        return PBKDF2_SHA256
+    return LEGACY_SHA256
+
+
+# ── Public API ────────────────────────────────────────────────────────
+
+def hash_password(
+    password: str,
+    salt: str | None = None,
+    scheme: PasswordScheme | None = None,
+) -> str:
+    """Hash *password* with *scheme* (default ``settings.password_scheme``)."""
+    scheme = scheme or settings.password_scheme
+    if salt is None:
+        salt = _new_salt()
+    if scheme == SCRYPT:
+        return _scrypt(password, salt, settings.scrypt_n, settings.scrypt_r, settings.scrypt_p)
+    if scheme == PBKDF2_SHA256:
+        return _pbkdf2(password, salt, settings.pbkdf2_iterations)
+    if scheme == LEGACY_SHA256:
+        return _legacy(password, salt)
+    raise ValueError(f"Unknown password scheme: {scheme!r}")
+
+
+def verify_password(password: str, stored_hash: str) -> bool:
+    """Verify *password* against a hash in any supported format."""
+    scheme = identify(stored_hash)
+    try:
+        if scheme == SCRYPT:
+            _, _, params, salt, _ = stored_hash.split("$")
+            p = _parse_params(params)
+            candidate = _scrypt(password, salt, p["n"], p["r"], p["p"])
+        elif scheme == PBKDF2_SHA256:
+            _, _, params, salt, _ = stored_hash.split("$")
+            candidate = _pbkdf2(password, salt, _parse_params(params)["i"])
+        else:
+            salt, _ = stored_hash.split("$", 1)
+            candidate = _legacy(password, salt)
+    except (KeyError, ValueError):
+        return False
+    return hmac.compare_digest(candidate, stored_hash)
+
+
+def needs_rehash(stored_hash: str) -> bool:
+    """True if *stored_hash* is not in the configured scheme and cost."""
+    scheme = identify(stored_hash)
+    if scheme != settings.password_scheme:
+        return True
+    if scheme == SCRYPT:
+        expected = f"n={settings.scrypt_n},r={settings.scrypt_r},p={settings.scrypt_p}"
+        return stored_hash.split("$")[2] != expected
+    if scheme == PBKDF2_SHA256:
+        return stored_hash.split("$")[2] != f"i={settings.pbkdf2_iterations}"
+    return False
+
+
+# ── Calibration ───────────────────────────────────────────────────────
+
+def _time_hash(fn, samples: int) -> float:
+    """Median wall time of *fn* in milliseconds."""
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return timings[len(timings) // 2]
+
+
+def calibrate(
+    scheme: PasswordScheme,
+    target_ms: float,
+    samples: int = 5,
+) -> tuple[dict[str, int], float]:
+    """Find the cheapest cost parameters whose median hash time is >= *target_ms*.
+
+    Returns ``(params, measured_ms)``.  scrypt doubles ``n`` (keeping the
+    configured ``r`` / ``p``); PBKDF2 doubles and then refines iterations.
+    """
+    salt = _new_salt()
+    if scheme == SCRYPT:
+        r, p = settings.scrypt_r, settings.scrypt_p
+        n = 2 ** 10
+        while True:
+            ms = _time_hash(lambda: _scrypt("calibrate", salt, n, r, p), samples)
+            if ms >= target_ms or n >= 2 ** 22:
+                return {"n": n, "r": r, "p": p}, ms
+            n *= 2
+    if scheme == PBKDF2_SHA256:
+        iterations = 10_000
+        ms = _time_hash(lambda: _pbkdf2("calibrate", salt, iterations), samples)
+        # PBKDF2 cost is linear in iterations — extrapolate, then verify.
+        iterations = max(iterations, int(iterations * target_ms / max(ms, 0.001)))
+        ms = _time_hash(lambda: _pbkdf2("calibrate", salt, iterations), samples)
+        return {"i": iterations}, ms
+    raise ValueError(f"Scheme {scheme!r} has no cost parameters to calibrate")
+
+
+def main() -> None:
+    """CLI entry point."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Password hashing tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+    cal = sub.add_parser("calibrate", help="Pick cost parameters for a target hash time")
+    cal.add_argument(
+        "--scheme", "-s",
+        choices=[SCRYPT, PBKDF2_SHA256],
+        default=SCRYPT,
+        help="Scheme to calibrate (default: scrypt)",
+    )
+    cal.add_argument(
+        "--target-ms", "-t",
+        type=float,
+        default=100.0,
+        help="Target median time per hash in milliseconds (default: 100)",
+    )
+    cal.add_argument("--samples", type=int, default=5, help="Timings per step (default: 5)")
+    args = parser.parse_args()
+
+    params, ms = calibrate(args.scheme, args.target_ms, args.samples)
+    print(f"# {args.scheme}: {ms:.1f} ms per hash on this machine")
+    print(f"PASSWORD_SCHEME={args.scheme}")
+    if args.scheme == SCRYPT:
+        print(f"SCRYPT_N={params['n']}")
+        print(f"SCRYPT_R={params['r']}")
+        print(f"SCRYPT_P={params['p']}")
+    else:
+        print(f"PBKDF2_ITERATIONS={params['i']}")
+
+
+if __name__ == "__main__":
+    main()
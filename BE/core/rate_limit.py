@@ -0,0 +1,101 @@
+"""In-memory, sharded rate limiter (GCRA token bucket).
+
+Each key costs one float — its *theoretical arrival time* — which is all
+GCRA needs to behave exactly like a token bucket of ``burst`` tokens
+refilled at ``rate`` per second.  Keys are hashed into ``shards`` plain
+dicts kept in last-update order; when a shard is full its stalest key is
+dropped.  A dropped key simply starts again with a full bucket, so memory
+is capped at ``max_keys`` entries no matter how many distinct keys arrive.
+
+Besides allow/deny, a decision carries a progressive *delay*: once more
+than ``soft_limit`` tokens are in use, each further call is asked to wait
+``delay_base * 2 ** (excess - 1)`` seconds (capped at ``delay_max``).
+"""
+
+from __future__ import annotations
+
+import time
+from typing import NamedTuple
+
+
+class Decision(NamedTuple):
+    allowed: bool
+    delay: float = 0.0  # seconds to wait before proceeding
+    retry_after: float = 0.0  # seconds until a call would be allowed
+
+
+ALLOW = Decision(True)
+
+
+class RateLimiter:
+    """Token-bucket limiter over many keys with bounded memory."""
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        *,
+        shards: int = 64,
+        max_keys: int = 100_000,
+        soft_limit: int | None = None,
+        delay_base: float = 0.0,
+        delay_max: float = 0.0,
+    ) -> None:
+        if rate <= 0 or burst < 1:
+            raise ValueError("rate must be > 0 and burst >= 1")
+        self._interval = 1.0 / rate
+        self._tolerance = burst * self._interval
+        self._soft = (burst // 2 if soft_limit is None else soft_limit) * self._interval
+        self._delay_base = delay_base
+        self._delay_max = delay_max
+        self._shards: list[dict[int, float]] = [{} for _ in range(shards)]
+        self._shard_cap = max(1, max_keys // shards)
+
+        # ── Counters ──────────────────────────────────────────────────
+        self.allowed = 0
+        self.delayed = 0
+        self.rejected = 0
+        self.evicted = 0
+
+    def hit(self, key: str, now: float | None = None) -> Decision:
+        """Charge one token to *key* and return the decision."""
+        if now is None:
+            now = time.monotonic()
+        hkey = hash(key)
+        shard = self._shards[hkey % len(self._shards)]
+
+        tat = shard.pop(hkey, now)
+        if tat < now:
+            tat = now
+        new_tat = tat + self._interval
+        used = new_tat - now
+
+        if used > self._tolerance:
+            shard[hkey] = tat  # not charged; re-insert as most recent
+            self.rejected += 1
+            return Decision(False, 0.0, used - self._tolerance)
+
+        shard[hkey] = new_tat
+        if len(shard) > self._shard_cap:
+            del shard[next(iter(shard))]
+            self.evicted += 1
+
+        self.allowed += 1
+        if self._delay_base and used > self._soft:
+            self.delayed += 1
+            excess = (used - self._soft) / self._interval
+            delay = min(self._delay_base * 2 ** (excess - 1), self._delay_max)
+            return Decision(True, delay)
+        return ALLOW
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+    def stats(self) -> dict:
+        return {
+            "keys": len(self),
+            "allowed": self.allowed,
+            "delayed": self.delayed,
+            "rejected": self.rejected,
+            "evicted": self.evicted,
+        }
@@ -0,0 +1,75 @@
+"""Fast JSON responses.
+
+``JSON_LIBRARY`` picks the encoder behind :func:`dumps` and
+:class:`FastJSONResponse`:
+
+- ``auto`` (default) — ``orjson`` when it is installed, else the stdlib;
+- ``orjson`` — require it (startup fails if it is missing);
+- ``stdlib`` — ``json.dumps``, compact separators.
+
+``FastJSONResponse`` is the app's ``default_response_class`` and is used
+for error envelopes.  Routes on the hot path can return
+:func:`json_response` with a plain dict to skip FastAPI's
+``response_model`` validation and encoding entirely — keep the
+``response_model`` on the decorator for the OpenAPI schema.
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import date, datetime
+from typing import Any, Callable
+from uuid import UUID
+
+from fastapi.responses import JSONResponse
+
+from config import settings
+
+try:
+    import orjson
+except ImportError:  # optional — pip install orjson
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _stdlib_dumps(content: Any) -> bytes:
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, separators=(",", ":"), default=_default
+    ).encode()
+
+
+def _orjson_dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def select_dumps(library: str) -> Callable[[Any], bytes]:
+    """Encoder for a ``JSON_LIBRARY`` value."""
+    if library == "stdlib" or (library == "auto" and orjson is None):
+        return _stdlib_dumps
+    if orjson is None:
+        raise RuntimeError("JSON_LIBRARY=orjson but orjson is not installed")
+    return _orjson_dumps
+
+
+dumps = select_dumps(settings.json_library)
+
+
+class FastJSONResponse(JSONResponse):
+    """``JSONResponse`` rendered with :func:`dumps`."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def json_response(
+    content: Any, status_code: int = 200, headers: dict[str, str] | None = None
+) -> FastJSONResponse:
+    """Serialise *content* (dicts, lists, scalars, datetimes) straight to a response."""
+    return FastJSONResponse(content, status_code=status_code, headers=headers)
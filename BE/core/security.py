@@ -1,76 +1,158 @@
-"""Password hashing utilities.
+"""Password hashing and JWT utilities.
 
-Format: ``salt$sha256hex(salt + password)`` — compatible with the DB seed script.
+Hash formats and schemes live in :mod:`core.passwords`; the helpers are
+re-exported here.  The ``*_async`` variants run on :data:`hash_executor` so
+hashing never blocks the event loop.
 """
 
 import hashlib
+import hmac
+import json
 import secrets
-from datetime import datetime, timedelta, timezone
+import time
+from datetime import timedelta
 from typing import Any
 
 import jwt
+from jwt.utils import base64url_encode
 
 from config import settings
+from core.executor import BoundedExecutor
+from core.keys import KeyRing
+from core.passwords import hash_password, needs_rehash, verify_password  # noqa: F401
+from core.timing import span
 
+# Worker pool for password hashing — started / stopped by the app lifespan.
+hash_executor = BoundedExecutor(
+    "hash",
+    kind=settings.hash_pool_kind,
+    workers=settings.hash_pool_workers,
+    queue_size=settings.hash_pool_queue_size,
+)
 
-def hash_password(password: str, salt: str | None = None) -> str:
-    """Return ``salt$hex(sha256(salt + password))``."""
-    if salt is None:
-        salt = secrets.token_hex(16)  # 32-char hex string
-    digest = hashlib.sha256((salt + password).encode()).hexdigest()
-    return f"{salt}${digest}"
 
+async def hash_password_async(password: str) -> str:
+    """:func:`hash_password` on the worker pool.
+
+    Raises :class:`core.executor.ExecutorSaturated` if the pool is full.
+    """
+    with span("hash"):
+        return await hash_executor.run(hash_password, password)
 
-def verify_password(password: str, stored_hash: str) -> bool:
-    """Verify *password* against a ``salt$digest`` hash."""
-    salt, _ = stored_hash.split("$", 1)
-    return hash_password(password, salt) == stored_hash
+
+async def verify_password_async(password: str, stored_hash: str) -> bool:
+    """:func:`verify_password` on the worker pool.
+
+    Raises :class:`core.executor.ExecutorSaturated` if the pool is full.
+    """
+    with span("verify"):
+        return await hash_executor.run(verify_password, password, stored_hash)
 
 
 # ── JWT Utilities ─────────────────────────────────────────────────────
 
+def new_jti() -> str:
+    """Random unique token id."""
+    return secrets.token_urlsafe(16)
+
+
+# Token lifetimes in seconds.
+_ACCESS_TTL = settings.access_token_expire_minutes * 60
+_REFRESH_TTL = settings.refresh_token_expire_days * 86400
+
+
+class TokenMinter:
+    """Fast JWT signer for a single key.
+
+    The header segment is encoded once and, for HMAC algorithms, the keyed
+    HMAC state is built once and copied per token instead of re-keying.
+    Output is byte-identical to ``jwt.encode`` for the same claims, so any
+    PyJWT verifier accepts it.
+    """
+
+    _HMAC_DIGESTS = {
+        "HS256": hashlib.sha256,
+        "HS384": hashlib.sha384,
+        "HS512": hashlib.sha512,
+    }
+
+    def __init__(self, key: str | bytes, algorithm: str, kid: str | None = None) -> None:
+        self.algorithm = algorithm
+        self.kid = kid
+        header: dict[str, Any] = {"typ": "JWT", "alg": algorithm}
+        if kid is not None:
+            header["kid"] = kid
+        self._header_segment = base64url_encode(
+            json.dumps(header, separators=(",", ":"), sort_keys=True).encode()
+        ) + b"."
+
+        digest = self._HMAC_DIGESTS.get(algorithm)
+        if digest is not None:
+            secret = key.encode() if isinstance(key, str) else key
+            self._mac = hmac.new(secret, digestmod=digest)
+        else:
+            # Asymmetric — prepare_key is a no-op for already-parsed key objects.
+            self._mac = None
+            self._alg = jwt.get_algorithm_by_name(algorithm)
+            self._key = self._alg.prepare_key(key)
+
+    def _sign(self, signing_input: bytes) -> bytes:
+        if self._mac is not None:
+            mac = self._mac.copy()
+            mac.update(signing_input)
+            return mac.digest()
+        return self._alg.sign(signing_input, self._key)
+
+    def mint(self, claims: dict[str, Any], token_type: str, expires_at: int) -> str:
+        """Sign ``claims`` plus ``exp`` / ``type`` into a compact JWT."""
+        payload = {**claims, "exp": expires_at, "type": token_type}
+        signing_input = self._header_segment + base64url_encode(
+            json.dumps(payload, separators=(",", ":")).encode()
+        )
+        return (signing_input + b"." + base64url_encode(self._sign(signing_input))).decode()
+
+    def mint_pair(self, claims: dict[str, Any]) -> tuple[str, str]:
+        """Mint an ``(access, refresh)`` pair sharing one clock read.
+
+        The refresh token gets a fresh ``jti`` so it can be consumed once.
+        """
+        now = time.time()
+        return (
+            self.mint(claims, "access", int(now + _ACCESS_TTL)),
+            self.mint({**claims, "jti": new_jti()}, "refresh", int(now + _REFRESH_TTL)),
+        )
+
+
+# Key ring and a minter for its active key — rotate by changing
+# ``jwt_active_kid`` and keep the old key in ``jwt_keys`` until its tokens expire.
+key_ring = KeyRing.from_settings(settings)
+token_minter = TokenMinter(
+    key_ring.active.signing_key, key_ring.active.algorithm, kid=key_ring.active.kid
+)
+
+
 def create_access_token(data: dict[str, Any], expires_delta: timedelta | None = None) -> str:
     """Create a JWT access token."""
-    to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.now(timezone.utc) + expires_delta
-    else:
-        expire = datetime.now(timezone.utc) + timedelta(
-            minutes=settings.access_token_expire_minutes
-        )
-    to_encode.update({"exp": expire, "type": "access"})
-    encoded_jwt = jwt.encode(
-        to_encode,
-        settings.jwt_secret,
-        algorithm=settings.jwt_algorithm
-    )
-    return encoded_jwt
+    ttl = expires_delta.total_seconds() if expires_delta else _ACCESS_TTL
+    return token_minter.mint(data, "access", int(time.time() + ttl))
 
 
 def create_refresh_token(data: dict[str, Any]) -> str:
-    """Create a JWT refresh token."""
-    to_encode = data.copy()
-    expire = datetime.now(timezone.utc) + timedelta(
-        days=settings.refresh_token_expire_days
-    )
-    to_encode.update({"exp": expire, "type": "refresh"})
-    encoded_jwt = jwt.encode(
-        to_encode,
-        settings.jwt_secret,
-        algorithm=settings.jwt_algorithm
-    )
-    return encoded_jwt
+    """Create a JWT refresh token with a fresh ``jti``."""
+    return token_minter.mint({**data, "jti": new_jti()}, "refresh", int(time.time() + _REFRESH_TTL))
+
+
+def create_token_pair(data: dict[str, Any]) -> tuple[str, str]:
+    """Create an ``(access_token, refresh_token)`` pair in one pass."""
+    with span("jwt"):
+        return token_minter.mint_pair(data)
 
 
 def verify_token(token: str) -> dict[str, Any]:
-    """Verify and decode a JWT token.
-    
+    """Verify and decode a JWT token with the key named by its ``kid``.
+
     Returns the token payload.
     Raises jwt.PyJWTError if verification fails.
     """
-    payload = jwt.decode(
-        token,
-        settings.jwt_secret,
-        algorithms=[settings.jwt_algorithm]
-    )
-    return payload
+    with span("jwt"):
+        return key_ring.decode(token)
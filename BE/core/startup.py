@@ -0,0 +1,70 @@
+"""Startup profiling — where does cold-start time go?
+
+::
+
+    python -m core.startup                 # top 25 modules imported by main
+    python -m core.startup --top 50 --module modules.auth.router
+
+Runs a fresh interpreter with ``-X importtime`` and reports, per module,
+the time spent in its own body ("self") and including everything it
+imported ("cumulative").  The app itself logs the import and lifespan
+phases on every start (see ``main.py``).
+"""
+
+from __future__ import annotations
+
+import re
+import subprocess
+import sys
+from typing import NamedTuple
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+class ImportTiming(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def import_times(module: str = "main") -> list[ImportTiming]:
+    """Import *module* in a fresh interpreter and return per-module timings."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings = []
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            timings.append(ImportTiming(name, int(self_us), int(cumulative_us), len(indent) // 2))
+    return timings
+
+
+def main() -> None:
+    """CLI entry point."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Report import time per module")
+    parser.add_argument("--module", "-m", default="main", help="Module to import (default: main)")
+    parser.add_argument("--top", "-n", type=int, default=25)
+    parser.add_argument(
+        "--sort", choices=["self", "cumulative"], default="cumulative",
+    )
+    args = parser.parse_args()
+
+    timings = import_times(args.module)
+    total = next((t.cumulative_us for t in timings if t.module == args.module), 0)
+    key = (lambda t: t.self_us) if args.sort == "self" else (lambda t: t.cumulative_us)
+    print(f"import {args.module}: {total / 1000:.1f} ms, {len(timings)} modules\n")
+    print(f"{'self ms':>9} {'cumul ms':>9}  module")
+    for t in sorted(timings, key=key, reverse=True)[:args.top]:
+        print(f"{t.self_us / 1000:9.1f} {t.cumulative_us / 1000:9.1f}  {t.module}")
+
+
+if __name__ == "__main__":
+    main()
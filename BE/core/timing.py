@@ -0,0 +1,115 @@
+"""Per-request phase timings (``Server-Timing``).
+
+:class:`core.middleware.timing.ServerTimingMiddleware` opens a
+:class:`Timings` for every request; code below it reports phases::
+
+    from core.timing import record, span
+
+    with span("verify"):
+        ok = await verify_password_async(password, stored_hash)
+
+    record("db", elapsed)          # for code that already measured
+
+Durations add up per name, so three queries are one ``db`` entry with a
+count of 3.  ``core.database`` records ``pool`` (acquire wait) and ``db``
+(query time) for every query.  Outside a request, or with
+``SERVER_TIMING`` off, there is no :class:`Timings`; ``span`` then returns
+a shared no-op and ``record`` returns after one ``ContextVar`` lookup.
+"""
+
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+_timings: ContextVar[Timings | None] = ContextVar("timings", default=None)
+
+
+class Timings:
+    """Accumulated ``{name: [seconds, count]}`` for one request."""
+
+    __slots__ = ("started", "phases")
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.phases: dict[str, list] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        phase = self.phases.get(name)
+        if phase is None:
+            self.phases[name] = [seconds, 1]
+        else:
+            phase[0] += seconds
+            phase[1] += 1
+
+    def total(self) -> float:
+        return time.perf_counter() - self.started
+
+    def header(self) -> str:
+        """``Server-Timing`` value: one entry per phase plus ``total``."""
+        entries = [
+            f"{name};dur={seconds * 1000:.2f}" if count == 1
+            else f'{name};dur={seconds * 1000:.2f};desc="{count}x"'
+            for name, (seconds, count) in self.phases.items()
+        ]
+        entries.append(f"total;dur={self.total() * 1000:.2f}")
+        return ", ".join(entries)
+
+
+class _Span:
+    __slots__ = ("_timings", "_name", "_started")
+
+    def __init__(self, timings: Timings, name: str) -> None:
+        self._timings = timings
+        self._name = name
+
+    def __enter__(self) -> None:
+        self._started = time.perf_counter()
+
+    def __exit__(self, *_exc: object) -> None:
+        self._timings.add(self._name, time.perf_counter() - self._started)
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        pass
+
+    def __exit__(self, *_exc: object) -> None:
+        pass
+
+
+_NO_SPAN = _NoSpan()
+
+
+def span(name: str) -> _Span | _NoSpan:
+    """Context manager adding the block's duration to phase *name*."""
+    timings = _timings.get()
+    if timings is None:
+        return _NO_SPAN
+    return _Span(timings, name)
+
+
+def record(name: str, seconds: float) -> None:
+    """Add *seconds* to phase *name* of the current request, if timed."""
+    timings = _timings.get()
+    if timings is not None:
+        timings.add(name, seconds)
+
+
+def current() -> Timings | None:
+    return _timings.get()
+
+
+@contextmanager
+def timing_scope() -> Iterator[Timings]:
+    """Collect the block's phases into a fresh :class:`Timings`."""
+    timings = Timings()
+    token = _timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _timings.reset(token)
@@ -3,15 +3,41 @@
 This is the single entry-point.  All domain logic lives in ``modules/``.
 """
 
+import logging
+import time
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
 from config import settings
-from core.database import close_pool, create_pool
+from container import container
+from core import database
+from core.admission import admission
+from core.database import RoutingPool
+from core.events import PostgresBridge, event_bus
+from core.lazy import import_router, include_lazy_router
+from core.middleware.admission import AdmissionMiddleware
+from core.middleware.deadline import DeadlineMiddleware
 from core.middleware.error_handler import register_error_handlers
-from modules.auth.router import router as auth_router
+from core.middleware.timing import ServerTimingMiddleware
+from core.openapi import use_cached_openapi
+from core.outbox import outbox_dispatcher
+from core.responses import FastJSONResponse
+from core.security import hash_executor
+from modules.auth.batching import registration_batcher
+from modules.auth.repository import AuthRepository
+from modules.auth.revocation import revocation_store
+
+logger = logging.getLogger(__name__)
+
+# Domain routers as (path prefix, "module:attribute") — add new ones here.
+# With LAZY_ROUTERS the module is imported on the first request under its
+# prefix instead of at startup.
+DOMAIN_ROUTERS: list[tuple[str, str]] = [
+    ("/api", "modules.auth.router:router"),
+]
 
 
 # ---------------------------------------------------------------------------
@@ -21,10 +47,35 @@ from modules.auth.router import router as auth_router
 @asynccontextmanager
 async def lifespan(_app: FastAPI):
     # ── Startup ───────────────────────────────────────────────────────
-    await create_pool()
+    started = time.perf_counter()
+    await container.startup()  # database pool and other singletons
+    singletons_ready = time.perf_counter()
+    hash_executor.start()
+    event_bus.start()
+    if settings.event_bridge:
+        await PostgresBridge(
+            event_bus,
+            settings.event_bridge_topics,
+            channel=settings.event_bridge_channel,
+            flush_interval=settings.event_bridge_flush_ms / 1000,
+        ).start(database.connect)
+    if settings.event_outbox:
+        await outbox_dispatcher.start(container.resolve(RoutingPool))
+    await revocation_store.load(container.resolve(AuthRepository))
+    logger.info(
+        "Startup complete in %.0f ms (container %.0f ms)",
+        (time.perf_counter() - started) * 1000, (singletons_ready - started) * 1000,
+    )
     yield
     # ── Shutdown ──────────────────────────────────────────────────────
-    await close_pool()
+    await registration_batcher.drain()
+    await outbox_dispatcher.stop()
+    if event_bus.bridge is not None:
+        await event_bus.bridge.stop()
+    # Handlers may still need the database — deliver them before it closes
+    await event_bus.drain(settings.event_bus_drain_seconds)
+    hash_executor.shutdown()
+    await container.shutdown()  # closes the database pool last
 
 
 # ---------------------------------------------------------------------------
@@ -32,7 +83,33 @@ async def lifespan(_app: FastAPI):
 # ---------------------------------------------------------------------------
 
 def create_app() -> FastAPI:
-    app = FastAPI(title=settings.app_name, lifespan=lifespan)
+    app = FastAPI(
+        title=settings.app_name,
+        lifespan=lifespan,
+        default_response_class=FastJSONResponse,
+    )
+
+    # Request deadlines — cancel work for clients that are gone or out of time.
+    # Added before CORS so its 504s still get CORS headers.
+    app.add_middleware(
+        DeadlineMiddleware,
+        default=settings.request_timeout_seconds,
+        routes=settings.request_timeouts,
+    )
+
+    # Admission control — outside the deadline so queueing does not eat
+    # the handler's budget; shed requests never reach the app.
+    if settings.admission_control:
+        app.add_middleware(AdmissionMiddleware, controller=admission)
+
+    # Per-phase timings — outside the deadline and admission so 504s and
+    # 503s are timed too
+    if settings.server_timing:
+        app.add_middleware(
+            ServerTimingMiddleware,
+            networks=settings.server_timing_networks,
+            token=settings.server_timing_token,
+        )
 
     # CORS
     app.add_middleware(
@@ -45,13 +122,36 @@ def create_app() -> FastAPI:
     # Error handlers
     register_error_handlers(app)
 
-    # Routers — add new domain routers here
-    app.include_router(auth_router)
-
-    # Health check (infrastructure, not a domain concern)
+    # Health check (infrastructure, not a domain concern).  Registered
+    # before the domain routers so it never triggers a lazy import.
     @app.get("/api/health")
     async def health():
-        return {"status": "ok"}
+        status = {"status": "ok"}
+        if database.pool is not None:
+            status["db"] = database.pool.stats()
+        status["events"] = event_bus.stats()
+        if settings.admission_control:
+            status["admission"] = admission.stats()
+        return status
+
+    # Prometheus scrape target — restrict to the internal network at ingress
+    @app.get("/api/metrics", include_in_schema=False)
+    async def metrics():
+        return PlainTextResponse(
+            "\n".join(database.prometheus()) + "\n",
+            media_type="text/plain; version=0.0.4",
+        )
+
+    # Domain routers
+    for prefix, target in DOMAIN_ROUTERS:
+        if settings.lazy_routers:
+            include_lazy_router(app, prefix, target)
+        else:
+            app.include_router(import_router(target))
+
+    # OpenAPI from the file generated at build time (python -m core.openapi)
+    if settings.openapi_cache_path:
+        use_cached_openapi(app, settings.openapi_cache_path)
 
     return app
 
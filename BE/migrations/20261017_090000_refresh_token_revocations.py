@@ -0,0 +1,28 @@
+"""Migration: refresh_token_revocations
+
+Created: 2026-10-17T09:00:00
+"""
+
+import asyncpg
+
+
+async def up(conn: asyncpg.Connection) -> None:
+    """Apply the migration."""
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS refresh_token_revocations (
+            jti         TEXT PRIMARY KEY,
+            user_id     INTEGER NOT NULL,
+            expires_at  TIMESTAMPTZ NOT NULL,
+            revoked_at  TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+            reason      TEXT NOT NULL
+        )
+    """)
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_refresh_token_revocations_expires_at
+            ON refresh_token_revocations (expires_at)
+    """)
+
+
+async def down(conn: asyncpg.Connection) -> None:
+    """Rollback the migration."""
+    await conn.execute("DROP TABLE IF EXISTS refresh_token_revocations")
@@ -0,0 +1,22 @@
+"""Migration: users_created_at_index
+
+Created: 2026-10-17T10:00:00
+
+Backs keyset pagination of ``GET /api/users`` on ``(created_at, id)``.
+Built ``CONCURRENTLY`` so signups keep working while it builds.
+"""
+
+import asyncpg
+
+
+async def up(conn: asyncpg.Connection) -> None:
+    """Apply the migration."""
+    await conn.execute("""
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_created_at_id
+            ON users (created_at, id)
+    """)
+
+
+async def down(conn: asyncpg.Connection) -> None:
+    """Rollback the migration."""
+    await conn.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_users_created_at_id")
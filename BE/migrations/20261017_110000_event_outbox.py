@@ -0,0 +1,43 @@
+"""Migration: event_outbox
+
+Created: 2026-10-17T11:00:00
+
+Durable domain events, written in the same statement as the domain change
+and delivered by ``core.outbox.OutboxDispatcher``.  A statement-level
+trigger sends one ``NOTIFY event_outbox`` per inserting statement, so the
+dispatcher wakes on new rows instead of polling.
+"""
+
+import asyncpg
+
+
+async def up(conn: asyncpg.Connection) -> None:
+    """Apply the migration."""
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS event_outbox (
+            id          BIGSERIAL PRIMARY KEY,
+            topic       TEXT NOT NULL,
+            payload     JSONB NOT NULL,
+            created_at  TIMESTAMPTZ NOT NULL DEFAULT NOW()
+        )
+    """)
+    await conn.execute("""
+        CREATE OR REPLACE FUNCTION notify_event_outbox() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('event_outbox', '');
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    await conn.execute("DROP TRIGGER IF EXISTS event_outbox_notify ON event_outbox")
+    await conn.execute("""
+        CREATE TRIGGER event_outbox_notify
+            AFTER INSERT ON event_outbox
+            FOR EACH STATEMENT EXECUTE FUNCTION notify_event_outbox()
+    """)
+
+
+async def down(conn: asyncpg.Connection) -> None:
+    """Rollback the migration."""
+    await conn.execute("DROP TABLE IF EXISTS event_outbox")
+    await conn.execute("DROP FUNCTION IF EXISTS notify_event_outbox()")
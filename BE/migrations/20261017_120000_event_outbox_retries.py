@@ -0,0 +1,46 @@
+"""Migration: event_outbox_retries
+
+Created: 2026-10-17T12:00:00
+
+Retry bookkeeping for the outbox.  A row whose handler fails is retried
+with exponential backoff (``attempts``, ``next_attempt_at``) instead of
+being claimed again on every wakeup, and after
+``EVENT_OUTBOX_MAX_ATTEMPTS`` it moves to ``event_outbox_dead`` so it can
+no longer hold up newer events.
+"""
+
+import asyncpg
+
+
+async def up(conn: asyncpg.Connection) -> None:
+    """Apply the migration."""
+    await conn.execute("""
+        ALTER TABLE event_outbox
+            ADD COLUMN IF NOT EXISTS attempts INTEGER NOT NULL DEFAULT 0,
+            ADD COLUMN IF NOT EXISTS next_attempt_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+    """)
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_event_outbox_next_attempt_at
+            ON event_outbox (next_attempt_at)
+    """)
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS event_outbox_dead (
+            id          BIGINT PRIMARY KEY,
+            topic       TEXT NOT NULL,
+            payload     JSONB NOT NULL,
+            attempts    INTEGER NOT NULL,
+            created_at  TIMESTAMPTZ NOT NULL,
+            failed_at   TIMESTAMPTZ NOT NULL DEFAULT NOW()
+        )
+    """)
+
+
+async def down(conn: asyncpg.Connection) -> None:
+    """Rollback the migration."""
+    await conn.execute("DROP TABLE IF EXISTS event_outbox_dead")
+    await conn.execute("DROP INDEX IF EXISTS idx_event_outbox_next_attempt_at")
+    await conn.execute("""
+        ALTER TABLE event_outbox
+            DROP COLUMN IF EXISTS attempts,
+            DROP COLUMN IF EXISTS next_attempt_at
+    """)
@@ -0,0 +1,61 @@
+"""Coalesce concurrent registrations into multi-row inserts.
+
+With ``REGISTRATION_BATCHING=true`` every ``create_user`` call made inside
+a short window (``REGISTRATION_BATCH_WINDOW_MS``) or until
+``REGISTRATION_BATCH_MAX_SIZE`` rows are waiting is written with a single
+``INSERT … SELECT FROM unnest(…) ON CONFLICT DO NOTHING`` — one pooled
+connection and one round trip for the whole burst instead of one each.
+Each caller still gets its own ``id``, or :class:`EmailAlreadyRegistered`
+when the email was taken (including by an earlier caller in the same batch).
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from config import settings
+from core.batching import MicroBatcher
+from core.database import get_pool
+from modules.auth.exceptions import EmailAlreadyRegistered
+from modules.auth.repository import AuthRepository
+
+
+async def insert_batch(
+    repo: AuthRepository, users: list[tuple[str, str]]
+) -> list[int | EmailAlreadyRegistered]:
+    """Insert *users* in one statement and map the outcome back per row."""
+    first: dict[str, str] = {}
+    for email, password_hash in users:
+        first.setdefault(email, password_hash)
+    ids = await repo.create_users(list(first.items()))
+    # ``pop`` so only the first caller per email gets the id.
+    return [ids.pop(email, None) or EmailAlreadyRegistered() for email, _ in users]
+
+
+class BatchingAuthRepository:
+    """Decorator routing ``create_user`` through a :class:`MicroBatcher`.
+
+    Every other method is delegated to the wrapped repository.
+    """
+
+    def __init__(self, repo: AuthRepository, batcher: MicroBatcher) -> None:
+        self._repo = repo
+        self._batcher = batcher
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._repo, name)
+
+    async def create_user(self, email: str, password_hash: str) -> int:
+        """Insert a user as part of the next batch.
+
+        Raises :class:`EmailAlreadyRegistered` if the email is taken.
+        """
+        return await self._batcher.submit((email, password_hash))
+
+
+# Singleton — batches span every request in this process
+registration_batcher: MicroBatcher[tuple[str, str], int] = MicroBatcher(
+    lambda users: insert_batch(AuthRepository(get_pool(), outbox=settings.event_outbox), users),
+    max_size=settings.registration_batch_max_size,
+    window=settings.registration_batch_window_ms / 1000,
+)
@@ -0,0 +1,233 @@
+"""Bulk user import / export.
+
+Usage:
+    # Import — CSV with an ``email`` column and ``password`` (plain text,
+    # hashed here) or ``password_hash`` (stored as-is); or NDJSON with the
+    # same keys.  ``-`` reads stdin.
+    python -m modules.auth.bulk import users.csv
+    python -m modules.auth.bulk import users.ndjson --workers 8 --duplicates dups.txt
+
+    # Export — streams ``users`` as CSV via COPY TO.  ``-`` writes stdout.
+    python -m modules.auth.bulk export users.csv
+
+Input is read in chunks.  While one chunk is loaded with a single
+``COPY`` + merge, the next chunk's passwords are already being hashed on a
+process pool, so the database and the CPUs stay busy together.  Memory is
+bounded by the chunk size on import and by asyncpg's COPY buffer on export.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import IO, Iterable, Iterator
+
+from pydantic import EmailStr, TypeAdapter, ValidationError
+
+from core.database import close_pool, create_pool
+from core.passwords import hash_password
+from modules.auth.repository import AuthRepository
+
+
+# ---------------------------------------------------------------------------
+# Input
+# ---------------------------------------------------------------------------
+
+def _open_text(path: str) -> IO[str]:
+    if path == "-":
+        return sys.stdin
+    return open(path, newline="", encoding="utf-8")
+
+
+def read_rows(stream: IO[str], fmt: str) -> Iterator[dict]:
+    """Yield one dict per input row without loading the whole file."""
+    if fmt == "csv":
+        yield from csv.DictReader(stream)
+    else:
+        for line in stream:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _chunks(rows: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    it = iter(rows)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+
+def hash_many(passwords: list[str]) -> list[str]:
+    """Hash a slice of passwords in a worker process."""
+    return [hash_password(p) for p in passwords]
+
+
+# ---------------------------------------------------------------------------
+# Import
+# ---------------------------------------------------------------------------
+
+# Same rules as ``AuthRequest.email``, so imported users can log in
+_email = TypeAdapter(EmailStr)
+
+
+def normalize_email(raw: str | None) -> str | None:
+    """The address as ``/register`` would store it, or ``None`` if invalid."""
+    try:
+        return _email.validate_python((raw or "").strip())
+    except ValidationError:
+        return None
+
+
+@dataclass
+class ImportStats:
+    read: int = 0
+    inserted: int = 0
+    duplicates: int = 0
+    invalid: int = 0
+
+
+async def _prepare(
+    chunk: list[dict], executor: ProcessPoolExecutor, workers: int, stats: ImportStats
+) -> list[tuple[str, str]]:
+    """Validate *chunk* and hash its plain-text passwords in parallel."""
+    hashed: list[tuple[str, str]] = []
+    plain_emails: list[str] = []
+    plain_passwords: list[str] = []
+    for row in chunk:
+        stats.read += 1
+        email = normalize_email(row.get("email"))
+        if email is None:
+            stats.invalid += 1
+        elif row.get("password_hash"):
+            hashed.append((email, row["password_hash"]))
+        elif row.get("password"):
+            plain_emails.append(email)
+            plain_passwords.append(row["password"])
+        else:
+            stats.invalid += 1
+
+    if plain_passwords:
+        loop = asyncio.get_running_loop()
+        step = -(-len(plain_passwords) // workers)  # ceil division
+        slices = [plain_passwords[i:i + step] for i in range(0, len(plain_passwords), step)]
+        results = await asyncio.gather(
+            *(loop.run_in_executor(executor, hash_many, s) for s in slices)
+        )
+        digests = [d for part in results for d in part]
+        hashed.extend(zip(plain_emails, digests))
+    return hashed
+
+
+async def import_users(
+    repo: AuthRepository,
+    rows: Iterable[dict],
+    *,
+    chunk_size: int = 5_000,
+    workers: int = 4,
+    duplicates_out: IO[str] | None = None,
+) -> ImportStats:
+    """Hash and load *rows*, pipelining hashing of chunk N+1 with loading chunk N."""
+    stats = ImportStats()
+    chunks = _chunks(rows, chunk_size)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        first = next(chunks, None)
+        pending = asyncio.ensure_future(_prepare(first, executor, workers, stats)) if first else None
+        while pending is not None:
+            records = await pending
+            following = next(chunks, None)
+            pending = (
+                asyncio.ensure_future(_prepare(following, executor, workers, stats))
+                if following else None
+            )
+            if not records:
+                continue
+            result = await repo.bulk_import_users(records)
+            stats.inserted += result.inserted
+            stats.duplicates += len(result.duplicates)
+            if duplicates_out is not None:
+                duplicates_out.writelines(f"{email}\n" for email in result.duplicates)
+            print(
+                f"  read {stats.read}  inserted {stats.inserted}  "
+                f"duplicates {stats.duplicates}  invalid {stats.invalid}",
+                file=sys.stderr,
+            )
+    return stats
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+async def _run_import(args) -> None:
+    fmt = args.format or ("ndjson" if args.path.endswith((".ndjson", ".jsonl")) else "csv")
+    pool = await create_pool()
+    dup_file = open(args.duplicates, "w", encoding="utf-8") if args.duplicates else None
+    started = time.perf_counter()
+    try:
+        with _open_text(args.path) as stream:
+            stats = await import_users(
+                AuthRepository(pool),
+                read_rows(stream, fmt),
+                chunk_size=args.chunk_size,
+                workers=args.workers,
+                duplicates_out=dup_file,
+            )
+    finally:
+        if dup_file is not None:
+            dup_file.close()
+        await close_pool()
+    elapsed = time.perf_counter() - started
+    print(
+        f"Imported {stats.inserted} users in {elapsed:.1f}s "
+        f"({stats.duplicates} duplicate emails, {stats.invalid} invalid rows)",
+        file=sys.stderr,
+    )
+
+
+async def _run_export(args) -> None:
+    pool = await create_pool()
+    try:
+        repo = AuthRepository(pool)
+        output = sys.stdout.buffer if args.path == "-" else Path(args.path)
+        status = await repo.export_users(output, args.include_password_hash)
+    finally:
+        await close_pool()
+    print(f"Exported {status.split()[-1]} users", file=sys.stderr)
+
+
+def main() -> None:
+    """CLI entry point."""
+    import argparse
+    import os
+
+    parser = argparse.ArgumentParser(description="Bulk user import / export")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    imp = sub.add_parser("import", help="Load users from CSV / NDJSON")
+    imp.add_argument("path", help="Input file, or - for stdin")
+    imp.add_argument("--format", "-f", choices=["csv", "ndjson"], help="Default: from extension")
+    imp.add_argument("--chunk-size", type=int, default=5_000, help="Rows per COPY (default: 5000)")
+    imp.add_argument(
+        "--workers", "-w", type=int, default=os.cpu_count() or 4,
+        help="Hashing processes (default: CPU count)",
+    )
+    imp.add_argument("--duplicates", "-d", help="Write duplicate emails to this file")
+
+    exp = sub.add_parser("export", help="Stream users to CSV")
+    exp.add_argument("path", help="Output file, or - for stdout")
+    exp.add_argument(
+        "--include-password-hash", action="store_true",
+        help="Include password hashes (for migrations between environments)",
+    )
+
+    args = parser.parse_args()
+    asyncio.run(_run_import(args) if args.command == "import" else _run_export(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Read-through user cache in front of :class:`AuthRepository`.
+
+``get_by_email`` is served from an in-process TTL + LRU cache.  Unknown
+emails are cached too (negative caching, shorter TTL) so repeated failed
+logins for the same address stop reaching Postgres.
+
+Entries are dropped when a user is created or their password hash
+changes — directly for writes made through this decorator, and via
+``core.events.event_bus`` for everything else, so a fresh registration is
+never hidden behind a cached "not found".  A lookup that was in flight
+when an invalidation happened does not store its (possibly stale) result:
+every invalidation bumps :attr:`UserCache.generation`, and ``put`` is
+skipped if it moved during the lookup.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from config import settings
+from core.cache import LRUCache
+from core.events import event_bus
+from modules.auth import events as auth_events
+from modules.auth.models import User
+from modules.auth.repository import AuthRepository
+
+# Cached "no such user" marker (``None`` already means "not cached").
+_ABSENT = object()
+
+
+class UserCache:
+    """Email → :class:`User` (or known-absent) with TTL and LRU eviction."""
+
+    def __init__(self, maxsize: int, ttl: float, negative_ttl: float) -> None:
+        self._entries: LRUCache[str, Any] = LRUCache(maxsize)
+        self._ttl = ttl
+        self._negative_ttl = negative_ttl
+        self.generation = 0  # bumped by every invalidation
+        self.negative_hits = 0
+
+    def get(self, email: str) -> tuple[bool, User | None]:
+        """Return ``(hit, user)``; ``user`` is ``None`` for a cached miss."""
+        value = self._entries.get(email)
+        if value is None:
+            return False, None
+        if value is _ABSENT:
+            self.negative_hits += 1
+            return True, None
+        return True, value
+
+    def put(self, email: str, user: User | None, generation: int | None = None) -> None:
+        """Cache *user*, unless an invalidation happened since *generation*."""
+        if generation is not None and generation != self.generation:
+            return
+        if user is None:
+            self._entries.set_ttl(email, _ABSENT, self._negative_ttl)
+        else:
+            self._entries.set_ttl(email, user, self._ttl)
+
+    def invalidate(self, email: str) -> None:
+        self.generation += 1
+        self._entries.pop(email)
+
+    async def on_user_changed(self, payload: dict) -> None:
+        """Event handler — drop the entry for ``payload["email"]``."""
+        if payload.get("email"):
+            self.invalidate(payload["email"])
+
+    def stats(self) -> dict:
+        return {**self._entries.stats(), "negative_hits": self.negative_hits}
+
+
+class CachedAuthRepository:
+    """Decorator adding :class:`UserCache` to an :class:`AuthRepository`.
+
+    Only ``get_by_email`` is cached; every other method is delegated.
+    """
+
+    def __init__(self, repo: AuthRepository, cache: UserCache) -> None:
+        self._repo = repo
+        self._cache = cache
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._repo, name)
+
+    async def get_by_email(self, email: str) -> User | None:
+        hit, user = self._cache.get(email)
+        if hit:
+            return user
+        generation = self._cache.generation
+        user = await self._repo.get_by_email(email)
+        self._cache.put(email, user, generation)
+        return user
+
+    async def create_user(self, email: str, password_hash: str) -> int:
+        try:
+            return await self._repo.create_user(email, password_hash)
+        finally:
+            self._cache.invalidate(email)
+
+
+# Singleton — shared by every request in this process
+user_cache = UserCache(
+    maxsize=settings.user_cache_size,
+    ttl=settings.user_cache_ttl_seconds,
+    negative_ttl=settings.user_cache_negative_ttl_seconds,
+)
+event_bus.subscribe(auth_events.USER_REGISTERED, user_cache.on_user_changed)
+event_bus.subscribe(auth_events.USER_PASSWORD_CHANGED, user_cache.on_user_changed)
@@ -3,3 +3,4 @@
 # Event name constants — subscribers use these to register handlers.
 USER_REGISTERED = "user.registered"
 USER_LOGGED_IN = "user.logged_in"
+USER_PASSWORD_CHANGED = "user.password_changed"
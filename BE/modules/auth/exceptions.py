@@ -1,6 +1,6 @@
 """Auth-specific domain exceptions."""
 
-from core.exceptions import ConflictError, UnauthorizedError
+from core.exceptions import ConflictError, UnauthorizedError, ValidationError
 
 
 class EmailAlreadyRegistered(ConflictError):
@@ -9,3 +9,11 @@ class EmailAlreadyRegistered(ConflictError):
 
 class InvalidCredentials(UnauthorizedError):
     detail = "Invalid email or password"
+
+
+class RefreshTokenReused(InvalidCredentials):
+    detail = "Refresh token has already been used or was revoked"
+
+
+class InvalidCursor(ValidationError):
+    detail = "Invalid pagination cursor"
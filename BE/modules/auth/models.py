@@ -14,3 +14,12 @@ class User:
     email: str
     password_hash: str
     created_at: datetime
+
+
+@dataclass(frozen=True)
+class UserSummary:
+    """A user as listed — never carries the password hash."""
+
+    id: int
+    email: str
+    created_at: datetime
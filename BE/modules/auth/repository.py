@@ -1,29 +1,108 @@
 """Auth repository — thin SQL wrapper over asyncpg.
 
 One method per query.  Returns domain models, never raw ``asyncpg.Record``.
+Hot-path SQL is declared in the statement registry so every pooled
+connection has it prepared up front; ``readonly`` statements may be served
+by a read replica.
+
+With ``outbox=True`` user inserts also write ``USER_REGISTERED`` to
+``event_outbox`` in the same statement (see ``core.outbox``).
 """
 
 from __future__ import annotations
 
-import asyncpg
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, AsyncIterator, Iterable
+
+from core.database import RoutingPool, statements
+from modules.auth import events as auth_events
+from modules.auth.models import User, UserSummary
+
+# ── Statements ────────────────────────────────────────────────────────
+
+GET_USER_BY_EMAIL = statements.register(
+    "auth.get_user_by_email",
+    "SELECT id, email, password_hash, created_at FROM users WHERE email = $1",
+    readonly=True,
+)
+INSERT_USER = statements.register(
+    "auth.insert_user",
+    "INSERT INTO users (email, password_hash) VALUES ($1, $2) RETURNING id",
+)
+INSERT_USERS = statements.register(
+    "auth.insert_users",
+    "INSERT INTO users (email, password_hash) "
+    "SELECT * FROM unnest($1::text[], $2::text[]) "
+    "ON CONFLICT (email) DO NOTHING RETURNING id, email",
+)
+# Keyset pagination over idx_users_created_at_id — cost is independent of
+# how deep the page is, unlike OFFSET.
+LIST_USERS_FIRST = statements.register(
+    "auth.list_users_first",
+    "SELECT id, email, created_at FROM users ORDER BY created_at, id LIMIT $1",
+    readonly=True,
+)
+LIST_USERS_AFTER = statements.register(
+    "auth.list_users_after",
+    "SELECT id, email, created_at FROM users WHERE (created_at, id) > ($1, $2) "
+    "ORDER BY created_at, id LIMIT $3",
+    readonly=True,
+)
+# Same inserts, plus one outbox row per inserted user — one round trip,
+# and the event commits (or not) with the user.
+INSERT_USER_WITH_EVENT = statements.register(
+    "auth.insert_user_with_event",
+    "WITH u AS (INSERT INTO users (email, password_hash) VALUES ($1, $2) RETURNING id, email), "
+    "e AS (INSERT INTO event_outbox (topic, payload) "
+    "SELECT $3, jsonb_build_object('user_id', id, 'email', email) FROM u) "
+    "SELECT id FROM u",
+)
+INSERT_USERS_WITH_EVENTS = statements.register(
+    "auth.insert_users_with_events",
+    "WITH u AS (INSERT INTO users (email, password_hash) "
+    "SELECT * FROM unnest($1::text[], $2::text[]) "
+    "ON CONFLICT (email) DO NOTHING RETURNING id, email), "
+    "e AS (INSERT INTO event_outbox (topic, payload) "
+    "SELECT $3, jsonb_build_object('user_id', id, 'email', email) FROM u) "
+    "SELECT id, email FROM u",
+)
+UPDATE_PASSWORD_HASH = statements.register(
+    "auth.update_password_hash",
+    "UPDATE users SET password_hash = $3 WHERE id = $1 AND password_hash = $2",
+)
+REVOKE_REFRESH_TOKEN = statements.register(
+    "auth.revoke_refresh_token",
+    "INSERT INTO refresh_token_revocations (jti, user_id, expires_at, reason) "
+    "VALUES ($1, $2, $3, $4) ON CONFLICT (jti) DO NOTHING RETURNING jti",
+)
+IS_REFRESH_TOKEN_REVOKED = statements.register(
+    "auth.is_refresh_token_revoked",
+    "SELECT 1 FROM refresh_token_revocations WHERE jti = $1",
+    readonly=True,
+)
+
 
-from modules.auth.models import User
+@dataclass(frozen=True)
+class BulkImportResult:
+    """Outcome of :meth:`AuthRepository.bulk_import_users`."""
+
+    inserted: int
+    duplicates: list[str]
 
 
 class AuthRepository:
     """Data-access layer for the ``users`` table."""
 
-    def __init__(self, pool: asyncpg.Pool) -> None:
+    def __init__(self, pool: RoutingPool, *, outbox: bool = False) -> None:
         self._pool = pool
+        self.outbox = outbox
 
     # ── Queries ───────────────────────────────────────────────────────
 
     async def get_by_email(self, email: str) -> User | None:
         """Return a user by email, or ``None`` if not found."""
-        row = await self._pool.fetchrow(
-            "SELECT id, email, password_hash, created_at FROM users WHERE email = $1",
-            email,
-        )
+        row = await self._pool.fetchrow(GET_USER_BY_EMAIL, email)
         if row is None:
             return None
         return User(
@@ -33,6 +112,39 @@ class AuthRepository:
             created_at=row["created_at"],
         )
 
+    async def list_users(
+        self, limit: int, after: tuple[datetime, int] | None = None
+    ) -> list[UserSummary]:
+        """Return up to *limit* users ordered by ``(created_at, id)``, after *after*."""
+        if after is None:
+            rows = await self._pool.fetch(LIST_USERS_FIRST, limit)
+        else:
+            rows = await self._pool.fetch(LIST_USERS_AFTER, after[0], after[1], limit)
+        return [UserSummary(row["id"], row["email"], row["created_at"]) for row in rows]
+
+    async def stream_users(
+        self, after: tuple[datetime, int] | None = None, prefetch: int = 1_000
+    ) -> AsyncIterator[UserSummary]:
+        """Yield every user after *after* through a server-side cursor.
+
+        Rows arrive *prefetch* at a time inside one read-only, repeatable-read
+        transaction, so memory is flat on both ends and the result is a
+        consistent snapshot.  The connection is held until the iterator is
+        exhausted or closed — use ``contextlib.aclosing``.
+        """
+        if after is None:
+            query, args = "SELECT id, email, created_at FROM users ORDER BY created_at, id", ()
+        else:
+            query = (
+                "SELECT id, email, created_at FROM users WHERE (created_at, id) > ($1, $2) "
+                "ORDER BY created_at, id"
+            )
+            args = after
+        async with self._pool.reader().acquire() as conn:
+            async with conn.transaction(isolation="repeatable_read", readonly=True):
+                async for row in conn.cursor(query, *args, prefetch=prefetch):
+                    yield UserSummary(row["id"], row["email"], row["created_at"])
+
     # ── Commands ──────────────────────────────────────────────────────
 
     async def create_user(self, email: str, password_hash: str) -> int:
@@ -40,9 +152,125 @@ class AuthRepository:
 
         Raises :class:`asyncpg.UniqueViolationError` if the email is taken.
         """
-        row = await self._pool.fetchrow(
-            "INSERT INTO users (email, password_hash) VALUES ($1, $2) RETURNING id",
-            email,
-            password_hash,
-        )
+        if self.outbox:
+            row = await self._pool.fetchrow(
+                INSERT_USER_WITH_EVENT, email, password_hash, auth_events.USER_REGISTERED
+            )
+        else:
+            row = await self._pool.fetchrow(INSERT_USER, email, password_hash)
+        self._pool.track_write(email)
         return row["id"]
+
+    async def create_users(self, users: list[tuple[str, str]]) -> dict[str, int]:
+        """Insert many ``(email, password_hash)`` rows in one statement.
+
+        Returns ``{email: id}`` for the rows that were inserted; emails that
+        were already taken are absent.  *users* must not repeat an email.
+        """
+        emails = [email for email, _ in users]
+        hashes = [password_hash for _, password_hash in users]
+        if self.outbox:
+            rows = await self._pool.fetch(
+                INSERT_USERS_WITH_EVENTS, emails, hashes, auth_events.USER_REGISTERED
+            )
+        else:
+            rows = await self._pool.fetch(INSERT_USERS, emails, hashes)
+        self._pool.track_write(*emails)
+        return {row["email"]: row["id"] for row in rows}
+
+    async def update_password_hash(
+        self, user_id: int, old_hash: str, new_hash: str
+    ) -> bool:
+        """Replace a user's password hash if it still equals *old_hash*.
+
+        Returns ``True`` if the row was updated.  The compare-and-set guards
+        against overwriting a concurrent password change.
+        """
+        status = await self._pool.execute(UPDATE_PASSWORD_HASH, user_id, old_hash, new_hash)
+        return status == "UPDATE 1"
+
+    # ── Refresh-token revocations ─────────────────────────────────────
+
+    async def revoke_refresh_token(
+        self, jti: str, user_id: int, expires_at: datetime, reason: str
+    ) -> bool:
+        """Record *jti* as consumed / revoked.
+
+        Returns ``False`` if it already was — i.e. the token is being replayed.
+        """
+        row = await self._pool.fetchrow(REVOKE_REFRESH_TOKEN, jti, user_id, expires_at, reason)
+        return row is not None
+
+    async def is_refresh_token_revoked(self, jti: str) -> bool:
+        row = await self._pool.fetchrow(IS_REFRESH_TOKEN_REVOKED, jti)
+        return row is not None
+
+    async def list_revoked_refresh_tokens(self) -> list[str]:
+        """Return every revoked ``jti`` whose token has not expired yet."""
+        rows = await self._pool.fetch(
+            "SELECT jti FROM refresh_token_revocations WHERE expires_at > NOW()"
+        )
+        return [row["jti"] for row in rows]
+
+    async def purge_expired_refresh_revocations(self) -> int:
+        """Delete rows for tokens that have expired anyway; return the count."""
+        status = await self._pool.execute(
+            "DELETE FROM refresh_token_revocations WHERE expires_at <= NOW()"
+        )
+        return int(status.split()[-1])
+
+    # ── Bulk import / export ──────────────────────────────────────────
+
+    async def bulk_import_users(self, records: Iterable[tuple[str, str]]) -> BulkImportResult:
+        """Insert ``(email, password_hash)`` rows with one ``COPY`` and one merge.
+
+        Rows are copied into a transaction-scoped staging table, then merged
+        into ``users`` with ``ON CONFLICT DO NOTHING``.  Emails that already
+        existed — or appear more than once in *records* — are returned as
+        duplicates instead of failing the batch.
+        """
+        async with self._pool.acquire() as conn, conn.transaction():
+            await conn.execute(
+                "CREATE TEMP TABLE users_import (email TEXT NOT NULL, password_hash TEXT NOT NULL) "
+                "ON COMMIT DROP"
+            )
+            copied = await conn.copy_records_to_table(
+                "users_import", records=records, columns=["email", "password_hash"]
+            )
+            # The first row per email (in input order) wins; everything that
+            # was not inserted is reported back.
+            rows = await conn.fetch("""
+                WITH inserted AS (
+                    INSERT INTO users (email, password_hash)
+                    SELECT DISTINCT ON (email) email, password_hash
+                    FROM users_import
+                    ORDER BY email, ctid
+                    ON CONFLICT (email) DO NOTHING
+                    RETURNING email
+                )
+                SELECT email FROM users_import
+                EXCEPT ALL
+                SELECT email FROM inserted
+            """)
+        duplicates = [row["email"] for row in rows]
+        return BulkImportResult(
+            inserted=int(copied.split()[-1]) - len(duplicates),
+            duplicates=duplicates,
+        )
+
+    async def export_users(self, output: Any, include_password_hash: bool = False) -> str:
+        """Stream every user to *output* as CSV via ``COPY TO``.
+
+        *output* is a path, a binary file-like object, or a coroutine
+        function called with each chunk — asyncpg streams chunks as they
+        arrive, so memory stays flat regardless of table size.  Returns the
+        ``COPY n`` status.  Runs on a read replica when one is healthy.
+        """
+        columns = "id, email, password_hash, created_at" if include_password_hash else "id, email, created_at"
+        async with self._pool.reader().acquire() as conn:
+            return await conn.copy_from_query(
+                f"SELECT {columns} FROM users ORDER BY id",
+                output=output,
+                format="csv",
+                header=True,
+            )
@@ -0,0 +1,105 @@
+"""Refresh-token revocation — durable table plus an in-memory fast path.
+
+Every refresh token carries a ``jti``.  Using a refresh token consumes it
+(a row in ``refresh_token_revocations``); logging out revokes it the same
+way.  The table is the source of truth — the consuming ``INSERT … ON
+CONFLICT DO NOTHING`` also catches a replay that raced in another worker.
+
+:class:`RevocationStore` keeps a Bloom filter of every live revoked ``jti``
+plus an exact set of the most recent ones, so the "is this token revoked?"
+check is answered in memory for almost every request:
+
+* Bloom miss    → definitely not revoked, no query.
+* recent hit    → definitely revoked, no query.
+* Bloom hit only → possibly a false positive; confirm with one ``SELECT``.
+
+The filter is rebuilt from the table at startup and updated incrementally
+as tokens are consumed or revoked.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import OrderedDict
+
+from config import settings
+from core.bloom import BloomFilter
+from modules.auth.repository import AuthRepository
+
+logger = logging.getLogger(__name__)
+
+
+class RevocationStore:
+    """In-memory view of revoked refresh-token ``jti`` values."""
+
+    def __init__(self, capacity: int, error_rate: float, recent_size: int) -> None:
+        self._capacity = capacity
+        self._error_rate = error_rate
+        self._recent_size = recent_size
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._recent: OrderedDict[str, None] = OrderedDict()
+
+        # ── Counters ──────────────────────────────────────────────────
+        self.memory_negative = 0
+        self.memory_positive = 0
+        self.db_checks = 0
+
+    # ── Lifecycle ─────────────────────────────────────────────────────
+
+    async def load(self, repo: AuthRepository) -> None:
+        """Purge expired rows and rebuild the filter from the table."""
+        purged = await repo.purge_expired_refresh_revocations()
+        jtis = await repo.list_revoked_refresh_tokens()
+        self._bloom = BloomFilter(max(self._capacity, 2 * len(jtis)), self._error_rate)
+        self._recent.clear()
+        for jti in jtis:
+            self._bloom.add(jti)
+        logger.info(
+            "Loaded %d revoked refresh tokens (%d expired purged, %d KiB filter)",
+            len(jtis), purged, self._bloom.size_bytes // 1024,
+        )
+
+    # ── Queries / updates ─────────────────────────────────────────────
+
+    def record(self, jti: str) -> None:
+        """Remember that *jti* has been consumed or revoked."""
+        self._bloom.add(jti)
+        self._recent[jti] = None
+        self._recent.move_to_end(jti)
+        if len(self._recent) > self._recent_size:
+            self._recent.popitem(last=False)
+        if self._bloom.count == self._bloom.capacity + 1:
+            logger.warning("Revocation filter over capacity — false positives will rise until restart")
+
+    async def is_revoked(self, jti: str, repo: AuthRepository) -> bool:
+        """True if *jti* has been consumed or revoked."""
+        if jti not in self._bloom:
+            self.memory_negative += 1
+            return False
+        if jti in self._recent:
+            self.memory_positive += 1
+            return True
+        self.db_checks += 1
+        revoked = await repo.is_refresh_token_revoked(jti)
+        if revoked:
+            self.record(jti)
+        return revoked
+
+    def stats(self) -> dict:
+        return {
+            "filter_items": self._bloom.count,
+            "filter_capacity": self._bloom.capacity,
+            "filter_bytes": self._bloom.size_bytes,
+            "recent": len(self._recent),
+            "memory_negative": self.memory_negative,
+            "memory_positive": self.memory_positive,
+            "db_checks": self.db_checks,
+        }
+
+
+# Singleton — loaded by the app lifespan
+revocation_store = RevocationStore(
+    capacity=settings.revocation_filter_capacity,
+    error_rate=settings.revocation_filter_error_rate,
+    recent_size=settings.revocation_recent_size,
+)
@@ -3,54 +3,109 @@
 No business logic here.  The router only knows about schemas and the service.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from contextlib import aclosing
+from typing import Annotated, AsyncIterator, Literal
 
-from core.database import get_pool
-from modules.auth.repository import AuthRepository
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+
+from container import container
+from core.dependencies import require_admin
+from core.responses import dumps, json_response
+from core.security import key_ring
+from modules.auth.models import UserSummary
 from modules.auth.schemas import (
     AuthRequest,
     MessageResponse,
     RefreshTokenRequest,
     TokenResponse,
+    UserListResponse,
     UserResponse,
 )
 from modules.auth.service import AuthService
+from modules.auth.throttle import login_throttle
 
 router = APIRouter(prefix="/api", tags=["auth"])
 
+# Wired in container.py — one shared service for every request
+AuthServiceDep = Annotated[AuthService, Depends(container.depends(AuthService))]
 
-def _get_service() -> AuthService:
-    """Build the service with its dependencies.
 
-    In a full DI setup this would come from a container; for now we wire
-    manually so the architecture is clear.
-    """
-    pool = get_pool()
-    repo = AuthRepository(pool)
-    return AuthService(repo)
+def _token_response(result: dict):
+    """A :class:`TokenResponse` body, serialised without a pydantic round trip."""
+    return json_response({
+        "access_token": result["access_token"],
+        "refresh_token": result["refresh_token"],
+        "token_type": "bearer",
+    })
 
 
 @router.post("/register", response_model=MessageResponse, status_code=201)
-async def register(body: AuthRequest):
-    service = _get_service()
+async def register(body: AuthRequest, service: AuthServiceDep):
     return await service.register(body.email, body.password)
 
 
 @router.post("/login", response_model=TokenResponse)
-async def login(body: AuthRequest):
-    service = _get_service()
+async def login(body: AuthRequest, request: Request, service: AuthServiceDep):
+    client_ip = request.client.host if request.client else ""
+    await login_throttle.check(body.email, client_ip)
     result = await service.login(body.email, body.password)
-    return TokenResponse(
-        access_token=result["access_token"],
-        refresh_token=result["refresh_token"]
-    )
+    return _token_response(result)
 
 
 @router.post("/refresh", response_model=TokenResponse)
-async def refresh(body: RefreshTokenRequest):
-    service = _get_service()
+async def refresh(body: RefreshTokenRequest, service: AuthServiceDep):
     result = await service.refresh(body.refresh_token)
-    return TokenResponse(
-        access_token=result["access_token"],
-        refresh_token=result["refresh_token"]
+    return _token_response(result)
+
+
+@router.post("/logout", response_model=MessageResponse)
+async def logout(body: RefreshTokenRequest, service: AuthServiceDep):
+    return await service.logout(body.refresh_token)
+
+
+@router.get("/.well-known/jwks.json")
+async def jwks():
+    """Public signing keys, so other services can verify tokens locally."""
+    return key_ring.jwks()
+
+
+async def _ndjson(users: AsyncIterator[UserSummary], chunk_size: int = 64 * 1024):
+    """Serialize *users* as NDJSON, sent in ~``chunk_size`` byte writes."""
+    async with aclosing(users):
+        lines: list[bytes] = []
+        size = 0
+        async for user in users:
+            line = dumps(
+                {"id": user.id, "email": user.email, "created_at": user.created_at.isoformat()}
+            ) + b"\n"
+            lines.append(line)
+            size += len(line)
+            if size >= chunk_size:
+                yield b"".join(lines)
+                lines, size = [], 0
+        if lines:
+            yield b"".join(lines)
+
+
+@router.get("/users", response_model=UserListResponse)
+async def list_users(
+    _admin: Annotated[dict, Depends(require_admin)],
+    service: AuthServiceDep,
+    limit: Annotated[int, Query(ge=1, le=1000)] = 100,
+    cursor: str | None = None,
+    format: Literal["json", "ndjson"] = "json",
+):
+    """List users by ``(created_at, id)`` — one page, or everything as NDJSON."""
+    if format == "ndjson":
+        return StreamingResponse(
+            _ndjson(service.stream_users(cursor)), media_type="application/x-ndjson"
+        )
+    page = await service.list_users(limit, cursor)
+    return UserListResponse(
+        items=[
+            UserResponse(id=u.id, email=u.email, created_at=u.created_at)
+            for u in page["items"]
+        ],
+        next_cursor=page["next_cursor"],
     )
@@ -1,5 +1,7 @@
 """Pydantic request / response schemas for the auth module."""
 
+from datetime import datetime
+
 from pydantic import BaseModel, EmailStr
 
 
@@ -29,3 +31,9 @@ class TokenResponse(BaseModel):
 class UserResponse(BaseModel):
     id: int
     email: str
+    created_at: datetime | None = None
+
+
+class UserListResponse(BaseModel):
+    items: list[UserResponse]
+    next_cursor: str | None = None  # pass back as ?cursor= for the next page
@@ -5,25 +5,64 @@ Pure Python — no HTTP or SQL.  Receives plain objects, returns domain models.
 
 from __future__ import annotations
 
+import base64
+import binascii
+import logging
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator
+
 import asyncpg
+import jwt
 
 from core.events import event_bus
 from core.security import (
-    create_access_token,
-    create_refresh_token,
-    hash_password,
-    verify_password,
+    create_token_pair,
+    hash_password_async,
+    needs_rehash,
+    verify_password_async,
+    verify_token,
 )
+from core.timing import span
 from modules.auth import events as auth_events
-from modules.auth.exceptions import EmailAlreadyRegistered, InvalidCredentials
+from modules.auth.exceptions import (
+    EmailAlreadyRegistered,
+    InvalidCredentials,
+    InvalidCursor,
+    RefreshTokenReused,
+)
+from modules.auth.models import User, UserSummary
 from modules.auth.repository import AuthRepository
+from modules.auth.revocation import RevocationStore, revocation_store
+
+logger = logging.getLogger(__name__)
+
+
+def encode_cursor(user: UserSummary) -> str:
+    """Opaque keyset cursor pointing just past *user*."""
+    raw = f"{user.created_at.isoformat()}|{user.id}".encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Inverse of :func:`encode_cursor`.  Raises :class:`InvalidCursor`."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, user_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(user_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursor()
 
 
 class AuthService:
     """Orchestrates authentication use cases."""
 
-    def __init__(self, repo: AuthRepository) -> None:
+    def __init__(
+        self,
+        repo: AuthRepository,
+        revocations: RevocationStore = revocation_store,
+    ) -> None:
         self._repo = repo
+        self._revocations = revocations
 
     # ── Use cases ─────────────────────────────────────────────────────
 
@@ -33,18 +72,21 @@ class AuthService:
         Returns a dict with ``message`` on success.
         Raises :class:`EmailAlreadyRegistered` if the email is taken.
         """
-        hashed = hash_password(password)
+        hashed = await hash_password_async(password)
 
         try:
             user_id = await self._repo.create_user(email, hashed)
         except asyncpg.UniqueViolationError:
             raise EmailAlreadyRegistered()
 
-        # Fire-and-forget domain event
-        await event_bus.publish(
-            auth_events.USER_REGISTERED,
-            {"user_id": user_id, "email": email},
-        )
+        # Fire-and-forget domain event — unless the repository already
+        # wrote it to the outbox in the same statement as the user.
+        if not self._repo.outbox:
+            with span("events"):
+                await event_bus.publish(
+                    auth_events.USER_REGISTERED,
+                    {"user_id": user_id, "email": email},
+                )
 
         return {"message": "Account created"}
 
@@ -56,18 +98,22 @@ class AuthService:
         """
         user = await self._repo.get_by_email(email)
 
-        if user is None or not verify_password(password, user.password_hash):
+        if user is None or not await verify_password_async(password, user.password_hash):
             raise InvalidCredentials()
 
+        if needs_rehash(user.password_hash):
+            await self._rehash(user, password)
+
         # Generate JWT tokens
         token_data = {"sub": str(user.id), "email": user.email}
-        access_token = create_access_token(token_data)
-        refresh_token = create_refresh_token(token_data)
+        access_token, refresh_token = create_token_pair(token_data)
 
-        await event_bus.publish(
-            auth_events.USER_LOGGED_IN,
-            {"user_id": user.id, "email": user.email},
-        )
+        # Can wait under event-bus backpressure — worth its own phase
+        with span("events"):
+            await event_bus.publish(
+                auth_events.USER_LOGGED_IN,
+                {"user_id": user.id, "email": user.email},
+            )
 
         return {
             "access_token": access_token,
@@ -76,26 +122,91 @@ class AuthService:
         }
 
     async def refresh(self, refresh_token: str) -> dict:
-        """Refresh access token using a valid refresh token.
+        """Rotate a refresh token: consume it and issue a new pair.
 
         Returns new access and refresh tokens.
-        Raises jwt.PyJWTError if token is invalid or expired.
+        Raises :class:`InvalidCredentials` if the token is invalid or expired,
+        and :class:`RefreshTokenReused` if it was already consumed or revoked.
         """
-        from core.security import verify_token
-        
-        payload = verify_token(refresh_token)
-        if payload.get("type") != "refresh":
-            raise InvalidCredentials()
-
-        user_id = int(payload.get("sub"))
-        email = payload.get("email")
+        payload = self._decode_refresh_token(refresh_token)
+        user_id = int(payload["sub"])
+        jti = payload["jti"]
+
+        if await self._revocations.is_revoked(jti, self._repo):
+            raise RefreshTokenReused()
+        consumed = await self._repo.revoke_refresh_token(
+            jti, user_id, datetime.fromtimestamp(payload["exp"], timezone.utc), "rotated"
+        )
+        self._revocations.record(jti)
+        if not consumed:
+            # Lost the race against a concurrent use (possibly another worker).
+            raise RefreshTokenReused()
 
         # Generate new tokens
-        token_data = {"sub": str(user_id), "email": email}
-        access_token = create_access_token(token_data)
-        new_refresh_token = create_refresh_token(token_data)
+        token_data = {"sub": str(user_id), "email": payload.get("email")}
+        access_token, new_refresh_token = create_token_pair(token_data)
 
         return {
             "access_token": access_token,
             "refresh_token": new_refresh_token,
         }
+
+    async def logout(self, refresh_token: str) -> dict:
+        """Revoke a refresh token.  Idempotent.
+
+        Raises :class:`InvalidCredentials` if the token is invalid or expired.
+        """
+        payload = self._decode_refresh_token(refresh_token)
+        await self._repo.revoke_refresh_token(
+            payload["jti"],
+            int(payload["sub"]),
+            datetime.fromtimestamp(payload["exp"], timezone.utc),
+            "logout",
+        )
+        self._revocations.record(payload["jti"])
+        return {"message": "Logged out"}
+
+    async def list_users(self, limit: int, cursor: str | None = None) -> dict:
+        """Return one page of users and the cursor for the next, if any."""
+        after = decode_cursor(cursor) if cursor else None
+        # One extra row tells us whether another page exists.
+        users = await self._repo.list_users(limit + 1, after)
+        next_cursor = encode_cursor(users[limit - 1]) if len(users) > limit else None
+        return {"items": users[:limit], "next_cursor": next_cursor}
+
+    def stream_users(self, cursor: str | None = None) -> AsyncIterator[UserSummary]:
+        """Every user after *cursor*, streamed from a server-side cursor."""
+        after = decode_cursor(cursor) if cursor else None
+        return self._repo.stream_users(after)
+
+    # ── Helpers ───────────────────────────────────────────────────────
+
+    @staticmethod
+    def _decode_refresh_token(token: str) -> dict[str, Any]:
+        """Verify *token* and require a refresh token with ``sub`` and ``jti``."""
+        try:
+            payload = verify_token(token)
+        except jwt.PyJWTError:
+            raise InvalidCredentials()
+        if payload.get("type") != "refresh" or "jti" not in payload or "sub" not in payload:
+            raise InvalidCredentials()
+        return payload
+
+    async def _rehash(self, user: User, password: str) -> None:
+        """Upgrade a stored hash to the configured scheme / cost.
+
+        Best effort — a failure here must not fail an otherwise valid login.
+        """
+        try:
+            new_hash = await hash_password_async(password)
+            updated = await self._repo.update_password_hash(
+                user.id, user.password_hash, new_hash
+            )
+        except Exception:
+            logger.exception("Password rehash failed for user %s", user.id)
+            return
+        if updated:
+            await event_bus.publish(
+                auth_events.USER_PASSWORD_CHANGED,
+                {"user_id": user.id, "email": user.email},
+            )
@@ -0,0 +1,56 @@
+"""Login throttling — sheds credential-stuffing traffic before any hash or query.
+
+Two independent limiters: one keyed by the (normalised) email, one by
+client IP.  A login must pass both.  Called by the router before the
+service runs, so rejected attempts never reach the database or the hash
+pool.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+from config import settings
+from core.exceptions import TooManyRequestsError
+from core.rate_limit import RateLimiter
+
+
+class LoginThrottle:
+    """Per-email and per-IP token buckets with progressive delays."""
+
+    def __init__(self, by_email: RateLimiter, by_ip: RateLimiter) -> None:
+        self.by_email = by_email
+        self.by_ip = by_ip
+
+    async def check(self, email: str, client_ip: str) -> None:
+        """Wait out any progressive delay, or raise :class:`TooManyRequestsError`."""
+        by_ip = self.by_ip.hit(client_ip)
+        if not by_ip.allowed:
+            raise TooManyRequestsError(by_ip.retry_after, "Too many login attempts")
+        by_email = self.by_email.hit(email.strip().lower())
+        if not by_email.allowed:
+            raise TooManyRequestsError(by_email.retry_after, "Too many login attempts")
+
+        delay = max(by_ip.delay, by_email.delay)
+        if delay:
+            await asyncio.sleep(delay)
+
+    def stats(self) -> dict:
+        return {"email": self.by_email.stats(), "ip": self.by_ip.stats()}
+
+
+def _limiter(per_minute: float, burst: int) -> RateLimiter:
+    return RateLimiter(
+        per_minute / 60,
+        burst,
+        max_keys=settings.login_throttle_max_keys,
+        delay_base=settings.login_throttle_delay_base_ms / 1000,
+        delay_max=settings.login_throttle_delay_max_ms / 1000,
+    )
+
+
+# Singleton — shared by every request in this process
+login_throttle = LoginThrottle(
+    by_email=_limiter(settings.login_email_per_minute, settings.login_email_burst),
+    by_ip=_limiter(settings.login_ip_per_minute, settings.login_ip_burst),
+)
@@ -1,12 +1,16 @@
 """Tests for modules/auth/service.py."""
 
+from datetime import datetime, timezone
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
+from core.events import event_bus
 from core.security import hash_password
-from modules.auth.exceptions import EmailAlreadyRegistered, InvalidCredentials
-from modules.auth.repository import AuthRepository
+from modules.auth import events as auth_events
+from modules.auth.exceptions import EmailAlreadyRegistered, InvalidCredentials, InvalidCursor
+from modules.auth.models import UserSummary
+from modules.auth.repository import INSERT_USER_WITH_EVENT, AuthRepository
 from modules.auth.service import AuthService
 
 
@@ -40,6 +44,23 @@ class TestAuthServiceRegister:
         with pytest.raises(EmailAlreadyRegistered):
             await service.register("existing@example.com", "password123")
 
+    @pytest.mark.asyncio
+    async def test_register_with_outbox_writes_event_in_same_statement(
+        self, mock_pool: MagicMock, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """With the outbox on, the event is inserted with the user, not published."""
+        publish = AsyncMock()
+        monkeypatch.setattr(event_bus, "publish", publish)
+        mock_pool.fetchrow = AsyncMock(return_value={"id": 1})
+        service = AuthService(AuthRepository(mock_pool, outbox=True))
+
+        await service.register("new@example.com", "password123")
+
+        query, *args = mock_pool.fetchrow.call_args.args
+        assert query is INSERT_USER_WITH_EVENT
+        assert args[2] == auth_events.USER_REGISTERED
+        publish.assert_not_awaited()
+
 
 class TestAuthServiceLogin:
     """Tests for the login method."""
@@ -127,3 +148,143 @@ class TestAuthServiceRefresh:
 
         with pytest.raises(InvalidCredentials):
             await service.refresh(access_token)
+
+
+class TestAuthServiceRehash:
+    """Tests for transparent password rehash on login."""
+
+    @staticmethod
+    def _service_for(password_hash: str) -> tuple[AuthService, MagicMock]:
+        from datetime import datetime, timezone
+
+        from modules.auth.models import User
+
+        repo = MagicMock(spec=AuthRepository)
+        repo.get_by_email = AsyncMock(return_value=User(
+            id=1,
+            email="test@example.com",
+            password_hash=password_hash,
+            created_at=datetime.now(timezone.utc),
+        ))
+        repo.update_password_hash = AsyncMock(return_value=True)
+        return AuthService(repo), repo
+
+    @pytest.mark.asyncio
+    async def test_login_rehashes_legacy_hash(self) -> None:
+        """A legacy hash should be upgraded after a successful login."""
+        legacy_hash = hash_password("password123", scheme="legacy-sha256")
+        service, repo = self._service_for(legacy_hash)
+
+        await service.login("test@example.com", "password123")
+
+        repo.update_password_hash.assert_awaited_once()
+        user_id, old_hash, new_hash = repo.update_password_hash.await_args.args
+        assert (user_id, old_hash) == (1, legacy_hash)
+        assert new_hash.startswith("$scrypt$")
+
+    @pytest.mark.asyncio
+    async def test_login_keeps_current_hash(self) -> None:
+        """A hash in the configured scheme should not be rewritten."""
+        service, repo = self._service_for(hash_password("password123"))
+
+        await service.login("test@example.com", "password123")
+
+        repo.update_password_hash.assert_not_awaited()
+
+
+class TestAuthServiceRefreshRotation:
+    """Tests for refresh-token rotation and revocation."""
+
+    @pytest.fixture
+    def store(self):
+        from modules.auth.revocation import RevocationStore
+
+        return RevocationStore(capacity=1000, error_rate=0.01, recent_size=100)
+
+    @pytest.fixture
+    def service(self, mock_pool: MagicMock, store) -> AuthService:
+        return AuthService(AuthRepository(mock_pool), revocations=store)
+
+    @pytest.mark.asyncio
+    async def test_refresh_token_cannot_be_reused(
+        self, service: AuthService, mock_pool: MagicMock
+    ) -> None:
+        """A consumed refresh token should be rejected without a DB round trip."""
+        from core.security import create_refresh_token
+        from modules.auth.exceptions import RefreshTokenReused
+
+        token = create_refresh_token({"sub": "123", "email": "test@example.com"})
+        await service.refresh(token)
+        mock_pool.fetchrow.reset_mock()
+
+        with pytest.raises(RefreshTokenReused):
+            await service.refresh(token)
+        mock_pool.fetchrow.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_refresh_rejected_when_consumed_elsewhere(
+        self, service: AuthService, mock_pool: MagicMock
+    ) -> None:
+        """If the consuming insert conflicts, the token was already used."""
+        from core.security import create_refresh_token
+        from modules.auth.exceptions import RefreshTokenReused
+
+        mock_pool.fetchrow = AsyncMock(return_value=None)
+        token = create_refresh_token({"sub": "123", "email": "test@example.com"})
+
+        with pytest.raises(RefreshTokenReused):
+            await service.refresh(token)
+
+    @pytest.mark.asyncio
+    async def test_refresh_rotates_jti(self, service: AuthService) -> None:
+        """The new refresh token should carry a different jti."""
+        from core.security import create_refresh_token, verify_token
+
+        token = create_refresh_token({"sub": "123", "email": "test@example.com"})
+        result = await service.refresh(token)
+
+        assert verify_token(result["refresh_token"])["jti"] != verify_token(token)["jti"]
+
+    @pytest.mark.asyncio
+    async def test_logout_revokes_token(self, service: AuthService) -> None:
+        """A logged-out refresh token should no longer refresh."""
+        from core.security import create_refresh_token
+        from modules.auth.exceptions import RefreshTokenReused
+
+        token = create_refresh_token({"sub": "123", "email": "test@example.com"})
+        assert await service.logout(token) == {"message": "Logged out"}
+
+        with pytest.raises(RefreshTokenReused):
+            await service.refresh(token)
+
+    @pytest.mark.asyncio
+    async def test_refresh_with_garbage_token(self, service: AuthService) -> None:
+        """An unparseable token should be rejected as invalid credentials."""
+        with pytest.raises(InvalidCredentials):
+            await service.refresh("not-a-jwt")
+
+
+class TestAuthServiceListUsers:
+    """Tests for keyset-paginated user listing."""
+
+    @pytest.mark.asyncio
+    async def test_pages_chain_through_cursor(self, mock_pool: MagicMock) -> None:
+        """A full page should return a cursor that resumes after its last row."""
+        created = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        users = [UserSummary(i, f"u{i}@example.com", created) for i in range(1, 4)]
+        repo = MagicMock(spec=AuthRepository)
+        repo.list_users = AsyncMock(side_effect=[users, users[2:]])
+        service = AuthService(repo)
+
+        first = await service.list_users(2)
+        assert first["items"] == users[:2]
+        second = await service.list_users(2, first["next_cursor"])
+
+        repo.list_users.assert_awaited_with(3, (created, 2))
+        assert second == {"items": users[2:], "next_cursor": None}
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor(self, mock_pool: MagicMock) -> None:
+        service = AuthService(AuthRepository(mock_pool))
+        with pytest.raises(InvalidCursor):
+            await service.list_users(10, "not-a-cursor")
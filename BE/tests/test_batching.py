@@ -0,0 +1,77 @@
+"""Tests for core/batching.py and modules/auth/batching.py - registration coalescing."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from core.batching import MicroBatcher
+from modules.auth.batching import BatchingAuthRepository, insert_batch
+from modules.auth.exceptions import EmailAlreadyRegistered
+from modules.auth.repository import AuthRepository
+
+
+class TestMicroBatcher:
+    """Tests for MicroBatcher."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_submits_share_one_flush(self) -> None:
+        """Calls inside the window should reach flush together, results in order."""
+        flush = AsyncMock(side_effect=lambda items: [i * 10 for i in items])
+        batcher = MicroBatcher(flush, max_size=100, window=0.01)
+
+        results = await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+
+        assert results == [0, 10, 20, 30, 40]
+        flush.assert_awaited_once_with([0, 1, 2, 3, 4])
+
+    @pytest.mark.asyncio
+    async def test_max_size_flushes_early(self) -> None:
+        flush = AsyncMock(side_effect=lambda items: items)
+        batcher = MicroBatcher(flush, max_size=2, window=10)
+
+        assert await asyncio.gather(*(batcher.submit(i) for i in range(4))) == [0, 1, 2, 3]
+        assert batcher.stats()["batches"] == 2
+
+    @pytest.mark.asyncio
+    async def test_per_item_exception_and_batch_failure(self) -> None:
+        """An exception result fails one caller; a raising flush fails all."""
+        batcher = MicroBatcher(AsyncMock(return_value=[1, ValueError("taken")]), window=0.001)
+        ok, bad = await asyncio.gather(batcher.submit("a"), batcher.submit("b"), return_exceptions=True)
+        assert ok == 1 and isinstance(bad, ValueError)
+
+        batcher = MicroBatcher(AsyncMock(side_effect=ConnectionError()), window=0.001)
+        results = await asyncio.gather(batcher.submit("a"), batcher.submit("b"), return_exceptions=True)
+        assert all(isinstance(r, ConnectionError) for r in results)
+
+
+class TestRegistrationBatching:
+    """Tests for insert_batch and BatchingAuthRepository."""
+
+    @pytest.mark.asyncio
+    async def test_insert_batch_maps_ids_and_conflicts(self) -> None:
+        """Taken emails and repeats within the batch should be reported per caller."""
+        repo = MagicMock(spec=AuthRepository)
+        repo.create_users = AsyncMock(return_value={"a@example.com": 7})
+
+        results = await insert_batch(
+            repo, [("a@example.com", "h1"), ("b@example.com", "h2"), ("a@example.com", "h3")]
+        )
+
+        repo.create_users.assert_awaited_once_with([("a@example.com", "h1"), ("b@example.com", "h2")])
+        assert results[0] == 7
+        assert isinstance(results[1], EmailAlreadyRegistered)
+        assert isinstance(results[2], EmailAlreadyRegistered)
+
+    @pytest.mark.asyncio
+    async def test_repository_raises_for_taken_email(self) -> None:
+        repo = MagicMock(spec=AuthRepository)
+        repo.create_users = AsyncMock(return_value={"new@example.com": 3})
+        batching = BatchingAuthRepository(
+            repo, MicroBatcher(lambda users: insert_batch(repo, users), window=0.001)
+        )
+
+        assert await batching.create_user("new@example.com", "h") == 3
+        repo.create_users.return_value = {}
+        with pytest.raises(EmailAlreadyRegistered):
+            await batching.create_user("new@example.com", "h")
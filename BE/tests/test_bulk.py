@@ -0,0 +1,67 @@
+"""Tests for modules/auth/bulk.py - bulk user import pipeline."""
+
+import io
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from core.passwords import verify_password
+from modules.auth.bulk import import_users, read_rows
+from modules.auth.repository import AuthRepository, BulkImportResult
+
+
+class TestReadRows:
+    """Tests for read_rows."""
+
+    def test_csv(self) -> None:
+        stream = io.StringIO("email,password\na@example.com,secret\n")
+        assert list(read_rows(stream, "csv")) == [{"email": "a@example.com", "password": "secret"}]
+
+    def test_ndjson_skips_blank_lines(self) -> None:
+        stream = io.StringIO('{"email": "a@example.com", "password_hash": "h"}\n\n')
+        assert list(read_rows(stream, "ndjson")) == [{"email": "a@example.com", "password_hash": "h"}]
+
+
+class TestImportUsers:
+    """Tests for import_users."""
+
+    @pytest.mark.asyncio
+    async def test_chunks_hashes_and_reports(self) -> None:
+        """Rows should be loaded per chunk, with plain passwords hashed and bad rows skipped."""
+        repo = MagicMock(spec=AuthRepository)
+        repo.bulk_import_users = AsyncMock(
+            side_effect=[BulkImportResult(2, []), BulkImportResult(0, ["c@example.com"])]
+        )
+        rows = [
+            {"email": "a@example.com", "password": "secret"},
+            {"email": " b@Example.COM ", "password_hash": "stored"},
+            {"email": "", "password": "x"},
+            {"email": "c@example.com", "password_hash": "stored"},
+        ]
+        duplicates = io.StringIO()
+
+        stats = await import_users(repo, rows, chunk_size=3, workers=1, duplicates_out=duplicates)
+
+        first, second = (call.args[0] for call in repo.bulk_import_users.await_args_list)
+        assert ("b@example.com", "stored") in first
+        (email, digest), = [r for r in first if r[0] == "a@example.com"]
+        assert verify_password("secret", digest)
+        assert second == [("c@example.com", "stored")]
+        assert (stats.read, stats.inserted, stats.duplicates, stats.invalid) == (4, 2, 1, 1)
+        assert duplicates.getvalue() == "c@example.com\n"
+
+    @pytest.mark.asyncio
+    async def test_emails_validated_like_registration(self) -> None:
+        """Domains are lowercased as EmailStr does; malformed addresses are skipped."""
+        repo = MagicMock(spec=AuthRepository)
+        repo.bulk_import_users = AsyncMock(return_value=BulkImportResult(1, []))
+        rows = [
+            {"email": "Foo@Example.COM", "password_hash": "h"},
+            {"email": "not-an-email", "password_hash": "h"},
+            {"email": "a@@b", "password_hash": "h"},
+        ]
+
+        stats = await import_users(repo, rows, workers=1)
+
+        repo.bulk_import_users.assert_awaited_once_with([("Foo@example.com", "h")])
+        assert stats.invalid == 2
@@ -0,0 +1,123 @@
+"""Tests for core/container.py - dependency-injection container."""
+
+from typing import Annotated
+
+import pytest
+from fastapi import Depends, FastAPI
+
+from core.container import Container
+
+
+class _Thing:
+    def __init__(self, *deps: object) -> None:
+        self.deps = deps
+
+
+async def _get(app: FastAPI, path: str) -> bytes:
+    """One GET through the ASGI app; returns the response body."""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+        "query_string": b"", "headers": [], "client": ("127.0.0.1", 1), "server": ("t", 80),
+    }
+    body = b""
+
+    async def receive() -> dict:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict) -> None:
+        nonlocal body
+        if message["type"] == "http.response.body":
+            body += message.get("body", b"")
+
+    await app(scope, receive, send)
+    return body
+
+
+class TestLifetimes:
+    """Tests for singleton / scoped / transient resolution."""
+
+    def test_lifetimes(self) -> None:
+        c = Container()
+        c.singleton("config", dict)
+        c.scoped("uow", _Thing, deps=["config"])
+        c.transient("handler", _Thing, deps=["uow"])
+
+        scope: dict = {}
+        first, second = c.resolve("handler", scope), c.resolve("handler", scope)
+
+        assert first is not second  # transient
+        assert first.deps[0] is second.deps[0]  # same scoped instance in one scope
+        assert c.resolve("uow", {}) is not first.deps[0]  # new scope, new instance
+        assert c.resolve("uow", {}).deps[0] is c.resolve("config")  # singleton
+
+    def test_unknown_key_and_async_scoped_rejected(self) -> None:
+        c = Container()
+        with pytest.raises(LookupError):
+            c.resolve("missing")
+
+        async def make() -> object:
+            return object()
+
+        with pytest.raises(TypeError):
+            c.scoped("x", make)
+
+    @pytest.mark.asyncio
+    async def test_startup_awaits_and_shutdown_reverses(self) -> None:
+        c = Container()
+        events: list[str] = []
+
+        async def open_pool() -> str:
+            events.append("open pool")
+            return "pool"
+
+        c.singleton("pool", open_pool, shutdown=lambda p: events.append(f"close {p}"))
+        c.singleton("repo", _Thing, deps=["pool"], shutdown=lambda r: events.append("close repo"))
+
+        with pytest.raises(RuntimeError):
+            c.resolve("pool")  # async factory, not started
+        await c.startup()
+        assert c.resolve("repo").deps == ("pool",)
+        await c.shutdown()
+
+        assert events == ["open pool", "close repo", "close pool"]
+
+    def test_override(self) -> None:
+        c = Container()
+        c.singleton("repo", _Thing)
+        real = c.resolve("repo")
+
+        with c.override("repo", "fake"):
+            assert c.resolve("repo") == "fake"
+        assert c.resolve("repo") is real
+
+
+class TestDepends:
+    """Tests for the FastAPI integration."""
+
+    @pytest.mark.asyncio
+    async def test_scoped_is_shared_within_a_request_only(self) -> None:
+        c = Container()
+        c.scoped("uow", _Thing)
+        c.transient("handler", _Thing, deps=["uow"])
+        c.singleton("service", _Thing)
+        assert c.depends("uow") is c.depends("uow")
+        app = FastAPI()
+        seen: list[tuple[_Thing, _Thing, _Thing]] = []
+
+        @app.get("/ids")
+        async def ids(
+            uow: Annotated[_Thing, Depends(c.depends("uow"))],
+            handler: Annotated[_Thing, Depends(c.depends("handler"))],
+            service: Annotated[_Thing, Depends(c.depends("service"))],
+        ):
+            seen.append((uow, handler, service))
+            return {}
+
+        await _get(app, "/ids")
+        await _get(app, "/ids")
+
+        (uow1, handler1, service1), (uow2, handler2, service2) = seen
+        assert handler1.deps[0] is uow1 and handler2.deps[0] is uow2
+        assert uow1 is not uow2
+        assert service1 is service2
@@ -0,0 +1,307 @@
+"""Tests for core/database.py - statements, prepared connections, pools and routing."""
+
+from unittest.mock import ANY, AsyncMock, MagicMock
+
+import asyncio
+
+import pytest
+
+from core.database import (
+    Connection,
+    InstrumentedPool,
+    REPLICA_LAG_SQL,
+    QueryMetrics,
+    RoutingPool,
+    Statement,
+    StatementRegistry,
+    normalize_sql,
+    query_metrics,
+)
+from core.deadline import DeadlineExceeded, deadline_scope
+
+
+class _BareConnection(Connection):
+    """A Connection with no socket — only the prepared-statement layer is used."""
+
+    def __del__(self) -> None:
+        pass
+
+
+def _connection() -> Connection:
+    conn = _BareConnection.__new__(_BareConnection)
+    conn._prepared = {}
+    return conn
+
+
+class TestStatementRegistry:
+    """Tests for StatementRegistry."""
+
+    def test_statement_is_plain_sql(self) -> None:
+        """A registered statement should still be usable as SQL text."""
+        registry = StatementRegistry()
+        stmt = registry.register("t.one", "SELECT 1")
+
+        assert stmt == "SELECT 1"
+        assert isinstance(stmt, str)
+        assert stmt.name == "t.one"
+        assert list(registry) == [stmt]
+
+    def test_conflicting_registration_rejected(self) -> None:
+        """Re-registering a name with different SQL is a bug."""
+        registry = StatementRegistry()
+        registry.register("t.one", "SELECT 1")
+        registry.register("t.one", "SELECT 1")
+
+        with pytest.raises(ValueError):
+            registry.register("t.one", "SELECT 2")
+
+
+class TestPreparedConnection:
+    """Tests for Connection's prepared-statement routing."""
+
+    @pytest.mark.asyncio
+    async def test_statement_prepared_once_and_reused(self) -> None:
+        """A Statement should be prepared on first use and reused afterwards."""
+        ps = MagicMock()
+        ps.fetchrow = AsyncMock(return_value={"id": 1})
+        conn = _connection()
+        conn.prepare = AsyncMock(return_value=ps)
+        stmt = Statement("t.get", "SELECT id FROM t WHERE id = $1")
+
+        assert await conn.fetchrow(stmt, 1) == {"id": 1}
+        assert await conn.fetchrow(stmt, 2) == {"id": 1}
+
+        conn.prepare.assert_awaited_once_with(stmt)
+        assert ps.fetchrow.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_execute_returns_status(self) -> None:
+        """execute() on a Statement should return the command status."""
+        ps = MagicMock()
+        ps.fetch = AsyncMock(return_value=[])
+        ps.get_statusmsg = MagicMock(return_value="UPDATE 1")
+        conn = _connection()
+        conn.prepare = AsyncMock(return_value=ps)
+
+        status = await conn.execute(Statement("t.upd", "UPDATE t SET x = $1"), 5)
+
+        assert status == "UPDATE 1"
+        ps.fetch.assert_awaited_once_with(5, timeout=None)
+
+
+def _pool(name: str, busy: int = 0) -> MagicMock:
+    p = MagicMock(name=name)
+    p.fetchrow = AsyncMock(return_value=name)
+    p.fetchval = AsyncMock(return_value=0.0)
+    p.get_size = MagicMock(return_value=10)
+    p.get_idle_size = MagicMock(return_value=10 - busy)
+    return p
+
+
+READ = Statement("t.read", "SELECT * FROM t WHERE k = $1", readonly=True)
+WRITE = Statement("t.write", "INSERT INTO t (k) VALUES ($1) RETURNING k")
+
+
+class TestRoutingPool:
+    """Tests for RoutingPool."""
+
+    @pytest.mark.asyncio
+    async def test_reads_go_to_replicas_round_robin(self) -> None:
+        """Readonly statements should alternate replicas; writes hit the primary."""
+        pool = RoutingPool(_pool("primary"), [_pool("r1"), _pool("r2")])
+
+        assert [await pool.fetchrow(READ, i) for i in range(3)] == ["r1", "r2", "r1"]
+        assert await pool.fetchrow(WRITE, 1) == "primary"
+        assert await pool.fetchrow("SELECT 1") == "primary"
+
+    def test_least_busy_selection(self) -> None:
+        busy, idle = _pool("busy", busy=8), _pool("idle", busy=1)
+        pool = RoutingPool(_pool("primary"), [busy, idle], selection="least_busy")
+
+        assert pool.reader() is idle
+
+    @pytest.mark.asyncio
+    async def test_read_your_writes_pins_key_to_primary(self) -> None:
+        """A key written by this process should be read from the primary."""
+        pool = RoutingPool(_pool("primary"), [_pool("r1")], read_your_writes=60)
+        pool.track_write("a@example.com")
+
+        assert await pool.fetchrow(READ, "a@example.com") == "primary"
+        assert await pool.fetchrow(READ, "b@example.com") == "r1"
+        assert pool.stats()["pinned_reads"] == 1
+
+    @pytest.mark.asyncio
+    async def test_lagging_or_down_replicas_fall_back_to_primary(self) -> None:
+        """Replicas over the lag limit or failing the check leave rotation."""
+        lagging, down = _pool("lagging"), _pool("down")
+        lagging.fetchval = AsyncMock(return_value=5.0)
+        down.fetchval = AsyncMock(side_effect=OSError("connection refused"))
+        pool = RoutingPool(_pool("primary"), [lagging, down], max_lag=1.0)
+
+        await pool.check_replicas()
+
+        assert pool.lag == [5.0, None]
+        assert await pool.fetchrow(READ, 1) == "primary"
+
+        lagging.fetchval = AsyncMock(return_value=0.2)
+        await pool.check_replicas()
+        assert await pool.fetchrow(READ, 1) == "lagging"
+
+    @pytest.mark.asyncio
+    async def test_replica_without_wal_receiver_leaves_rotation(self) -> None:
+        """A disconnected standby reports no lag (NULL), not a stale 0."""
+        stale = _pool("stale")
+        stale.fetchval = AsyncMock(return_value=None)
+        pool = RoutingPool(_pool("primary"), [stale], max_lag=1.0)
+
+        await pool.check_replicas()
+
+        stale.fetchval.assert_awaited_once_with(REPLICA_LAG_SQL, timeout=ANY)
+        assert "pg_stat_wal_receiver" in REPLICA_LAG_SQL
+        assert pool.lag == [None]
+        assert await pool.fetchrow(READ, 1) == "primary"
+
+
+def _instrumented(**kwargs) -> InstrumentedPool:
+    p = InstrumentedPool("test", 2, 8, **kwargs)
+    conn = MagicMock()
+    conn.fetchval = AsyncMock(return_value=1)
+    p.pool = MagicMock()
+    p.pool.acquire = AsyncMock(return_value=conn)
+    p.pool.release = AsyncMock()
+    return p
+
+
+class TestInstrumentedPool:
+    """Tests for InstrumentedPool."""
+
+    @pytest.mark.asyncio
+    async def test_acquire_records_wait_and_in_use(self) -> None:
+        p = _instrumented()
+
+        async with p.acquire():
+            assert p.stats()["in_use"] == 1
+        assert await p.fetchval("SELECT 1") == 1
+
+        stats = p.stats()
+        assert stats["acquires"] == 2
+        assert stats["in_use"] == 0
+        assert stats["acquire_wait_seconds"]["count"] == 2
+        assert p.pool.release.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_limit_queues_callers_beyond_it(self) -> None:
+        """With an adaptive pool at its minimum, a third caller waits for a release."""
+        p = _instrumented(adaptive=True)
+        assert p.limit == 2
+        release = asyncio.Event()
+
+        async def hold() -> None:
+            async with p.acquire():
+                await release.wait()
+
+        holders = [asyncio.create_task(hold()) for _ in range(3)]
+        await asyncio.sleep(0)
+        assert (p.stats()["in_use"], p.stats()["waiting"]) == (2, 1)
+
+        release.set()
+        await asyncio.gather(*holders)
+        assert p.stats()["in_use"] == 0
+
+    @pytest.mark.asyncio
+    async def test_acquire_timeout_while_gated(self) -> None:
+        p = _instrumented(adaptive=True)
+        async with p.acquire(), p.acquire():
+            with pytest.raises(TimeoutError):
+                async with p.acquire(timeout=0.01):
+                    pass
+        assert p.stats()["timeouts"] == 1
+        assert p.stats()["waiting"] == 0
+
+    def test_adapt_grows_on_slow_waits_and_shrinks_when_idle(self) -> None:
+        p = _instrumented(adaptive=True, target_wait=0.001)
+        for _ in range(10):
+            p._record_wait(0.05)
+        p.adapt()
+        assert p.limit == 3
+
+        p._gate.set_limit(6)
+        for _ in range(10):
+            p._record_wait(0.0)
+        p.adapt()
+        assert p.limit == 5
+        assert p.resizes == 2
+
+
+class TestDeadlines:
+    """Query and acquire timeouts derived from the request deadline."""
+
+    @pytest.mark.asyncio
+    async def test_query_timeout_capped_and_reported_as_504(self) -> None:
+        p = _instrumented()
+        conn = p.pool.acquire.return_value
+        conn.fetchval = AsyncMock(side_effect=asyncio.TimeoutError())
+
+        with deadline_scope(2):
+            with pytest.raises(DeadlineExceeded):
+                await p.fetchval("SELECT pg_sleep(10)")
+        assert 0 < conn.fetchval.await_args.kwargs["timeout"] <= 2
+
+        with pytest.raises(asyncio.TimeoutError):
+            await p.fetchval("SELECT pg_sleep(10)", timeout=1)
+
+
+class TestQueryMetrics:
+    """Tests for per-statement query metrics."""
+
+    def test_ad_hoc_sql_is_normalised(self) -> None:
+        assert normalize_sql("SELECT *\n  FROM t WHERE a = 'x''y' AND b = 42") == (
+            "SELECT * FROM t WHERE a = ? AND b = ?"
+        )
+
+    def test_record_and_slow_log_redacts(self, caplog: pytest.LogCaptureFixture) -> None:
+        metrics = QueryMetrics(slow_threshold=0.1)
+        metrics.record(READ, ("secret@example.com",), 0.5, 1, False)
+        metrics.record(READ, ("x",), 0.001, 0, True)
+
+        snap = metrics.snapshot()["t.read"]
+        assert (snap["count"], snap["rows"], snap["errors"]) == (2, 1, 1)
+        assert "Slow query t.read" in caplog.text
+        assert "$1=str" in caplog.text
+        assert "secret" not in caplog.text
+
+    def test_label_cardinality_is_bounded(self) -> None:
+        metrics = QueryMetrics(slow_threshold=0, max_statements=1)
+        metrics.record("SELECT a FROM t", (), 0.001, 1, False)
+        metrics.record("SELECT b FROM t", (), 0.001, 1, False)
+
+        assert set(metrics.snapshot()) == {"SELECT a FROM t", "other"}
+
+    def test_label_map_is_bounded(self) -> None:
+        metrics = QueryMetrics(slow_threshold=0, max_statements=3)
+        for n in range(100):
+            metrics.record(f"SELECT * FROM t WHERE id = {n}", (), 0.001, 1, False)
+
+        assert len(metrics._labels) == 3
+        assert metrics.snapshot()["other"]["count"] == 97
+
+    def test_prometheus_format(self) -> None:
+        metrics = QueryMetrics(slow_threshold=0)
+        metrics.record(READ, (), 0.002, 3, False)
+        text = "\n".join(metrics.prometheus())
+
+        assert "# TYPE db_query_duration_seconds histogram" in text
+        assert 'db_query_duration_seconds_bucket{statement="t.read",le="+Inf"} 1' in text
+        assert 'db_query_rows_total{statement="t.read"} 3' in text
+
+    @pytest.mark.asyncio
+    async def test_connection_records_queries(self) -> None:
+        ps = MagicMock()
+        ps.fetch = AsyncMock(return_value=[1, 2])
+        conn = _connection()
+        conn.prepare = AsyncMock(return_value=ps)
+        query_metrics.reset()
+
+        await conn.fetch(Statement("t.list", "SELECT k FROM t"))
+
+        assert query_metrics.snapshot()["t.list"]["rows"] == 2
@@ -0,0 +1,149 @@
+"""Tests for core/deadline.py and core/middleware/deadline.py."""
+
+import asyncio
+import json
+
+import pytest
+
+from core.deadline import DeadlineExceeded, bounded, deadline_scope, remaining
+from core.middleware.deadline import DeadlineMiddleware
+
+SCOPE = {"type": "http", "method": "GET", "path": "/slow", "headers": []}
+
+
+class _Client:
+    """ASGI receive/send pair; ``leave()`` simulates a disconnect."""
+
+    def __init__(self) -> None:
+        self.messages: list[dict] = []
+        self._gone = asyncio.Event()
+
+    async def receive(self) -> dict:
+        if not hasattr(self, "_sent_body"):
+            self._sent_body = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await self._gone.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(self, message: dict) -> None:
+        self.messages.append(message)
+
+    def leave(self) -> None:
+        self._gone.set()
+
+
+class TestDeadline:
+    """Tests for the deadline context."""
+
+    def test_no_deadline(self) -> None:
+        assert remaining() is None
+        assert bounded(3.0) == 3.0
+
+    def test_scope_caps_timeouts_and_nests_shorter(self) -> None:
+        with deadline_scope(10):
+            assert bounded(None) <= 10
+            assert bounded(1.0) == 1.0
+            with deadline_scope(60):
+                assert remaining() <= 10
+        assert remaining() is None
+
+    @pytest.mark.asyncio
+    async def test_expired_raises(self) -> None:
+        with deadline_scope(0.001):
+            await asyncio.sleep(0.01)
+            with pytest.raises(DeadlineExceeded):
+                remaining()
+
+
+class TestDeadlineMiddleware:
+    """Tests for DeadlineMiddleware."""
+
+    @pytest.mark.asyncio
+    async def test_slow_handler_gets_504(self) -> None:
+        async def app(scope, receive, send) -> None:
+            await asyncio.sleep(10)
+
+        client = _Client()
+        middleware = DeadlineMiddleware(app, default=10, routes={"/slow": 0.01})
+        await middleware(SCOPE, client.receive, client.send)
+
+        assert client.messages[0]["status"] == 504
+        assert json.loads(client.messages[1]["body"]) == {"error": "Request deadline exceeded"}
+        assert middleware.timeouts == 1
+
+    @pytest.mark.asyncio
+    async def test_handler_sees_deadline(self) -> None:
+        seen = []
+
+        async def app(scope, receive, send) -> None:
+            seen.append(remaining())
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b"ok"})
+
+        client = _Client()
+        await DeadlineMiddleware(app, default=5)(SCOPE, client.receive, client.send)
+
+        assert 0 < seen[0] <= 5
+        assert client.messages[0]["status"] == 200
+
+    @pytest.mark.asyncio
+    async def test_disconnect_cancels_handler(self) -> None:
+        cancelled = asyncio.Event()
+
+        async def app(scope, receive, send) -> None:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        client = _Client()
+        middleware = DeadlineMiddleware(app, default=10)
+        call = asyncio.ensure_future(middleware(SCOPE, client.receive, client.send))
+        await asyncio.sleep(0.01)
+        client.leave()
+        await asyncio.wait_for(call, 1)
+
+        assert cancelled.is_set()
+        assert middleware.disconnects == 1
+        assert client.messages == []
+
+    @pytest.mark.asyncio
+    async def test_body_is_not_read_ahead_of_the_app(self) -> None:
+        """Unread body chunks stay with the server (flow control), not in memory."""
+        reads = 0
+
+        async def receive() -> dict:
+            nonlocal reads
+            reads += 1
+            return {"type": "http.request", "body": b"x" * 65536, "more_body": True}
+
+        async def app(scope, receive, send) -> None:
+            await asyncio.sleep(0.01)  # never reads the body
+            await send({"type": "http.response.start", "status": 404, "headers": []})
+            await send({"type": "http.response.body", "body": b""})
+
+        client = _Client()
+        await DeadlineMiddleware(app, default=5)(SCOPE, receive, client.send)
+
+        assert client.messages[0]["status"] == 404
+        assert reads <= 2
+
+    @pytest.mark.asyncio
+    async def test_app_sees_body_then_disconnect(self) -> None:
+        received = []
+
+        async def app(scope, receive, send) -> None:
+            received.append(await receive())
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b"ok"})
+            received.append(await receive())  # e.g. a streaming response listening
+
+        client = _Client()
+        middleware = DeadlineMiddleware(app, default=5)
+        call = asyncio.ensure_future(middleware(SCOPE, client.receive, client.send))
+        await asyncio.sleep(0.01)
+        client.leave()
+        await asyncio.wait_for(call, 1)
+
+        assert [m["type"] for m in received] == ["http.request", "http.disconnect"]
@@ -0,0 +1,99 @@
+"""Tests for core/dependencies.py - bearer token dependency and its cache."""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from core.cache import LRUCache
+from core.dependencies import get_current_user, require_admin, token_cache
+from core.security import create_access_token, create_refresh_token, verify_token
+
+
+def _bearer(token: str) -> HTTPAuthorizationCredentials:
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+class TestGetCurrentUser:
+    """Tests for get_current_user."""
+
+    @pytest.fixture(autouse=True)
+    def _clear_cache(self) -> None:
+        token_cache.clear()
+
+    @pytest.mark.asyncio
+    async def test_valid_access_token(self) -> None:
+        """A valid access token should return the user."""
+        token = create_access_token({"sub": "7", "email": "a@b.com"})
+
+        assert await get_current_user(_bearer(token)) == {"id": 7, "email": "a@b.com"}
+
+    @pytest.mark.asyncio
+    async def test_cache_hit_skips_verification(self) -> None:
+        """A repeated token should be served without decoding it again."""
+        token = create_access_token({"sub": "7", "email": "a@b.com"})
+
+        with patch("core.dependencies.verify_token", wraps=verify_token) as verify:
+            await get_current_user(_bearer(token))
+            user = await get_current_user(_bearer(token))
+
+        assert user == {"id": 7, "email": "a@b.com"}
+        assert verify.call_count == 1
+        assert token_cache.hits == 1
+
+    @pytest.mark.asyncio
+    async def test_refresh_token_rejected_and_not_cached(self) -> None:
+        """Refresh tokens should be rejected and never cached."""
+        token = create_refresh_token({"sub": "7", "email": "a@b.com"})
+
+        with pytest.raises(HTTPException):
+            await get_current_user(_bearer(token))
+        assert len(token_cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_expired_token_rejected(self) -> None:
+        """Expired tokens should be rejected."""
+        token = create_access_token({"sub": "7", "email": "a@b.com"}, timedelta(seconds=-1))
+
+        with pytest.raises(HTTPException):
+            await get_current_user(_bearer(token))
+
+
+class TestRequireAdmin:
+    """Tests for require_admin."""
+
+    @pytest.mark.asyncio
+    async def test_only_listed_emails_pass(self) -> None:
+        with patch("core.dependencies.settings.admin_emails", ["Admin@example.com"]):
+            admin = {"id": 1, "email": "admin@example.com"}
+            assert await require_admin(admin) == admin
+            with pytest.raises(HTTPException) as exc:
+                await require_admin({"id": 2, "email": "user@example.com"})
+        assert exc.value.status_code == 403
+
+
+class TestLRUCache:
+    """Tests for core/cache.py."""
+
+    def test_evicts_least_recently_used(self) -> None:
+        """Exceeding maxsize should evict the least recently used entry."""
+        cache: LRUCache[str, int] = LRUCache(2)
+        cache.set_ttl("a", 1, 60)
+        cache.set_ttl("b", 2, 60)
+        cache.get("a")
+        cache.set_ttl("c", 3, 60)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.evictions == 1
+
+    def test_expired_entry_is_a_miss(self) -> None:
+        """Entries past their expiry should be dropped on read."""
+        cache: LRUCache[str, int] = LRUCache(2)
+        cache.set_ttl("a", 1, -1)
+
+        assert cache.get("a") is None
+        assert cache.expirations == 1
+        assert len(cache) == 0
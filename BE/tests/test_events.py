@@ -0,0 +1,344 @@
+"""Tests for core/events.py - bounded event bus."""
+
+import asyncio
+
+import pytest
+
+from core.events import EventBus, EventBusFull, PostgresBridge, compile_pattern
+
+
+class TestEventBus:
+    """Tests for EventBus."""
+
+    @pytest.mark.asyncio
+    async def test_handlers_run_on_workers_and_drain_delivers(self) -> None:
+        bus = EventBus(workers=2, queue_size=10)
+        seen: list[int] = []
+
+        @bus.on("thing.happened")
+        async def handler(payload: dict) -> None:
+            await asyncio.sleep(0)
+            seen.append(payload["n"])
+
+        for n in range(5):
+            await bus.publish("thing.happened", {"n": n})
+        await bus.drain(timeout=1)
+
+        assert sorted(seen) == [0, 1, 2, 3, 4]
+        stats = bus.stats()
+        assert stats["published"] == 5
+        assert stats["workers"] == 0  # stopped by drain
+        assert next(iter(stats["handlers"].values()))["calls"] == 5
+
+    @pytest.mark.asyncio
+    async def test_handler_failure_is_logged_and_counted(self, caplog) -> None:
+        bus = EventBus(workers=1)
+
+        async def broken(_payload: dict) -> None:
+            raise RuntimeError("boom")
+
+        bus.subscribe("e", broken)
+        await bus.publish("e")
+        await bus.drain(timeout=1)
+
+        (handler_stats,) = bus.stats()["handlers"].values()
+        assert handler_stats["failures"] == 1
+        assert "failed for e" in caplog.text
+
+    @pytest.mark.asyncio
+    async def test_reject_raises_when_full(self) -> None:
+        bus = EventBus(workers=1, queue_size=1, overflow="reject")
+        release = asyncio.Event()
+
+        async def slow(_payload: dict) -> None:
+            await release.wait()
+
+        bus.subscribe("e", slow)
+        await bus.publish("e")
+        await asyncio.sleep(0)  # worker takes the first job
+        await bus.publish("e")  # fills the queue
+        with pytest.raises(EventBusFull):
+            await bus.publish("e")
+
+        release.set()
+        await bus.drain(timeout=1)
+        assert bus.stats()["rejected"] == 1
+
+    @pytest.mark.asyncio
+    async def test_drop_oldest_keeps_newest(self) -> None:
+        bus = EventBus(workers=1, queue_size=2, overflow="drop_oldest")
+        release = asyncio.Event()
+        seen: list[int] = []
+
+        async def slow(payload: dict) -> None:
+            await release.wait()
+            seen.append(payload["n"])
+
+        bus.subscribe("e", slow)
+        await bus.publish("e", {"n": 0})
+        await asyncio.sleep(0)
+        for n in range(1, 5):
+            await bus.publish("e", {"n": n})
+
+        release.set()
+        await bus.drain(timeout=1)
+        assert seen == [0, 3, 4]
+        assert bus.stats()["dropped"] == 2
+
+    @pytest.mark.asyncio
+    async def test_block_applies_backpressure(self) -> None:
+        bus = EventBus(workers=1, queue_size=1, overflow="block")
+        release = asyncio.Event()
+
+        async def slow(_payload: dict) -> None:
+            await release.wait()
+
+        bus.subscribe("e", slow)
+        await bus.publish("e")
+        await asyncio.sleep(0)
+        await bus.publish("e")
+        blocked = asyncio.create_task(bus.publish("e"))
+        await asyncio.sleep(0.01)
+        assert not blocked.done()
+
+        release.set()
+        await asyncio.wait_for(blocked, 1)
+        await bus.drain(timeout=1)
+        assert bus.stats()["max_queued"] == 1
+
+
+class TestTopicRouting:
+    """Tests for wildcard patterns and the precompiled dispatch table."""
+
+    def test_star_matches_one_segment(self) -> None:
+        regex = compile_pattern("user.*")
+        assert regex.fullmatch("user.registered")
+        assert not regex.fullmatch("user.a.b")
+        assert not regex.fullmatch("users.registered")
+
+    @pytest.mark.asyncio
+    async def test_wildcard_and_exact_subscribers_both_receive(self) -> None:
+        bus = EventBus(workers=1)
+        exact, wildcard = [], []
+
+        async def on_exact(payload: dict) -> None:
+            exact.append(payload)
+
+        async def on_any(payload: dict) -> None:
+            wildcard.append(payload)
+
+        bus.subscribe("user.registered", on_exact)
+        bus.subscribe("user.*", on_any)
+        assert len(bus._routes["user.registered"]) == 2  # resolved at subscribe time
+
+        await bus.publish("user.registered", {"n": 1})
+        await bus.publish("user.logged_in", {"n": 2})
+        await bus.publish("order.created", {"n": 3})
+        await bus.drain(timeout=1)
+
+        assert exact == [{"n": 1}]
+        assert wildcard == [{"n": 1}, {"n": 2}]
+
+
+class TestBatchSubscriptions:
+    """Tests for batch-mode handlers."""
+
+    @pytest.mark.asyncio
+    async def test_flushes_at_max_size(self) -> None:
+        bus = EventBus(workers=1)
+        batches: list[list] = []
+
+        async def write(events: list) -> None:
+            batches.append(events)
+
+        bus.subscribe("user.*", write, batch=True, max_size=3, max_latency=0.1)
+        for n in range(7):
+            await bus.publish("user.registered", {"n": n})
+        await asyncio.sleep(0.01)
+
+        assert [len(b) for b in batches] == [3, 3]
+        assert batches[0][0] == ("user.registered", {"n": 0})
+        await bus.drain(timeout=1)  # the last event waits out max_latency
+        assert [len(b) for b in batches] == [3, 3, 1]
+
+    @pytest.mark.asyncio
+    async def test_flushes_after_max_latency(self) -> None:
+        bus = EventBus(workers=1)
+        batches: list[list] = []
+
+        async def write(events: list) -> None:
+            batches.append(events)
+
+        bus.subscribe("e", write, batch=True, max_size=100, max_latency=0.01)
+        await bus.publish("e", {"n": 1})
+        await bus.publish("e", {"n": 2})
+        await bus.drain(timeout=1)
+
+        assert batches == [[("e", {"n": 1}), ("e", {"n": 2})]]
+
+    @pytest.mark.asyncio
+    async def test_deliver_groups_events_for_batch_handlers(self) -> None:
+        bus = EventBus()
+        batches: list[list] = []
+        singles: list[dict] = []
+
+        async def write(events: list) -> None:
+            batches.append(events)
+
+        async def single(payload: dict) -> None:
+            singles.append(payload)
+
+        bus.subscribe("user.*", write, batch=True, max_size=2)
+        bus.subscribe("user.registered", single)
+        await bus.deliver([("user.registered", {"n": n}) for n in range(3)])
+
+        assert [len(b) for b in batches] == [2, 1]
+        assert len(singles) == 3
+
+    @pytest.mark.asyncio
+    async def test_deliver_returns_failed_events(self) -> None:
+        bus = EventBus()
+
+        async def write(events: list) -> None:
+            if len(events) == 1:
+                raise RuntimeError("boom")
+
+        async def single(payload: dict) -> None:
+            if payload["n"] == 0:
+                raise RuntimeError("boom")
+
+        bus.subscribe("user.*", write, batch=True, max_size=2)
+        bus.subscribe("user.registered", single)
+        events = [("user.registered", {"n": n}) for n in range(3)]
+
+        assert await bus.deliver(events) == [events[0], events[2]]
+
+
+class _FakeServer:
+    """Delivers every pg_notify to all listening fake connections."""
+
+    def __init__(self) -> None:
+        self.listeners: list = []
+        self.round_trips = 0
+
+    async def connect(self) -> "_FakeConnection":
+        return _FakeConnection(self)
+
+
+class _FakeConnection:
+    def __init__(self, server: _FakeServer) -> None:
+        self._server = server
+        self._on_terminate: list = []
+
+    async def add_listener(self, channel: str, callback) -> None:
+        self._server.listeners.append((self, callback))
+
+    def add_termination_listener(self, callback) -> None:
+        self._on_terminate.append(callback)
+
+    async def execute(self, _sql: str, channel: str, messages: list[str]) -> None:
+        self._server.round_trips += 1
+        for message in messages:
+            for _conn, callback in self._server.listeners:
+                callback(self, 0, channel, message)
+
+    def terminate(self) -> None:
+        """Drop the connection, as when the server goes away."""
+        self._server.listeners = [(c, cb) for c, cb in self._server.listeners if c is not self]
+        for callback in self._on_terminate:
+            callback(self)
+
+    async def close(self) -> None:
+        self.terminate()
+
+
+class TestPostgresBridge:
+    """Tests for cross-process relaying."""
+
+    @pytest.mark.asyncio
+    async def test_relays_to_other_worker_without_echo(self) -> None:
+        server = _FakeServer()
+        here, there = EventBus(workers=1), EventBus(workers=1)
+        received: list[dict] = []
+        local: list[dict] = []
+
+        async def on_there(payload: dict) -> None:
+            received.append(payload)
+
+        async def on_here(payload: dict) -> None:
+            local.append(payload)
+
+        there.subscribe("user.registered", on_there)
+        here.subscribe("user.registered", on_here)
+        sender = PostgresBridge(here, ["user.*"], flush_interval=0.001)
+        receiver = PostgresBridge(there, ["user.*"], flush_interval=0.001)
+        await sender.start(server.connect)
+        await receiver.start(server.connect)
+
+        for _ in range(3):  # duplicates collapse into one relayed event
+            await here.publish("user.registered", {"email": "a@b.com"})
+        await here.publish("order.created", {"id": 1})  # not bridged
+        await asyncio.sleep(0.02)
+
+        assert received == [{"email": "a@b.com"}]
+        assert len(local) == 3
+        assert server.round_trips == 1
+        assert sender.stats()["coalesced"] == 2
+        assert sender.stats()["echoes"] == 1
+        assert receiver.stats()["lag"]["count"] == 1
+
+        await sender.stop()
+        await receiver.stop()
+        await here.drain(timeout=1)
+        await there.drain(timeout=1)
+
+    @pytest.mark.asyncio
+    async def test_listener_reconnects_after_connection_loss(self) -> None:
+        server = _FakeServer()
+        here, there = EventBus(workers=1), EventBus(workers=1)
+        received: list[dict] = []
+
+        async def on_there(payload: dict) -> None:
+            received.append(payload)
+
+        there.subscribe("user.registered", on_there)
+        sender = PostgresBridge(here, ["user.*"], flush_interval=0.001)
+        receiver = PostgresBridge(there, ["user.*"], flush_interval=0.001)
+        await sender.start(server.connect)
+        await receiver.start(server.connect)
+
+        receiver._conn.terminate()  # the receiver never sends, so only the listener notices
+        await asyncio.sleep(0.01)
+        await here.publish("user.registered", {"email": "a@b.com"})
+        await asyncio.sleep(0.02)
+
+        assert received == [{"email": "a@b.com"}]
+        assert receiver.stats()["reconnects"] == 1
+
+        await sender.stop()
+        await receiver.stop()
+        await here.drain(timeout=1)
+        await there.drain(timeout=1)
+
+    @pytest.mark.asyncio
+    async def test_malformed_notifications_are_dropped(self) -> None:
+        bridge = PostgresBridge(EventBus(), ["e"])
+        bridge._inbox = asyncio.Queue()
+
+        for message in ["not json", "[1]", '{"o": "x"}', '{"o": "x", "t": "now", "e": []}']:
+            bridge._notified(None, 0, "event_bridge", message)
+        bridge._notified(None, 0, "event_bridge", '{"o": "x", "t": 1, "e": [["e", {}], 5]}')
+
+        assert bridge.stats()["dropped"] == 5
+        assert bridge._inbox.qsize() == 1
+
+    def test_pack_splits_at_notify_limit(self) -> None:
+        bridge = PostgresBridge(EventBus(), ["e"])
+        for n in range(200):
+            bridge.send("e", {"n": n, "pad": "x" * 100})
+
+        messages = bridge._pack()
+
+        assert len(messages) > 1
+        assert all(len(m.encode()) < 8000 for m in messages)
+        assert sum(m.count('"pad"') for m in messages) == 200
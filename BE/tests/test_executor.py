@@ -0,0 +1,85 @@
+"""Tests for core/executor.py - bounded worker pool."""
+
+import asyncio
+import threading
+
+import pytest
+
+from core.executor import BoundedExecutor, ExecutorSaturated
+
+
+class TestBoundedExecutor:
+    """Tests for BoundedExecutor."""
+
+    @pytest.mark.asyncio
+    async def test_run_returns_result_and_counts(self) -> None:
+        """A call should return the function result and update counters."""
+        pool = BoundedExecutor("test", workers=2, queue_size=2)
+        try:
+            assert await pool.run(pow, 2, 10) == 1024
+        finally:
+            pool.shutdown()
+
+        stats = pool.stats()
+        assert stats["submitted"] == 1
+        assert stats["completed"] == 1
+        assert stats["run_seconds"]["count"] == 1
+        assert stats["pending"] == 0
+
+    @pytest.mark.asyncio
+    async def test_rejects_when_saturated(self) -> None:
+        """Calls beyond workers + queue_size should be rejected immediately."""
+        pool = BoundedExecutor("test", workers=1, queue_size=1)
+        gate = threading.Event()
+        try:
+            blocked = [asyncio.ensure_future(pool.run(gate.wait)) for _ in range(2)]
+            await asyncio.sleep(0)
+            assert pool.queue_depth == 1
+
+            with pytest.raises(ExecutorSaturated):
+                await pool.run(gate.wait)
+            assert pool.rejected == 1
+
+            gate.set()
+            await asyncio.gather(*blocked)
+        finally:
+            gate.set()
+            pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_failure_is_counted_and_propagated(self) -> None:
+        """Exceptions raised in the worker should reach the caller."""
+        pool = BoundedExecutor("test", workers=1, queue_size=0)
+        try:
+            with pytest.raises(ZeroDivisionError):
+                await pool.run(divmod, 1, 0)
+        finally:
+            pool.shutdown()
+
+        assert pool.failed == 1
+        assert pool.stats()["pending"] == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_keeps_slot_until_job_ends(self) -> None:
+        """A job still running after its caller was cancelled counts as pending."""
+        pool = BoundedExecutor("test", workers=1, queue_size=0)
+        gate = threading.Event()
+        try:
+            caller = asyncio.ensure_future(pool.run(gate.wait))
+            await asyncio.sleep(0.01)
+            caller.cancel()
+            await asyncio.gather(caller, return_exceptions=True)
+
+            assert pool.stats()["pending"] == 1
+            with pytest.raises(ExecutorSaturated):
+                await pool.run(gate.wait)
+
+            gate.set()
+            for _ in range(100):
+                if pool.stats()["pending"] == 0:
+                    break
+                await asyncio.sleep(0.01)
+            assert pool.stats()["pending"] == 0
+        finally:
+            gate.set()
+            pool.shutdown()
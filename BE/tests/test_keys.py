@@ -0,0 +1,85 @@
+"""Tests for core/keys.py - JWT key ring."""
+
+import jwt
+import pytest
+
+from core.keys import DEFAULT_KID, KeyRing, load_key
+from core.security import TokenMinter
+
+
+def _mint(ring: KeyRing, kid: str) -> str:
+    key = ring.get(kid)
+    return TokenMinter(key.signing_key, key.algorithm, kid=kid).mint({"sub": "1"}, "access", 2_000_000_000)
+
+
+class TestKeyRing:
+    """Tests for KeyRing rotation and verification."""
+
+    @pytest.fixture
+    def ring(self) -> KeyRing:
+        return KeyRing(
+            [
+                load_key({"kid": DEFAULT_KID, "alg": "HS256", "secret": "old-secret"}),
+                load_key({"kid": "2024-06", "alg": "HS256", "secret": "new-secret"}),
+            ],
+            active_kid="2024-06",
+        )
+
+    def test_verifies_by_kid(self, ring: KeyRing) -> None:
+        """Tokens signed with any key in the ring should verify."""
+        assert ring.decode(_mint(ring, "2024-06"))["sub"] == "1"
+        assert ring.decode(_mint(ring, DEFAULT_KID))["sub"] == "1"
+
+    def test_token_without_kid_uses_default_key(self, ring: KeyRing) -> None:
+        """Tokens issued before the ring (no kid) should verify with the default key."""
+        token = jwt.encode({"sub": "1"}, "old-secret", algorithm="HS256")
+
+        assert ring.decode(token)["sub"] == "1"
+
+    def test_unknown_kid_rejected(self, ring: KeyRing) -> None:
+        """A retired or unknown kid should fail verification."""
+        token = jwt.encode({"sub": "1"}, "new-secret", algorithm="HS256", headers={"kid": "gone"})
+
+        with pytest.raises(jwt.PyJWTError):
+            ring.decode(token)
+
+    def test_kid_cannot_borrow_another_key(self, ring: KeyRing) -> None:
+        """A token signed with one secret but naming another kid should fail."""
+        token = jwt.encode({"sub": "1"}, "old-secret", algorithm="HS256", headers={"kid": "2024-06"})
+
+        with pytest.raises(jwt.InvalidSignatureError):
+            ring.decode(token)
+
+    def test_jwks_excludes_hmac_secrets(self, ring: KeyRing) -> None:
+        """Symmetric keys must never be published."""
+        assert ring.jwks() == {"keys": []}
+
+    def test_active_kid_must_exist(self) -> None:
+        """An active kid missing from the ring is a configuration error."""
+        with pytest.raises(ValueError):
+            KeyRing([load_key({"kid": "a", "secret": "s"})], active_kid="b")
+
+
+class TestAsymmetricKeys:
+    """Tests for optional EdDSA keys."""
+
+    def test_eddsa_sign_verify_and_publish(self) -> None:
+        """An EdDSA key should sign, verify, and verify from its published JWK."""
+        pytest.importorskip("cryptography")
+        from cryptography.hazmat.primitives import serialization
+        from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+
+        pem = Ed25519PrivateKey.generate().private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        ).decode()
+        ring = KeyRing([load_key({"kid": "ed1", "alg": "EdDSA", "private_key": pem})], "ed1")
+
+        token = _mint(ring, "ed1")
+        assert ring.decode(token)["sub"] == "1"
+
+        (published,) = ring.jwks()["keys"]
+        assert published["kid"] == "ed1" and "d" not in published
+        remote = jwt.PyJWK(published)
+        assert jwt.decode(token, remote, algorithms=["EdDSA"])["sub"] == "1"
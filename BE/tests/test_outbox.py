@@ -0,0 +1,187 @@
+"""Tests for core/outbox.py - transactional outbox dispatch."""
+
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+
+import asyncpg
+import pytest
+
+from core.events import EventBus
+from core.outbox import BURY_EVENTS, CLAIM_EVENTS, DELETE_EVENTS, RETRY_EVENTS, OutboxDispatcher
+
+
+def _pool_returning(*batches: list[dict]) -> tuple[MagicMock, MagicMock]:
+    """A pool whose connection claims *batches* in turn, then nothing."""
+    conn = MagicMock()
+    conn.fetch = AsyncMock(side_effect=[*batches, *([[]] * 10)])
+    conn.execute = AsyncMock()
+
+    @asynccontextmanager
+    async def transaction():
+        yield
+
+    conn.transaction = transaction
+
+    @asynccontextmanager
+    async def acquire():
+        yield conn
+
+    pool = MagicMock()
+    pool.acquire = acquire
+    return pool, conn
+
+
+class _FakeOutbox:
+    """``event_outbox`` in memory, speaking the dispatcher's statements."""
+
+    def __init__(self, *ids: int) -> None:
+        self.now = 0.0
+        self.rows = {
+            i: {"id": i, "topic": "e", "payload": {"n": i}, "attempts": 0, "next_attempt_at": 0.0}
+            for i in ids
+        }
+        self.dead: dict[int, int] = {}  # id → attempts
+
+    async def fetch(self, sql, limit: int) -> list[dict]:
+        assert sql is CLAIM_EVENTS
+        due = [row for row in self.rows.values() if row["next_attempt_at"] <= self.now]
+        return [dict(row) for row in sorted(due, key=lambda row: row["id"])[:limit]]
+
+    async def execute(self, sql, ids: list[int], *args: float) -> None:
+        for i in ids:
+            row = self.rows[i]
+            if sql is DELETE_EVENTS:
+                del self.rows[i]
+            elif sql is RETRY_EVENTS:
+                base, cap = args
+                row["next_attempt_at"] = self.now + min(base * 2 ** row["attempts"], cap)
+                row["attempts"] += 1
+            else:
+                assert sql is BURY_EVENTS
+                self.dead[i] = self.rows.pop(i)["attempts"] + 1
+
+    def pool(self) -> MagicMock:
+        conn = MagicMock()
+        conn.fetch, conn.execute = self.fetch, self.execute
+
+        @asynccontextmanager
+        async def transaction():
+            yield
+
+        conn.transaction = transaction
+
+        @asynccontextmanager
+        async def acquire():
+            yield conn
+
+        pool = MagicMock()
+        pool.acquire = acquire
+        return pool
+
+
+class TestOutboxDispatcher:
+    """Tests for OutboxDispatcher."""
+
+    @pytest.mark.asyncio
+    async def test_dispatch_delivers_batch_in_one_claim(self) -> None:
+        bus = EventBus()
+        seen: list[tuple[str, dict]] = []
+
+        async def handler(payload: dict) -> None:
+            seen.append(("user.registered", payload))
+
+        bus.subscribe("user.registered", handler)
+        pool, conn = _pool_returning([
+            {"id": 2, "topic": "user.registered", "payload": '{"user_id": 2}', "attempts": 0},
+            {"id": 1, "topic": "user.registered", "payload": {"user_id": 1}, "attempts": 0},
+        ])
+        dispatcher = OutboxDispatcher(bus, batch_size=10)
+        dispatcher._pool = pool
+
+        assert await dispatcher.dispatch() == 2
+
+        conn.fetch.assert_awaited_once_with(CLAIM_EVENTS, 10)
+        conn.execute.assert_awaited_once_with(DELETE_EVENTS, [2, 1])
+        assert sorted(p["user_id"] for _, p in seen) == [1, 2]
+        assert dispatcher.stats()["delivered"] == 2
+
+    @pytest.mark.asyncio
+    async def test_failing_row_is_retried_later_without_blocking_newer_rows(self) -> None:
+        bus = EventBus()
+        delivered: list[int] = []
+
+        async def handler(payload: dict) -> None:
+            if payload["n"] == 1:
+                raise RuntimeError("boom")
+            delivered.append(payload["n"])
+
+        bus.subscribe("e", handler)
+        outbox = _FakeOutbox(1, 2, 3)
+        dispatcher = OutboxDispatcher(bus, batch_size=1, retry_base=10, max_attempts=5)
+        dispatcher._pool = outbox.pool()
+
+        assert await dispatcher.dispatch() == 1  # row 1 fails
+        assert outbox.rows[1]["attempts"] == 1
+        assert outbox.rows[1]["next_attempt_at"] == 10
+        assert await dispatcher.dispatch() == 1  # row 1 is not due: row 2
+        assert await dispatcher.dispatch() == 1
+        assert delivered == [2, 3]
+        assert list(outbox.rows) == [1]
+        assert dispatcher.stats()["failed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_row_moves_to_dead_letter_after_max_attempts(self) -> None:
+        bus = EventBus()
+
+        async def broken(_payload: dict) -> None:
+            raise RuntimeError("boom")
+
+        bus.subscribe("e", broken)
+        outbox = _FakeOutbox(1)
+        dispatcher = OutboxDispatcher(bus, retry_base=1, retry_max=2, max_attempts=3)
+        dispatcher._pool = outbox.pool()
+
+        for delay in (1, 2):  # backoff doubles, capped at retry_max
+            await dispatcher.dispatch()
+            assert outbox.rows[1]["next_attempt_at"] == outbox.now + delay
+            outbox.now += delay
+        await dispatcher.dispatch()
+
+        assert outbox.rows == {}
+        assert outbox.dead == {1: 3}
+        assert dispatcher.stats()["dead"] == 1
+
+    @pytest.mark.asyncio
+    async def test_loop_survives_interface_error(self) -> None:
+        pool, conn = _pool_returning([])
+        conn.fetch.side_effect = [asyncpg.InterfaceError("connection is closed"), [], []]
+        dispatcher = OutboxDispatcher(EventBus(), poll_interval=60)
+        dispatcher._pool = pool
+
+        task = asyncio.create_task(dispatcher._loop())
+        await asyncio.sleep(0.01)
+        dispatcher._notified(None, 1, "event_outbox", "")
+        await asyncio.sleep(0.01)
+        assert not task.done()
+        assert conn.fetch.await_count == 2
+
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    @pytest.mark.asyncio
+    async def test_loop_sleeps_until_notified(self) -> None:
+        pool, conn = _pool_returning([])
+        dispatcher = OutboxDispatcher(EventBus(), poll_interval=60)
+        dispatcher._pool = pool
+
+        task = asyncio.create_task(dispatcher._loop())
+        await asyncio.sleep(0.01)
+        assert conn.fetch.await_count == 1  # idle: no polling
+
+        dispatcher._notified(None, 1, "event_outbox", "")
+        await asyncio.sleep(0.01)
+        assert conn.fetch.await_count == 2
+
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
@@ -0,0 +1,63 @@
+"""Tests for core/rate_limit.py and the login throttle."""
+
+import pytest
+
+from core.exceptions import TooManyRequestsError
+from core.rate_limit import RateLimiter
+from modules.auth.throttle import LoginThrottle
+
+
+class TestRateLimiter:
+    """Tests for the GCRA token-bucket limiter."""
+
+    def test_allows_burst_then_rejects(self) -> None:
+        """A key should get `burst` calls, then be told when to retry."""
+        limiter = RateLimiter(rate=1.0, burst=3)
+
+        assert [limiter.hit("k", now=100.0).allowed for _ in range(3)] == [True] * 3
+        decision = limiter.hit("k", now=100.0)
+        assert decision.allowed is False
+        assert decision.retry_after == pytest.approx(1.0)
+
+    def test_refills_over_time(self) -> None:
+        """Tokens should come back at `rate` per second."""
+        limiter = RateLimiter(rate=1.0, burst=1)
+
+        assert limiter.hit("k", now=0.0).allowed
+        assert not limiter.hit("k", now=0.5).allowed
+        assert limiter.hit("k", now=1.0).allowed
+
+    def test_progressive_delay(self) -> None:
+        """Calls past the soft limit should be delayed, doubling each time."""
+        limiter = RateLimiter(rate=1.0, burst=4, soft_limit=2, delay_base=0.1, delay_max=10)
+
+        delays = [limiter.hit("k", now=0.0).delay for _ in range(4)]
+        assert delays == [0.0, 0.0, pytest.approx(0.1), pytest.approx(0.2)]
+
+    def test_memory_is_bounded(self) -> None:
+        """Distinct keys beyond max_keys should evict the stalest ones."""
+        limiter = RateLimiter(rate=1.0, burst=1, shards=4, max_keys=100)
+        for i in range(1000):
+            limiter.hit(f"key-{i}", now=0.0)
+
+        assert len(limiter) <= 100
+        assert limiter.evicted >= 900
+
+
+class TestLoginThrottle:
+    """Tests for the per-email / per-IP login throttle."""
+
+    @pytest.mark.asyncio
+    async def test_rejects_with_retry_after(self) -> None:
+        """An email over its budget should raise a 429 with Retry-After."""
+        throttle = LoginThrottle(
+            by_email=RateLimiter(rate=0.1, burst=2),
+            by_ip=RateLimiter(rate=100.0, burst=100),
+        )
+        await throttle.check("A@example.com", "10.0.0.1")
+        await throttle.check("a@example.com ", "10.0.0.2")
+
+        with pytest.raises(TooManyRequestsError) as info:
+            await throttle.check("a@example.com", "10.0.0.3")
+        assert info.value.status_code == 429
+        assert int(info.value.headers["Retry-After"]) >= 1
@@ -0,0 +1,57 @@
+"""Tests for core/responses.py - fast JSON responses."""
+
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from core import responses
+from core.responses import FastJSONResponse, json_response, select_dumps
+from modules.auth.router import _token_response
+from modules.auth.schemas import TokenResponse
+
+
+class TestDumps:
+    """Tests for the selected encoders."""
+
+    def test_stdlib_is_compact_and_encodes_datetimes(self) -> None:
+        dumps = select_dumps("stdlib")
+        created = datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+
+        assert dumps({"a": 1, "at": created, "name": "é"}) == (
+            '{"a":1,"at":"2026-01-02T03:04:05+00:00","name":"é"}'.encode()
+        )
+
+    def test_stdlib_rejects_nan(self) -> None:
+        with pytest.raises(ValueError):
+            select_dumps("stdlib")({"x": float("nan")})
+
+    def test_orjson_required_but_missing(self) -> None:
+        if responses.orjson is not None:
+            pytest.skip("orjson is installed")
+        with pytest.raises(RuntimeError):
+            select_dumps("orjson")
+
+    def test_auto_matches_stdlib_output(self) -> None:
+        content = {"error": "Invalid email or password", "n": [1, 2.5, None, True]}
+        assert json.loads(select_dumps("auto")(content)) == content
+
+
+class TestFastJSONResponse:
+    """Tests for FastJSONResponse and json_response."""
+
+    def test_renders_with_headers_and_status(self) -> None:
+        response = json_response({"error": "slow down"}, 429, {"Retry-After": "3"})
+
+        assert isinstance(response, FastJSONResponse)
+        assert response.status_code == 429
+        assert response.headers["retry-after"] == "3"
+        assert response.headers["content-type"] == "application/json"
+        assert json.loads(response.body) == {"error": "slow down"}
+
+    def test_token_response_matches_schema(self) -> None:
+        """The direct path must produce exactly what TokenResponse would."""
+        response = _token_response({"access_token": "a.b.c", "refresh_token": "d.e.f", "user": {}})
+
+        expected = TokenResponse(access_token="a.b.c", refresh_token="d.e.f").model_dump()
+        assert json.loads(response.body) == expected
@@ -0,0 +1,60 @@
+"""Tests for core/bloom.py and modules/auth/revocation.py."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from core.bloom import BloomFilter
+from modules.auth.revocation import RevocationStore
+
+
+class TestBloomFilter:
+    """Tests for BloomFilter."""
+
+    def test_no_false_negatives(self) -> None:
+        """Every added item should be reported as present."""
+        bloom = BloomFilter(1000, 0.01)
+        items = [f"jti-{i}" for i in range(1000)]
+        for item in items:
+            bloom.add(item)
+
+        assert all(item in bloom for item in items)
+
+    def test_false_positive_rate_near_target(self) -> None:
+        """False positives should stay close to the configured rate."""
+        bloom = BloomFilter(1000, 0.01)
+        for i in range(1000):
+            bloom.add(f"in-{i}")
+
+        false_positives = sum(f"out-{i}" in bloom for i in range(10_000))
+        assert false_positives < 300  # 1% target, generous bound
+
+
+class TestRevocationStore:
+    """Tests for RevocationStore."""
+
+    @pytest.fixture
+    def repo(self) -> MagicMock:
+        repo = MagicMock()
+        repo.is_refresh_token_revoked = AsyncMock(return_value=True)
+        repo.list_revoked_refresh_tokens = AsyncMock(return_value=["old-1", "old-2"])
+        repo.purge_expired_refresh_revocations = AsyncMock(return_value=0)
+        return repo
+
+    @pytest.mark.asyncio
+    async def test_unknown_jti_answered_in_memory(self, repo: MagicMock) -> None:
+        """A jti that was never revoked should not hit the database."""
+        store = RevocationStore(1000, 0.001, 10)
+
+        assert await store.is_revoked("fresh", repo) is False
+        repo.is_refresh_token_revoked.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_loaded_jti_confirmed_in_database(self, repo: MagicMock) -> None:
+        """A jti known only from the rebuilt filter should be confirmed once."""
+        store = RevocationStore(1000, 0.001, 10)
+        await store.load(repo)
+
+        assert await store.is_revoked("old-1", repo) is True
+        assert await store.is_revoked("old-1", repo) is True
+        repo.is_refresh_token_revoked.assert_awaited_once_with("old-1")
@@ -27,13 +27,24 @@ class TestPasswordHashing:
         assert hash2.startswith("$")
 
     def test_hash_password_format(self) -> None:
-        """Hash should be in format salt$digest."""
+        """Hash should be in format $scheme$params$salt$digest."""
         password = "testpassword"
-        hash_result = hash_password(password)
+        hash_result = hash_password(password, scheme="scrypt")
+
+        parts = hash_result.split("$")
+        assert len(parts) == 5
+        assert parts[1] == "scrypt"
+        assert parts[2] == "n=16384,r=8,p=1"
+        assert len(parts[3]) == 32  # 16 bytes hex encoded = 32 chars
+        assert len(parts[4]) == 64  # 32-byte key hex = 64 chars
+
+    def test_legacy_hash_format(self) -> None:
+        """Legacy hashes should be in format salt$digest."""
+        hash_result = hash_password("testpassword", scheme="legacy-sha256")
 
         parts = hash_result.split("$")
         assert len(parts) == 2
-        assert len(parts[0]) == 32  # 16 bytes hex encoded = 32 chars
+        assert len(parts[0]) == 32
         assert len(parts[1]) == 64  # SHA256 hex = 64 chars
 
     def test_verify_password_correct(self) -> None:
@@ -59,6 +70,42 @@ class TestPasswordHashing:
         assert verify_password(password, stored_hash) is True
 
 
+class TestPasswordSchemes:
+    """Tests for versioned hashes and rehash detection."""
+
+    def test_verify_legacy_seed_hash(self) -> None:
+        """The DB seed script hash should still verify."""
+        import hashlib
+
+        salt = "0" * 32
+        seed_hash = salt + "$" + hashlib.sha256((salt + "admin123").encode()).hexdigest()
+
+        assert verify_password("admin123", seed_hash) is True
+        assert verify_password("admin124", seed_hash) is False
+
+    def test_verify_pbkdf2(self) -> None:
+        """PBKDF2 hashes should verify."""
+        stored_hash = hash_password("pbkdf2password", scheme="pbkdf2-sha256")
+
+        assert stored_hash.startswith("$pbkdf2-sha256$i=")
+        assert verify_password("pbkdf2password", stored_hash) is True
+        assert verify_password("wrong", stored_hash) is False
+
+    def test_verify_malformed_hash(self) -> None:
+        """A malformed hash should fail verification, not raise."""
+        assert verify_password("password", "$scrypt$garbage") is False
+        assert verify_password("password", "no-separator") is False
+
+    def test_needs_rehash(self) -> None:
+        """Only hashes in the configured scheme and cost are current."""
+        from core.security import needs_rehash
+
+        assert needs_rehash(hash_password("pw", scheme="legacy-sha256")) is True
+        assert needs_rehash(hash_password("pw", scheme="pbkdf2-sha256")) is True
+        assert needs_rehash(hash_password("pw")) is False
+        assert needs_rehash("$scrypt$n=1024,r=8,p=1$salt$digest") is True
+
+
 class TestJWTTokens:
     """Tests for JWT token creation and verification."""
 
@@ -122,3 +169,47 @@ class TestJWTTokens:
 
         assert payload["sub"] == "456"
         assert payload["email"] == "user@test.com"
+
+
+class TestAsyncPasswordHashing:
+    """Tests for the worker-pool password helpers."""
+
+    @pytest.mark.asyncio
+    async def test_hash_and_verify_async_roundtrip(self) -> None:
+        """Async hash should verify with both async and sync helpers."""
+        from core.security import hash_password_async, verify_password_async
+
+        stored_hash = await hash_password_async("asyncpassword")
+
+        assert await verify_password_async("asyncpassword", stored_hash) is True
+        assert await verify_password_async("wrong", stored_hash) is False
+        assert verify_password("asyncpassword", stored_hash) is True
+
+
+class TestTokenMinter:
+    """Tests for the cached-header / cached-HMAC token minter."""
+
+    @pytest.mark.parametrize("algorithm", ["HS256", "HS384", "HS512"])
+    def test_byte_compatible_with_pyjwt(self, algorithm: str) -> None:
+        """Minted tokens should equal jwt.encode output byte for byte."""
+        import jwt
+
+        from core.security import TokenMinter
+
+        claims = {"sub": "1", "email": "ü@example.com"}
+        minter = TokenMinter("secret", algorithm)
+
+        expected = jwt.encode(
+            {**claims, "exp": 2_000_000_000, "type": "access"}, "secret", algorithm=algorithm
+        )
+        assert minter.mint(claims, "access", 2_000_000_000) == expected
+
+    def test_mint_pair_types(self) -> None:
+        """mint_pair should return a verifiable access and refresh token."""
+        from core.security import create_token_pair, verify_token
+
+        access, refresh = create_token_pair({"sub": "9", "email": "a@b.com"})
+
+        assert verify_token(access)["type"] == "access"
+        assert verify_token(refresh)["type"] == "refresh"
+        assert verify_token(refresh)["exp"] > verify_token(access)["exp"]
@@ -0,0 +1,65 @@
+"""Tests for core/lazy.py and core/openapi.py - lazy routers and cached OpenAPI."""
+
+import json
+from pathlib import Path
+
+from fastapi import FastAPI
+from starlette.routing import Match
+
+from core.lazy import LazyRouter, include_lazy_router, load_lazy_routers
+from core.openapi import build_openapi, use_cached_openapi
+
+AUTH = "modules.auth.router:router"
+
+
+def _paths(app: FastAPI) -> list[str]:
+    return [getattr(r, "path", None) for r in app.router.routes if not isinstance(r, LazyRouter)]
+
+
+class TestLazyRouter:
+    """Tests for include_lazy_router."""
+
+    def test_first_matching_request_splices_routes_in_place(self) -> None:
+        """Routes should land right after the placeholder, before later routes."""
+        app = FastAPI()
+        placeholder = include_lazy_router(app, "/api", AUTH)
+
+        @app.get("/later")
+        async def later() -> dict:
+            return {}
+
+        assert "/api/login" not in _paths(app)
+        assert placeholder.matches({"type": "http", "path": "/other"}) == (Match.NONE, {})
+        assert not placeholder.loaded
+
+        assert placeholder.matches({"type": "http", "path": "/api/login"})[0] == Match.NONE
+        paths = _paths(app)
+        assert placeholder.loaded
+        assert paths.index("/api/login") < paths.index("/later")
+
+    def test_openapi_includes_lazy_routes(self) -> None:
+        app = FastAPI()
+        include_lazy_router(app, "/api", AUTH)
+
+        assert "/api/login" in build_openapi(app)["paths"]
+
+
+class TestCachedOpenapi:
+    """Tests for use_cached_openapi."""
+
+    def test_served_from_file(self, tmp_path: Path) -> None:
+        path = tmp_path / "openapi.json"
+        path.write_text(json.dumps({"openapi": "3.1.0", "paths": {"/cached": {}}}))
+        app = FastAPI()
+        use_cached_openapi(app, path)
+
+        assert list(app.openapi()["paths"]) == ["/cached"]
+
+    def test_built_when_file_missing(self, tmp_path: Path) -> None:
+        app = FastAPI()
+        include_lazy_router(app, "/api", AUTH)
+        use_cached_openapi(app, tmp_path / "missing.json")
+
+        assert "/api/register" in app.openapi()["paths"]
+        load_lazy_routers(app)  # already loaded — no duplicate routes
+        assert _paths(app).count("/api/register") == 1
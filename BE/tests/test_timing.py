@@ -0,0 +1,100 @@
+"""Tests for core/timing.py and core/middleware/timing.py - Server-Timing."""
+
+import asyncio
+import logging
+
+import pytest
+
+from core.middleware.timing import ServerTimingMiddleware
+from core.timing import record, span, timing_scope
+
+
+class TestSpans:
+    """Tests for span / record."""
+
+    def test_noop_outside_a_request(self) -> None:
+        assert span("db") is span("verify")  # shared no-op, nothing allocated
+        with span("db"):
+            pass
+        record("db", 1.0)  # silently ignored
+
+    def test_phases_accumulate_per_name(self) -> None:
+        with timing_scope() as timings:
+            record("db", 0.001)
+            record("db", 0.002)
+            with span("jwt"):
+                pass
+
+        assert timings.phases["db"] == [pytest.approx(0.003), 2]
+        header = timings.header()
+        assert header.startswith('db;dur=3.00;desc="2x", jwt;dur=')
+        assert ", total;dur=" in header
+
+    @pytest.mark.asyncio
+    async def test_follows_request_into_tasks(self) -> None:
+        async def child() -> None:
+            record("db", 0.5)
+
+        with timing_scope() as timings:
+            await asyncio.create_task(child())
+
+        assert timings.phases["db"][0] == 0.5
+
+
+class TestServerTimingMiddleware:
+    """Tests for ServerTimingMiddleware."""
+
+    @pytest.mark.asyncio
+    async def test_adds_header_and_logs(self, caplog) -> None:
+        async def app(scope, receive, send) -> None:
+            record("verify", 0.08)
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b"{}"})
+
+        sent: list[dict] = []
+
+        async def send(message: dict) -> None:
+            sent.append(message)
+
+        scope = {
+            "type": "http", "method": "POST", "path": "/api/login",
+            "headers": [(b"x-server-timing-token", b"secret")],
+        }
+        with caplog.at_level(logging.INFO, logger="core.middleware.timing"):
+            await ServerTimingMiddleware(app, token="secret")(scope, None, send)
+
+        headers = dict(sent[0]["headers"])
+        assert headers[b"server-timing"].startswith(b"verify;dur=80.00, total;dur=")
+        assert "path=/api/login status=200" in caplog.text
+        assert "verify_ms=80.00" in caplog.text
+        assert caplog.records[-1].timings["verify"] == 80.0
+
+    @pytest.mark.asyncio
+    async def test_header_only_for_trusted_clients(self) -> None:
+        async def app(scope, receive, send) -> None:
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b"{}"})
+
+        middleware = ServerTimingMiddleware(app, networks=["10.0.0.0/8"], token="secret")
+
+        async def headers_for(client: str, extra: list) -> dict:
+            sent: list[dict] = []
+
+            async def send(message: dict) -> None:
+                sent.append(message)
+
+            scope = {
+                "type": "http", "method": "POST", "path": "/api/login",
+                "headers": extra, "client": (client, 1234),
+            }
+            await middleware(scope, None, send)
+            return dict(sent[0]["headers"])
+
+        assert b"server-timing" in await headers_for("10.1.2.3", [])
+        assert b"server-timing" not in await headers_for("203.0.113.9", [])
+        assert b"server-timing" not in await headers_for(
+            "203.0.113.9", [(b"x-server-timing-token", b"guess")]
+        )
+        assert b"server-timing" in await headers_for(
+            "203.0.113.9", [(b"x-server-timing-token", b"secret")]
+        )
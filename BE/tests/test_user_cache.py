@@ -0,0 +1,108 @@
+"""Tests for modules/auth/cache.py - read-through user cache."""
+
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from modules.auth.cache import CachedAuthRepository, UserCache
+from modules.auth.models import User
+from modules.auth.repository import AuthRepository
+
+USER = User(id=1, email="a@example.com", password_hash="x", created_at=datetime.now(timezone.utc))
+
+
+@pytest.fixture
+def inner() -> MagicMock:
+    repo = MagicMock(spec=AuthRepository)
+    repo.get_by_email = AsyncMock(return_value=USER)
+    repo.create_user = AsyncMock(return_value=2)
+    return repo
+
+
+@pytest.fixture
+def cache() -> UserCache:
+    return UserCache(maxsize=100, ttl=60, negative_ttl=60)
+
+
+class TestCachedAuthRepository:
+    """Tests for CachedAuthRepository."""
+
+    @pytest.mark.asyncio
+    async def test_hit_skips_database(self, inner: MagicMock, cache: UserCache) -> None:
+        """The second lookup should be served from the cache."""
+        repo = CachedAuthRepository(inner, cache)
+
+        assert await repo.get_by_email("a@example.com") == USER
+        assert await repo.get_by_email("a@example.com") == USER
+        inner.get_by_email.assert_awaited_once()
+        assert cache.stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_negative_caching(self, inner: MagicMock, cache: UserCache) -> None:
+        """Unknown emails should be cached as absent."""
+        inner.get_by_email = AsyncMock(return_value=None)
+        repo = CachedAuthRepository(inner, cache)
+
+        assert await repo.get_by_email("nobody@example.com") is None
+        assert await repo.get_by_email("nobody@example.com") is None
+        inner.get_by_email.assert_awaited_once()
+        assert cache.negative_hits == 1
+
+    @pytest.mark.asyncio
+    async def test_create_user_clears_negative_entry(
+        self, inner: MagicMock, cache: UserCache
+    ) -> None:
+        """Registering should never be hidden by a cached "not found"."""
+        inner.get_by_email = AsyncMock(return_value=None)
+        repo = CachedAuthRepository(inner, cache)
+        await repo.get_by_email("new@example.com")
+
+        await repo.create_user("new@example.com", "hash")
+        inner.get_by_email = AsyncMock(return_value=USER)
+
+        assert await repo.get_by_email("new@example.com") == USER
+
+    @pytest.mark.asyncio
+    async def test_miss_in_flight_during_create_is_not_cached(
+        self, inner: MagicMock, cache: UserCache
+    ) -> None:
+        """A lookup that started before a registration must not cache "not found"."""
+        looking_up, commit = asyncio.Event(), asyncio.Event()
+
+        async def slow_miss(_email: str) -> None:
+            looking_up.set()
+            await commit.wait()
+            return None  # read before the new row was visible
+
+        inner.get_by_email = AsyncMock(side_effect=slow_miss)
+        repo = CachedAuthRepository(inner, cache)
+        lookup = asyncio.ensure_future(repo.get_by_email("new@example.com"))
+        await looking_up.wait()
+
+        await repo.create_user("new@example.com", "hash")
+        commit.set()
+        assert await lookup is None
+
+        inner.get_by_email = AsyncMock(return_value=USER)
+        assert await repo.get_by_email("new@example.com") == USER
+
+    @pytest.mark.asyncio
+    async def test_event_invalidates(self, inner: MagicMock, cache: UserCache) -> None:
+        """A user.registered event should drop the cached entry."""
+        repo = CachedAuthRepository(inner, cache)
+        await repo.get_by_email("a@example.com")
+
+        await cache.on_user_changed({"user_id": 1, "email": "a@example.com"})
+        await repo.get_by_email("a@example.com")
+
+        assert inner.get_by_email.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_other_methods_delegate(self, inner: MagicMock, cache: UserCache) -> None:
+        """Uncached methods should pass straight through."""
+        inner.update_password_hash = AsyncMock(return_value=True)
+        repo = CachedAuthRepository(inner, cache)
+
+        assert await repo.update_password_hash(1, "old", "new") is True
@@ -1,4 +1,5 @@
--- Optional: seed a default user (same password format as backend: salt$sha256(salt+password) hex).
+-- Optional: seed a default user (legacy backend password format: salt$sha256(salt+password) hex).
+-- The backend re-hashes it to the configured scheme on first successful login.
 -- Default credentials: admin@example.com / admin123
 -- Requires pgcrypto for digest().
 
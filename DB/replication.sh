@@ -0,0 +1,5 @@
+#!/bin/bash
+# Allow streaming replication from the compose network (used by
+# docker-compose.replica.yml).  Runs once, on first start of an empty data dir.
+set -e
+echo "host replication all all scram-sha-256" >> "$PGDATA/pg_hba.conf"
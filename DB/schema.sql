@@ -21,6 +21,55 @@ CREATE TABLE IF NOT EXISTS users (
 );
 
 CREATE INDEX IF NOT EXISTS idx_users_email ON users (email);
+-- Keyset pagination of the user listing (GET /api/users).
+CREATE INDEX IF NOT EXISTS idx_users_created_at_id ON users (created_at, id);
+
+-- Consumed (rotated) and revoked refresh tokens, by jti.  Rows past
+-- expires_at are purged at backend startup.
+CREATE TABLE IF NOT EXISTS refresh_token_revocations (
+  jti         TEXT PRIMARY KEY,
+  user_id     INTEGER NOT NULL,
+  expires_at  TIMESTAMPTZ NOT NULL,
+  revoked_at  TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  reason      TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_refresh_token_revocations_expires_at ON refresh_token_revocations (expires_at);
+
+-- Transactional outbox: domain events written with the domain change and
+-- delivered by the backend's outbox dispatcher (NOTIFY wakes it up).
+CREATE TABLE IF NOT EXISTS event_outbox (
+  id              BIGSERIAL PRIMARY KEY,
+  topic           TEXT NOT NULL,
+  payload         JSONB NOT NULL,
+  created_at      TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  attempts        INTEGER NOT NULL DEFAULT 0,
+  next_attempt_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_event_outbox_next_attempt_at ON event_outbox (next_attempt_at);
+
+-- Outbox events whose handlers kept failing (EVENT_OUTBOX_MAX_ATTEMPTS)
+CREATE TABLE IF NOT EXISTS event_outbox_dead (
+  id          BIGINT PRIMARY KEY,
+  topic       TEXT NOT NULL,
+  payload     JSONB NOT NULL,
+  attempts    INTEGER NOT NULL,
+  created_at  TIMESTAMPTZ NOT NULL,
+  failed_at   TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE OR REPLACE FUNCTION notify_event_outbox() RETURNS trigger AS $$
+BEGIN
+  PERFORM pg_notify('event_outbox', '');
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS event_outbox_notify ON event_outbox;
+CREATE TRIGGER event_outbox_notify
+  AFTER INSERT ON event_outbox
+  FOR EACH STATEMENT EXECUTE FUNCTION notify_event_outbox();
 
 COMMENT ON TABLE users IS 'User accounts for login app';
-COMMENT ON COLUMN users.password_hash IS 'Salt$SHA256(salt+password) hex';
+COMMENT ON COLUMN users.password_hash IS 'Versioned hash: $scheme$params$salt$digest, or legacy salt$SHA256(salt+password) hex';